@@ -0,0 +1,329 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from Board import WHITE, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, PROMOTIONS
+if TYPE_CHECKING: from Board import Board, Piece
+
+# every square of the board set; python ints are unbounded so results of subtraction are masked with this
+FULL = 0xFFFFFFFFFFFFFFFF
+
+def bswap(bitboard: int) -> int:
+    '''
+    Reverses the byte order of a 64 bit bitboard i.e. mirrors it vertically (rank 1 <-> rank 8)
+    '''
+    return int.from_bytes(bitboard.to_bytes(8, "little"), "big")
+
+def step_attacks(offsets: list[tuple(int, int)]) -> list[int]:
+    '''
+    Builds a table of the squares reachable from every square with one step of the given offsets
+    (used for knights, kings and pawns, which do not slide)
+
+    Parameters:
+        offsets:    list of (x_offset, y_offset) tuples the piece can step by
+
+    Returns:
+        list of 64 bitboards indexed by square (y * 8 + x)
+    '''
+    table = []
+    for square in range(64):
+        x, y = square & 7, square >> 3
+        attacks = 0
+        for (x_offset, y_offset) in offsets:
+            if 0 <= x + x_offset <= 7 and 0 <= y + y_offset <= 7:
+                attacks |= 1 << ((y + y_offset) * 8 + x + x_offset)
+        table.append(attacks)
+    return table
+
+def ray_mask(square: int, directions: list[tuple(int, int)]) -> int:
+    '''
+    Returns every square a slider on the given square could reach on an empty board along the given directions
+    (the square itself is not included)
+    '''
+    x, y = square & 7, square >> 3
+    mask = 0
+    for (x_offset, y_offset) in directions:
+        cur_x, cur_y = x + x_offset, y + y_offset
+        while 0 <= cur_x <= 7 and 0 <= cur_y <= 7:
+            mask |= 1 << (cur_y * 8 + cur_x)
+            cur_x += x_offset
+            cur_y += y_offset
+    return mask
+
+def rank_attacks_table() -> list[list[int]]:
+    '''
+    Builds the attacks of a rook along the first rank for every file and every occupancy of the 6 inner squares
+    of the rank; shifted up to the rank the rook is on when used
+    '''
+    table = []
+    for x in range(8):
+        row = []
+        for inner_occupancy in range(64):
+            occupancy = inner_occupancy << 1
+            attacks = 0
+            for step in (1, -1):
+                cur_x = x + step
+                while 0 <= cur_x <= 7:
+                    attacks |= 1 << cur_x
+                    if occupancy & (1 << cur_x): break
+                    cur_x += step
+            row.append(attacks)
+        table.append(row)
+    return table
+
+KNIGHT_ATTACKS = step_attacks([(1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)])
+KING_ATTACKS = step_attacks([(1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1)])
+
+# squares attacked by a pawn on each square, indexed [0] for white and [1] for black
+PAWN_ATTACKS = (step_attacks([(1, 1), (-1, 1)]), step_attacks([(1, -1), (-1, -1)]))
+
+FILE_MASKS = [ray_mask(square, [(0, 1), (0, -1)]) for square in range(64)]
+DIAGONAL_MASKS = [ray_mask(square, [(1, 1), (-1, -1)]) for square in range(64)]
+ANTI_DIAGONAL_MASKS = [ray_mask(square, [(1, -1), (-1, 1)]) for square in range(64)]
+RANK_ATTACKS = rank_attacks_table()
+
+# bswap(1 << square) for every square
+MIRRORED_BITS = [1 << (square ^ 56) for square in range(64)]
+
+def line_attacks(square: int, occupancy: int, mask: int) -> int:
+    '''
+    Hyperbola quintessence - attacks of a slider along one line (file, diagonal or anti-diagonal) given the occupancy
+    of the board; the subtraction finds the first blocker above the slider and the mirrored subtraction finds the first below
+
+    Parameters:
+        square:     square the slider is on (int, 0 to 63)
+        occupancy:  bitboard of every occupied square
+        mask:       the line through the square, not including the square itself
+
+    Returns:
+        bitboard of every square attacked along the line (including the blockers)
+    '''
+    forward = occupancy & mask
+    reverse = bswap(forward)
+    forward = (forward - (1 << square)) & FULL
+    reverse = (reverse - MIRRORED_BITS[square]) & FULL
+    return (forward ^ bswap(reverse)) & mask
+
+def rook_attacks(square: int, occupancy: int) -> int:
+    '''
+    Returns the bitboard of squares a rook on the given square attacks
+    '''
+    rank_shift = square & 56
+    rank = RANK_ATTACKS[square & 7][(occupancy >> (rank_shift + 1)) & 63] << rank_shift
+    return rank | line_attacks(square, occupancy, FILE_MASKS[square])
+
+def bishop_attacks(square: int, occupancy: int) -> int:
+    '''
+    Returns the bitboard of squares a bishop on the given square attacks
+    '''
+    return line_attacks(square, occupancy, DIAGONAL_MASKS[square]) | line_attacks(square, occupancy, ANTI_DIAGONAL_MASKS[square])
+
+def between_table() -> list[list[int]]:
+    '''
+    Builds BETWEEN[a][b], the squares strictly between two squares on the same rank, file or diagonal (0 if not on a line)
+    '''
+    table = []
+    for a in range(64):
+        row = []
+        for b in range(64):
+            if a == b:
+                row.append(0)
+            elif rook_attacks(a, 0) & (1 << b):
+                row.append(rook_attacks(a, 1 << b) & rook_attacks(b, 1 << a))
+            elif bishop_attacks(a, 0) & (1 << b):
+                row.append(bishop_attacks(a, 1 << b) & bishop_attacks(b, 1 << a))
+            else:
+                row.append(0)
+        table.append(row)
+    return table
+
+BETWEEN = between_table()
+
+class Bitboards:
+    '''
+    Bitboards class - optional backend for Board (Board(bitboards = True)) that stores the position as 64 bit integers,
+    one bit per square (bit y * 8 + x), and generates legal moves with precomputed attack tables instead of stepping
+    square by square. Kept in sync by Board.place_piece / Board.lift_piece.
+
+    Attributes:
+        pieces:     bitboards of each piece type for each color, indexed [0 for white, 1 for black][PAWN, KNIGHT, etc.] (List[List[int]])
+        occupancy:  bitboards of all white pieces and all black pieces (List[int])
+    '''
+
+    def __init__(self, board: Board):
+        '''
+        Initializes Bitboards from the pieces on the given board
+        '''
+        self.pieces = [[0] * 6, [0] * 6]
+        self.occupancy = [0, 0]
+        for piece in board.pieces:
+            self.add(piece)
+
+    def add(self, piece: Piece):
+        '''
+        Sets the bit of the square the piece is on
+        '''
+        bit = 1 << (piece.y * 8 + piece.x)
+        color = 0 if piece.color == WHITE else 1
+        self.pieces[color][piece.kind] |= bit
+        self.occupancy[color] |= bit
+
+    def remove(self, piece: Piece):
+        '''
+        Clears the bit of the square the piece is on
+        '''
+        bit = ~(1 << (piece.y * 8 + piece.x))
+        color = 0 if piece.color == WHITE else 1
+        self.pieces[color][piece.kind] &= bit
+        self.occupancy[color] &= bit
+
+    def attackers_to(self, square: int, occupancy: int, color: int) -> int:
+        '''
+        Returns the bitboard of pieces of the given color that attack the given square
+
+        Parameters:
+            square:     the square attacked (int, 0 to 63)
+            occupancy:  bitboard of occupied squares to use for sliding pieces (lets a piece be "removed" for x-rays)
+            color:      0 for white attackers, 1 for black attackers
+        '''
+        pieces = self.pieces[color]
+        diagonal = pieces[BISHOP] | pieces[QUEEN]
+        straight = pieces[ROOK] | pieces[QUEEN]
+        return ((PAWN_ATTACKS[color ^ 1][square] & pieces[PAWN]) | (KNIGHT_ATTACKS[square] & pieces[KNIGHT]) | (KING_ATTACKS[square] & pieces[KING])
+                | (bishop_attacks(square, occupancy) & diagonal) | (rook_attacks(square, occupancy) & straight))
+
+    def generate_legal_moves(self, board: Board) -> list[tuple(int, int, int, int)]:
+        '''
+        Generates every legal move for the side to move on board, in the same form (and order of promotions) as Board.generate_legal_moves().
+        Checks and pins are found once for the position, so no move has to be tried to see if it leaves the king in check
+
+        Parameters:
+            board:  the board these bitboards belong to
+
+        Returns:
+            list of moves stored as (from_x, from_y, to_x, to_y) or (from_x, from_y, to_x, to_y, promotion) tuples
+        '''
+        us = 0 if board.color_to_move == WHITE else 1
+        them = us ^ 1
+        ours, theirs = self.pieces[us], self.pieces[them]
+        own, enemy = self.occupancy[us], self.occupancy[them]
+        occupancy = own | enemy
+        king_square = ours[KING].bit_length() - 1
+        moves = []
+
+        # king moves: squares attacked are found with the king lifted so it cannot hide behind itself from a slider
+        without_king = occupancy ^ ours[KING]
+        targets = KING_ATTACKS[king_square] & ~own
+        while targets:
+            bit = targets & -targets
+            targets ^= bit
+            to = bit.bit_length() - 1
+            if not self.attackers_to(to, without_king, them):
+                moves.append((king_square & 7, king_square >> 3, to & 7, to >> 3))
+
+        checkers = self.attackers_to(king_square, occupancy, them)
+        # only the king can move out of double check
+        if checkers & (checkers - 1): return moves
+
+        # in check, pieces must take the checker or block between it and the king
+        if checkers:
+            check_mask = checkers | BETWEEN[king_square][checkers.bit_length() - 1]
+        else:
+            check_mask = FULL
+
+        # pinned pieces may only move along the line between the king and the pinning piece
+        pins = {}
+        snipers = ((rook_attacks(king_square, enemy) & (theirs[ROOK] | theirs[QUEEN]))
+                    | (bishop_attacks(king_square, enemy) & (theirs[BISHOP] | theirs[QUEEN])))
+        while snipers:
+            bit = snipers & -snipers
+            snipers ^= bit
+            between = BETWEEN[king_square][bit.bit_length() - 1]
+            blockers = between & occupancy
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pins[blockers] = between | bit
+
+        # knights, bishops, rooks and queens
+        for kind in (KNIGHT, BISHOP, ROOK, QUEEN):
+            pieces = ours[kind]
+            while pieces:
+                bit = pieces & -pieces
+                pieces ^= bit
+                square = bit.bit_length() - 1
+                if kind == KNIGHT:
+                    # a pinned knight can never move
+                    if bit in pins: continue
+                    targets = KNIGHT_ATTACKS[square]
+                elif kind == BISHOP:
+                    targets = bishop_attacks(square, occupancy)
+                elif kind == ROOK:
+                    targets = rook_attacks(square, occupancy)
+                else:
+                    targets = bishop_attacks(square, occupancy) | rook_attacks(square, occupancy)
+
+                targets &= ~own & check_mask & pins.get(bit, FULL)
+                while targets:
+                    target = targets & -targets
+                    targets ^= target
+                    to = target.bit_length() - 1
+                    moves.append((square & 7, square >> 3, to & 7, to >> 3))
+
+        # pawns
+        forward = 8 if us == 0 else -8
+        start_rank = 1 if us == 0 else 6
+        last_rank = 7 if us == 0 else 0
+        pieces = ours[PAWN]
+        while pieces:
+            bit = pieces & -pieces
+            pieces ^= bit
+            square = bit.bit_length() - 1
+            allowed = check_mask & pins.get(bit, FULL)
+
+            # pushes, including 2 squares from the starting rank
+            targets = 0
+            to = square + forward
+            if not occupancy & (1 << to):
+                targets |= 1 << to
+                to += forward
+                if square >> 3 == start_rank and not occupancy & (1 << to):
+                    targets |= 1 << to
+
+            # takes
+            targets = (targets | (PAWN_ATTACKS[us][square] & enemy)) & allowed
+            while targets:
+                target = targets & -targets
+                targets ^= target
+                to = target.bit_length() - 1
+                if to >> 3 == last_rank:
+                    for promotion in PROMOTIONS:
+                        moves.append((square & 7, square >> 3, to & 7, to >> 3, promotion))
+                else:
+                    moves.append((square & 7, square >> 3, to & 7, to >> 3))
+
+        # en passant; rare enough that each one is simply tried on the occupancy bitboard
+        pawn = board.en_passant_pawn
+        if pawn is not None:
+            taken = 1 << (pawn.y * 8 + pawn.x)
+            to = (pawn.y - pawn.color) * 8 + pawn.x
+            takers = PAWN_ATTACKS[them][to] & ours[PAWN]
+            while takers:
+                bit = takers & -takers
+                takers ^= bit
+                after = (occupancy ^ bit ^ taken) | (1 << to)
+                theirs[PAWN] ^= taken
+                attacked = self.attackers_to(king_square, after, them)
+                theirs[PAWN] ^= taken
+                if not attacked:
+                    square = bit.bit_length() - 1
+                    moves.append((square & 7, square >> 3, to & 7, to >> 3))
+
+        # castling, only with rooks that are still on the board and have not moved
+        king = board.white_king if us == 0 else board.black_king
+        if not checkers and not king.moved:
+            rooks = (board.white_king_rook, board.white_queen_rook) if us == 0 else (board.black_king_rook, board.black_queen_rook)
+            for rook in rooks:
+                rook_square = rook.y * 8 + rook.x
+                if rook.moved or board.squares[rook_square] is not rook or BETWEEN[king_square][rook_square] & occupancy: continue
+                step = 1 if rook_square > king_square else -1
+                if self.attackers_to(king_square + step, occupancy, them) or self.attackers_to(king_square + 2 * step, occupancy, them): continue
+                moves.append((king_square & 7, king_square >> 3, (king_square & 7) + 2 * step, king_square >> 3))
+
+        return moves
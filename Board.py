@@ -0,0 +1,1439 @@
+from __future__ import annotations
+from typing import NoReturn
+from array import array
+from collections import OrderedDict
+import random
+from Evaluation import MIDGAME_SCORES, ENDGAME_SCORES, PHASE_WEIGHTS, MAX_PHASE
+
+# Colors
+WHITE = 1
+BLACK = -1
+
+# Standard piece values for displaying evaluation
+PAWN_VALUE = 1
+KNIGHT_VALUE = 3
+BISHOP_VALUE = 3
+ROOK_VALUE = 5
+QUEEN_VALUE = 8
+
+# Game states
+PLAY = 0
+CHECKMATE = 1
+STALEMATE = 2
+
+# Piece types (Piece.kind), used to index bitboards and tables
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+
+# bitmask with a bit set for every square of the board
+ALL_SQUARES = (1 << 64) - 1
+
+# offsets to look for attacking knights / kings, and the directions to look for sliding pieces along
+# paired with the piece types that attack along them
+KNIGHT_OFFSETS = ((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1))
+KING_OFFSETS = ((1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1))
+SLIDER_DIRECTIONS = (((1, 0), (ROOK, QUEEN)), ((-1, 0), (ROOK, QUEEN)), ((0, 1), (ROOK, QUEEN)), ((0, -1), (ROOK, QUEEN)),
+                     ((1, 1), (BISHOP, QUEEN)), ((-1, 1), (BISHOP, QUEEN)), ((1, -1), (BISHOP, QUEEN)), ((-1, -1), (BISHOP, QUEEN)))
+
+# moves are recorded in Board.history packed into ints with everything needed to undo them: the squares moved from and
+# to (y * 8 + x), flags for castling / en passant / promotion, the kind promoted to, the kind taken plus one (0 if
+# nothing was taken), whether the moving / taken pieces had moved before, the square of the pawn that could be taken
+# en passant plus one (0 if none), whether the pawns to its left / right could take it and the halfmove clock
+MOVE_TO_SHIFT = 6
+MOVE_CASTLE = 1 << 12
+MOVE_EN_PASSANT = 1 << 13
+MOVE_PROMOTION = 1 << 14
+MOVE_PROMOTION_SHIFT = 15
+MOVE_TAKEN_SHIFT = 18
+MOVE_MOVED_SHIFT = 21
+MOVE_TAKEN_MOVED_SHIFT = 22
+MOVE_EN_PASSANT_PAWN_SHIFT = 23
+MOVE_EN_PASSANT_LEFT = 1 << 30
+MOVE_EN_PASSANT_RIGHT = 1 << 31
+MOVE_HALFMOVE_SHIFT = 32
+
+# number of moves Board.history has room for before it has to grow
+HISTORY_SIZE = 256
+
+# number of positions whose legal moves are kept in Board.move_cache
+MOVE_CACHE_SIZE = 4096
+
+# random numbers XORed together to make Board.zobrist_key: one for each piece type of each color on each square
+# (indexed [piece.color == WHITE][piece.kind][y * 8 + x]), black to move, each castling right (white kingside,
+# white queenside, black kingside, black queenside) and each file en passant can be taken on. Seeded so every
+# process gives a position the same key
+zobrist_random = random.Random(20220807)
+ZOBRIST_PIECES = [[[zobrist_random.getrandbits(64) for index in range(64)] for kind in range(6)] for color in range(2)]
+ZOBRIST_BLACK_TO_MOVE = zobrist_random.getrandbits(64)
+ZOBRIST_CASTLING = [zobrist_random.getrandbits(64) for right in range(4)]
+ZOBRIST_EN_PASSANT = [zobrist_random.getrandbits(64) for x in range(8)]
+
+class Board:
+    '''
+    Board class - headless representation of a chess position and all of the rules of chess. Does not import
+    arcade or hold any sprites, so positions can be analysed / simulated without opening a window; the Chess
+    window owns a Board and merely renders it.
+
+    Attributes:
+        color_to_move:                      whose turn it is currently (int, 1 or -1 corresponding to WHITE / BLACK constants)
+        history:                            every move played thus far in the game packed into an int (see MOVE_ constants), used to undo
+                                            moves; preallocated, only the first ply entries are used (array of unsigned 64 bit ints)
+        history_keys:                       zobrist_key before each move in history, restored by undo (array of unsigned 64 bit ints)
+        ply:                                number of moves played thus far in the game (int)
+        taken_pieces:                       pieces taken thus far in the game, in order, so undo can put them back (List[Piece])
+        halfmove_clock:                     number of moves since the last pawn move or take, for the fifty move rule (int)
+        fullmove_number:                    number of the move being played, starting at 1 and increasing after each black move (int)
+        legal_moves:                        squares found by Piece.move() that a piece can move to stored as coordinate tuples (List[(x: int, y: int)])
+        legal_takes:                        squares found by Piece.move() that a piece can take on stored as coordinate tuples (List[(x: int, y: int)])
+        en_passants:                        list of pawns that may take via en passant (List[Pawn])
+        en_passant_pawn:                    reference to the pawn that may be taken via en passant (Pawn or None)
+        white_king, black_king:             references to each player's king (Piece)
+        white_king_rook, black_king_rook:   references to each player's kingside rook for checking castling legality (Piece)
+        white_queen_rook, black_queen_rook: references to each player's queenside rook for checking castling legality (Piece)
+        pieces:                             list of all pieces currently on the board (List[Piece])
+        squares:                            the piece on every square of the board, indexed by y * 8 + x, kept in sync with pieces (List[Piece or None])
+        bitboards:                          optional bitboard backend used to generate legal moves, kept in sync with squares (Bitboards or None)
+        zobrist_key:                        64 bit key identifying the position (pieces, side to move, castling rights and en passant), kept up to
+                                            date as pieces are placed / lifted and moves are made; equal positions have equal keys (int)
+        move_cache:                         legal moves and game state of recently seen positions keyed by zobrist_key, least recently used
+                                            first, at most MOVE_CACHE_SIZE entries (OrderedDict[int, (Tuple[tuple], int)])
+        cache_hits, cache_misses:           number of lookups in move_cache that found / did not find the position (int)
+        material:                           material advantage in pawns (PAWN_VALUE etc.), positive if white is ahead; kept up to date as
+                                            pieces are placed / lifted, like zobrist_key and the two below (int)
+        midgame_score, endgame_score:       sum of every piece's value and square bonus in centipawns (see Evaluation.py), positive if white
+                                            is ahead (int)
+        phase:                              sum of PHASE_WEIGHTS of every piece, MAX_PHASE in the starting position down to 0 with only
+                                            kings and pawns left (int)
+    '''
+
+    def __init__(self, bitboards: bool = False, fen: str = None):
+        '''
+        Initializes Board with all pieces at their starting squares, white to move, or with the position in fen if given
+
+        Parameters:
+            bitboards:  whether to generate legal moves with the bitboard backend in Bitboard.py (Boolean, defaults to False)
+            fen:        FEN string of the position to start from (String, defaults to None for the starting position)
+        '''
+        self.color_to_move = WHITE
+        self.legal_moves, self.legal_takes, self.en_passants, self.taken_pieces = [], [], [], []
+        self.history, self.history_keys, self.ply = array("Q", [0]) * HISTORY_SIZE, array("Q", [0]) * HISTORY_SIZE, 0
+        self.en_passant_pawn = None
+        self.halfmove_clock, self.fullmove_number = 0, 1
+        self.white_king, self.black_king = None, None
+        self.white_king_rook, self.white_queen_rook, self.black_king_rook, self.black_queen_rook = None, None, None, None
+
+        self.squares = [None] * 64
+        self.bitboards = None
+        self.zobrist_key = 0
+        self.move_cache = OrderedDict()
+        self.cache_hits, self.cache_misses = 0, 0
+        self.material, self.midgame_score, self.endgame_score, self.phase = 0, 0, 0, 0
+        if fen is None:
+            self.pieces = self.initialize_pieces()
+            self.zobrist_key = self.compute_zobrist_key()
+            self.compute_evaluation()
+        else:
+            self.load_fen(fen)
+
+        # imported here so the tables are only built when the backend is used
+        if bitboards:
+            from Bitboard import Bitboards
+            self.bitboards = Bitboards(self)
+
+    def generate_legal_moves(self) -> list[tuple(int, int, int, int)]:
+        '''
+        Generates every legal move for the side to move. Moves are coordinate tuples in the same
+        form stockfish uses: castling is the king moving two squares and en passant is the pawn
+        moving diagonally onto the empty square behind the pawn it takes. Moves that promote a pawn
+        have the class of the piece promoted to as a fifth entry, one move for each of PROMOTIONS.
+
+        Returns:
+            list of moves stored as (from_x, from_y, to_x, to_y) or (from_x, from_y, to_x, to_y, promotion) tuples
+        '''
+        if self.bitboards is not None: return self.bitboards.generate_legal_moves(self)
+
+        # checks and pins only have to be found once for every piece
+        checks_and_pins = self.find_checks_and_pins()
+
+        moves = []
+        for piece in list(self.pieces):
+            if piece.color != self.color_to_move: continue
+
+            legal_moves, legal_takes = self.piece_legal_moves(piece, *checks_and_pins)
+            for (x, y) in legal_moves + legal_takes:
+                if piece.kind == PAWN and (y == 0 or y == 7):
+                    for promotion in PROMOTIONS:
+                        moves.append((piece.x, piece.y, x, y, promotion))
+                else:
+                    moves.append((piece.x, piece.y, x, y))
+
+            # en passant takes
+            if piece in self.en_passants:
+                moves.append((piece.x, piece.y, self.en_passant_pawn.x, self.en_passant_pawn.y + piece.color))
+
+            # castling, only with rooks that are still on the board
+            if isinstance(piece, King):
+                rooks = (self.white_king_rook, self.white_queen_rook) if piece.color == WHITE else (self.black_king_rook, self.black_queen_rook)
+                for rook in rooks:
+                    if self.get_piece_at(rook.x, rook.y) is rook and self.can_castle(piece, rook):
+                        moves.append((piece.x, piece.y, piece.x + (2 if rook.x > piece.x else -2), piece.y))
+
+        return moves
+
+    def make_move(self, x1: int, y1: int, x2: int, y2: int, promotion: type = None) -> int:
+        '''
+        Moves the piece on the first set of coordinates to the second set, taking / castling if applicable.
+        Coordinates are in the form produced by generate_legal_moves(); the move is assumed to be legal.
+
+        Parameters:
+            x1, y1:     coordinates of the piece to move (int, 0 to 7)
+            x2, y2:     coordinates of where to move the piece (int, 0 to 7)
+            promotion:  class of the piece a pawn reaching the last rank becomes (type, defaults to None for Queen)
+
+        Returns:
+            the move as recorded in history (int, see MOVE_ constants; undo with undo_move())
+        '''
+        piece = self.get_piece_at(x1, y1)
+        piece_to_take = self.get_piece_at(x2, y2)
+
+        # check if castling
+        if isinstance(piece, King) and abs(x1 - x2) == 2:
+            # get queenside rook or kingside rook
+            rook = self.get_piece_at(x2 - 2, y2) if x1 - x2 > 0 else self.get_piece_at(x2 + 1, y2)
+            self.try_castle(piece, rook)
+
+        # check if take via en passant (a pawn moving diagonally onto an empty square)
+        elif piece_to_take is None and isinstance(piece, Pawn) and x1 != x2:
+            self.take_piece(piece, x2, y2, self.get_piece_at(x2, y1))
+
+        # otherwise move / take
+        elif piece_to_take is None:
+            self.move_piece(piece, x2, y2, promotion or Queen)
+
+        else:
+            self.take_piece(piece, x2, y2, piece_to_take, promotion or Queen)
+
+        return self.history[self.ply - 1]
+
+    def game_state(self) -> int:
+        '''
+        Returns the state of the game for the side to move (PLAY, CHECKMATE or STALEMATE)
+        '''
+        return self.check_legal_moves()
+
+    def check_legal_moves(self) -> int:
+        '''
+        Checks that a legal move exists; otherwise end the game and note checkmate / stalemate
+
+        Returns:
+            int corresponding to the gamestate constants (PLAY, CHECKMATE, etc.)
+        '''
+        return self.cached_legal_moves()[1]
+
+    def cached_legal_moves(self) -> tuple(tuple, int):
+        '''
+        Returns the legal moves of the position (see generate_legal_moves) and its game state, looked up by zobrist key in
+        self.move_cache so positions seen again (e.g. after an undo) are not generated again. The least recently used
+        position is dropped once the cache is full
+
+        Returns:
+            tuple of legal moves, shared with the cache so it must not be changed, and int corresponding to the gamestate
+            constants (PLAY, CHECKMATE, etc.)
+        '''
+        entry = self.move_cache.get(self.zobrist_key)
+        if entry is not None:
+            self.move_cache.move_to_end(self.zobrist_key)
+            self.cache_hits += 1
+            return entry
+
+        self.cache_misses += 1
+        moves = tuple(self.generate_legal_moves())
+        if len(moves) != 0: state = PLAY
+        else: state = CHECKMATE if self.in_check() else STALEMATE
+
+        self.move_cache[self.zobrist_key] = (moves, state)
+        if len(self.move_cache) > MOVE_CACHE_SIZE: self.move_cache.popitem(last=False)
+        return moves, state
+
+    def generate_fen(self) -> str:
+        '''
+        Generates a FEN string (standard way to represent the state of a chess board in a single string).
+        The locations of all pieces, who is to move, legality of castling, the en passant square and the move
+        counters are all stored; the position can be then exported to a website or engine. Currently used to
+        send the board state to stockfish in Chess.play_best_move()
+
+        Returns:
+            The generated FEN string e.g. "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+        '''
+        # for every row of the chessboard, generate a string the represents the pieces (e.g. 3b2R means 3 blank spaces,
+        # then lowercase is black and b for bishop so black bishop, then 2 blank spaces, then a white rook)
+        ranks = []
+        for y in range(7, -1, -1):
+            rank, count = "", 0
+            for piece in self.squares[y * 8:y * 8 + 8]:
+                if piece is None:
+                    count += 1
+                    continue
+                if count != 0: rank += str(count)
+                rank, count = rank + str(piece), 0
+            if count != 0: rank += str(count)
+            ranks.append(rank)
+
+        # note who can castle, and what side: uppercase is for white, 'k' is for kingside, 'q' for queenside, '-' means neither side can castle
+        castling = "".join("KQkq"[right] for right in self.castling_rights()) or "-"
+
+        # the square behind a pawn that just moved 2 squares, whether or not it can be taken
+        en_passant = "-"
+        if self.en_passant_pawn is not None:
+            en_passant = f"{chr(self.en_passant_pawn.x + 97)}{self.en_passant_pawn.y - self.en_passant_pawn.color + 1}"
+
+        side = "w" if self.color_to_move == WHITE else "b"
+        return f"{'/'.join(ranks)} {side} {castling} {en_passant} {self.halfmove_clock} {self.fullmove_number}"
+
+    def repetition_history(self) -> tuple(str, list[str]):
+        '''
+        Returns the FEN of the position after the last pawn move or take (or of the starting position if there has been
+        none since) and the moves played from it, which is everything an engine needs to see the positions a repetition
+        can come back to. The moves are undone and played again to reach that position, leaving the board as it was
+
+        Returns:
+            the FEN string and the moves in stockfish notation e.g. ("... w - - 0 30", ["g1f3", "g8f6"])
+        '''
+        # no pawn moved and nothing was taken, so no move since can be a promotion or en passant
+        moves = []
+        for _ in range(min(self.halfmove_clock, self.ply)):
+            move = self.undo_move()
+            moves.append((move & 7, move >> 3 & 7, move >> MOVE_TO_SHIFT & 7, move >> MOVE_TO_SHIFT + 3 & 7))
+        fen = self.generate_fen()
+
+        moves.reverse()
+        for move in moves: self.make_move(*move)
+        return fen, [self.move_to_uci(move) for move in moves]
+
+    def load_fen(self, fen: str) -> NoReturn:
+        '''
+        Sets up the position described by a FEN string (see generate_fen), replacing everything on the board.
+        The castling, en passant and move counter fields may be left off (defaulting to "- - 0 1"). Castling
+        rights that the pieces on the board can't have are ignored
+
+        Parameters:
+            fen:    the FEN string to load e.g. "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+        Raises:
+            ValueError if the string is not a FEN of a legal position (malformed fields, not exactly one king of each color,
+            pawns on the first / last rank, an en passant square without a pawn to take or the side not to move in check);
+            the board is left as it was
+        '''
+        # the position is set up without bitboards (the en passant check makes moves, which would use the old ones) and
+        # everything load_fen_fields replaces is kept so it can be put back if the FEN turns out to be invalid
+        saved = dict(self.__dict__)
+        self.bitboards = None
+        try:
+            self.load_fen_fields(fen)
+        except ValueError:
+            self.__dict__.update(saved)
+            raise
+
+        if saved["bitboards"] is not None:
+            from Bitboard import Bitboards
+            self.bitboards = Bitboards(self)
+
+    def load_fen_fields(self, fen: str) -> NoReturn:
+        '''
+        Helper function for load_fen. Checks the fields of a FEN string and sets the board up from them, replacing
+        the pieces and game state attributes rather than changing them, so load_fen can restore the old ones
+
+        Parameters:
+            fen:    the FEN string to load (String)
+
+        Raises:
+            ValueError if the string is not a FEN of a legal position (see load_fen)
+        '''
+        fields = fen.split()
+        if not 2 <= len(fields) <= 6: raise ValueError(f"FEN must have 2 to 6 fields: {fen!r}")
+        placement, side = fields[0], fields[1]
+        castling = fields[2] if len(fields) > 2 else "-"
+        en_passant = fields[3] if len(fields) > 3 else "-"
+        halfmove = fields[4] if len(fields) > 4 else "0"
+        fullmove = fields[5] if len(fields) > 5 else "1"
+
+        # check the fields that don't depend on the pieces
+        ranks = placement.split("/")
+        if len(ranks) != 8: raise ValueError(f"FEN must have 8 ranks: {placement!r}")
+        if side not in ("w", "b"): raise ValueError(f"side to move in FEN must be w or b: {side!r}")
+        if castling != "-" and (len(set(castling)) != len(castling) or any(char not in "KQkq" for char in castling)):
+            raise ValueError(f"invalid castling rights in FEN: {castling!r}")
+        if not halfmove.isdigit() or not fullmove.isdigit() or int(fullmove) < 1 or int(halfmove) >> 32:
+            raise ValueError(f"invalid move counters in FEN: {halfmove!r} {fullmove!r}")
+
+        self.pieces, self.squares = [], [None] * 64
+        self.legal_moves, self.legal_takes, self.en_passants, self.taken_pieces = [], [], [], []
+        self.ply = 0
+        self.en_passant_pawn = None
+        self.white_king, self.black_king = None, None
+        self.color_to_move = WHITE if side == "w" else BLACK
+        self.halfmove_clock, self.fullmove_number = int(halfmove), int(fullmove)
+
+        # ranks are listed from the 8th down to the 1st; digits are runs of empty squares
+        piece_classes = {"p": Pawn, "n": Knight, "b": Bishop, "r": Rook, "q": Queen, "k": King}
+        for rank_index, rank in enumerate(ranks):
+            y = 7 - rank_index
+            x = 0
+            for char in rank:
+                if char in "12345678":
+                    x += int(char)
+                    continue
+
+                piece_class = piece_classes.get(char.lower())
+                if piece_class is None or x > 7: raise ValueError(f"invalid rank in FEN: {rank!r}")
+                if piece_class is Pawn and (y == 0 or y == 7): raise ValueError(f"pawn on the first / last rank in FEN: {rank!r}")
+
+                piece = self.create_piece(self.pieces, piece_class, WHITE if char.isupper() else BLACK, x, y)
+                # pawns off their starting rank can't move 2 squares, rooks without castling rights can't castle
+                piece.moved = (piece_class is Pawn and y != (1 if piece.color == WHITE else 6)) or piece_class is Rook
+                if piece_class is King:
+                    if (self.white_king if piece.color == WHITE else self.black_king) is not None:
+                        raise ValueError(f"more than one king of a color in FEN: {placement!r}")
+                    if piece.color == WHITE: self.white_king = piece
+                    else: self.black_king = piece
+                x += 1
+
+            if x != 8: raise ValueError(f"rank in FEN does not have 8 squares: {rank!r}")
+
+        if self.white_king is None or self.black_king is None: raise ValueError(f"FEN must have a king of each color: {placement!r}")
+        king = self.black_king if self.color_to_move == WHITE else self.white_king
+        if self.is_square_attacked(king.x, king.y, self.color_to_move): raise ValueError(f"side not to move is in check in FEN: {fen!r}")
+
+        # castling rights; a right is kept by a rook that has not moved, and a side without rights has a king that has moved
+        self.white_king_rook = self.castling_rook(WHITE, 7, "K" in castling)
+        self.white_queen_rook = self.castling_rook(WHITE, 0, "Q" in castling)
+        self.black_king_rook = self.castling_rook(BLACK, 7, "k" in castling)
+        self.black_queen_rook = self.castling_rook(BLACK, 0, "q" in castling)
+        self.white_king.moved = self.white_king_rook.moved and self.white_queen_rook.moved
+        self.black_king.moved = self.black_king_rook.moved and self.black_queen_rook.moved
+
+        # en passant square, given as the square behind the pawn that just moved 2 squares
+        if en_passant != "-":
+            if len(en_passant) != 2 or en_passant[0] not in "abcdefgh" or en_passant[1] != ("6" if self.color_to_move == WHITE else "3"):
+                raise ValueError(f"invalid en passant square in FEN: {en_passant!r}")
+            x, y = ord(en_passant[0]) - 97, int(en_passant[1]) - 1
+            self.en_passant_pawn = self.get_piece_at(x, y - self.color_to_move)
+            if not isinstance(self.en_passant_pawn, Pawn) or self.en_passant_pawn.color == self.color_to_move or self.get_piece_at(x, y) is not None:
+                raise ValueError(f"no pawn can be taken en passant on {en_passant} in FEN")
+
+            for taker_x in (x - 1, x + 1):
+                taker = self.get_piece_at(taker_x, y - self.color_to_move)
+                if isinstance(taker, Pawn) and taker.color == self.color_to_move and not self.in_check_after_move(x, y, taker, self.en_passant_pawn):
+                    self.en_passants.append(taker)
+
+        self.zobrist_key = self.compute_zobrist_key()
+        self.compute_evaluation()
+
+    def compute_zobrist_key(self) -> int:
+        '''
+        Computes the zobrist key of the position from scratch (zobrist_key is normally kept up to date incrementally instead)
+        '''
+        key = self.state_key()
+        for piece in self.pieces:
+            key ^= ZOBRIST_PIECES[piece.color == WHITE][piece.kind][piece.y * 8 + piece.x]
+        return key
+
+    def compute_evaluation(self) -> NoReturn:
+        '''
+        Computes material, midgame_score, endgame_score and phase from scratch (they are normally kept up to date incrementally instead)
+        '''
+        self.material, self.midgame_score, self.endgame_score, self.phase = 0, 0, 0, 0
+        for piece in self.pieces:
+            index = piece.y * 8 + piece.x
+            self.material += piece.value * piece.color
+            self.midgame_score += MIDGAME_SCORES[piece.color == WHITE][piece.kind][index]
+            self.endgame_score += ENDGAME_SCORES[piece.color == WHITE][piece.kind][index]
+            self.phase += PHASE_WEIGHTS[piece.kind]
+
+    def evaluate(self) -> int:
+        '''
+        Evaluates the position from the point of view of the side to move, blending the midgame and endgame scores by the
+        phase. Only reads the scores kept up to date by every move, so it is cheap enough to call at every node of a search
+
+        Returns:
+            the evaluation in centipawns, positive if the side to move is ahead
+        '''
+        phase = min(self.phase, MAX_PHASE)
+        return (self.midgame_score * phase + self.endgame_score * (MAX_PHASE - phase)) // MAX_PHASE * self.color_to_move
+
+    def state_key(self) -> int:
+        '''
+        Returns the part of the zobrist key for the castling rights and en passant (XORed out of zobrist_key before a move
+        changes them and back in after). The en passant file is only counted while a pawn may legally take en passant, so
+        equal positions get equal keys
+        '''
+        key = 0
+        for right in self.castling_rights(): key ^= ZOBRIST_CASTLING[right]
+        if len(self.en_passants) != 0: key ^= ZOBRIST_EN_PASSANT[self.en_passant_pawn.x]
+        if self.color_to_move == BLACK: key ^= ZOBRIST_BLACK_TO_MOVE
+        return key
+
+    def castling_rights(self) -> list[int]:
+        '''
+        Returns the castling rights still held, as 0 for white kingside, 1 white queenside, 2 black kingside and 3 black
+        queenside. A right is held while the king and rook have not moved and the rook is still on the board (castling
+        may still be illegal in the position, see can_castle)
+        '''
+        return [right for (right, king, rook) in ((0, self.white_king, self.white_king_rook), (1, self.white_king, self.white_queen_rook),
+                                                  (2, self.black_king, self.black_king_rook), (3, self.black_king, self.black_queen_rook))
+                if not king.moved and not rook.moved and self.squares[rook.y * 8 + rook.x] is rook]
+
+    def castling_rook(self, color: int, x: int, can_castle: bool) -> Rook:
+        '''
+        Helper function for load_fen. Returns the rook in the given corner if its side can castle with it, otherwise
+        a stand-in rook that has moved and is not on the board, so that castling on that side is never legal
+
+        Parameters:
+            color:          color of the side castling (int, 1 or -1 corresponding to WHITE / BLACK constants)
+            x:              file of the rook's starting square (int, 0 or 7)
+            can_castle:     whether the FEN gives that side the right to castle with this rook (Boolean)
+        '''
+        y = 0 if color == WHITE else 7
+        king = self.white_king if color == WHITE else self.black_king
+        rook = self.get_piece_at(x, y)
+        if can_castle and isinstance(rook, Rook) and rook.color == color and king is not None and (king.x, king.y) == (4, y):
+            rook.moved = False
+            return rook
+
+        rook = Rook(color, x, y)
+        rook.moved = True
+        return rook
+
+    def move_to_uci(self, move: tuple) -> str:
+        '''
+        Converts a move from generate_legal_moves() to the notation used by stockfish e.g. (4, 1, 4, 3) -> "e2e4",
+        (0, 6, 0, 7, Knight) -> "a7a8n"
+        '''
+        name = f"{chr(move[0] + 97)}{move[1] + 1}{chr(move[2] + 97)}{move[3] + 1}"
+        if len(move) > 4: name += str(move[4](WHITE, 0, 0)).lower()
+        return name
+
+    def uci_to_move(self, uci: str) -> tuple:
+        '''
+        Converts a move in the notation used by stockfish to the form used by generate_legal_moves() / make_move()
+        e.g. "e2e4" -> (4, 1, 4, 3), "a7a8n" -> (0, 6, 0, 7, Knight)
+        '''
+        move = (ord(uci[0]) - 97, int(uci[1]) - 1, ord(uci[2]) - 97, int(uci[3]) - 1)
+        if len(uci) > 4:
+            move += ({"q": Queen, "r": Rook, "b": Bishop, "n": Knight}[uci[4]],)
+        return move
+
+    def promote_pawn(self, pawn: Pawn, promotion: type = None) -> NoReturn:
+        '''
+        Promotes the given pawn (to a queen unless told otherwise), meant to be called by Board.move_piece() or Board.take_piece() when a pawn reaches the last rank of the board
+
+        Parameters:
+            pawn:       the pawn to promote
+            promotion:  class of the piece to promote to (Queen, Rook, Bishop or Knight, defaults to None for Queen)
+        '''
+        # lift the pawn off its square while its type changes so the bitboards stay in sync
+        self.lift_piece(pawn)
+        pawn.__class__ = promotion or Queen
+        self.place_piece(pawn, pawn.x, pawn.y)
+
+    def take_piece(self, piece: Piece, x_coord: int, y_coord: int, cur_piece: Piece, promotion: type = None) -> NoReturn:
+        '''
+        Takes a piece on the chessboard - removes the taken piece from the piece list, updates the position of the piece taking
+
+        Parameters:
+            piece:              the piece taking
+            x_coord, y_coord:   the coordinates the piece taking moves to (0 to 7)
+            cur_piece:          the piece to be taken
+            promotion:          class of the piece a pawn taking onto the last rank becomes (type, defaults to None for Queen)
+        '''
+        # record the move
+        self.record_move(piece, x_coord, y_coord, cur_piece, promotion)
+        self.zobrist_key ^= self.state_key()
+
+        # remove the taken piece, update position of piece taking
+        self.remove_piece(cur_piece)
+        self.place_piece(piece, x_coord, y_coord)
+        piece.moved = True
+
+        # promote pawn if needed
+        promoted = (y_coord == 0 or y_coord == 7) and isinstance(piece, Pawn)
+        if promoted: self.promote_pawn(piece, promotion)
+
+        # reset en passants
+        self.en_passants.clear()
+        self.en_passant_pawn = None
+
+        # move to next turn
+        self.color_to_move *= -1
+        self.zobrist_key ^= self.state_key()
+
+    def move_piece(self, piece: Piece, x_coord: int, y_coord: int, promotion: type = None) -> NoReturn:
+        '''
+        Moves piece to a new (empty) square
+
+        Parameters:
+            piece:              the piece to move
+            x_coord, y_coord:   new location of piece
+            promotion:          class of the piece a pawn moving onto the last rank becomes (type, defaults to None for Queen)
+        '''
+        # record the move
+        self.record_move(piece, x_coord, y_coord, None, promotion)
+        self.zobrist_key ^= self.state_key()
+
+        # update en passants if pawn moved 2 spaces
+        if abs(piece.y - y_coord) == 2 and isinstance(piece, Pawn):
+            pawn_left = self.get_piece_at(x_coord + 1, y_coord)
+            pawn_right = self.get_piece_at(x_coord - 1, y_coord)
+            self.en_passants.clear()
+            self.color_to_move *= -1
+            if isinstance(pawn_left, Pawn) and pawn_left.color != piece.color and not self.in_check_after_move(piece.x, pawn_left.y + pawn_left.color, pawn_left, piece):
+                self.en_passants.append(pawn_left)
+
+            if isinstance(pawn_right, Pawn) and pawn_right.color != piece.color and not self.in_check_after_move(piece.x, pawn_right.y + pawn_right.color, pawn_right, piece):
+                self.en_passants.append(pawn_right)
+            self.en_passant_pawn = piece
+            self.color_to_move *= -1
+        else:
+            self.en_passants.clear()
+            self.en_passant_pawn = None
+
+        # update position of piece
+        self.place_piece(piece, x_coord, y_coord)
+        piece.moved = True
+
+        # promote pawns if necessary
+        promoted = isinstance(piece, Pawn) and (y_coord == 0 or y_coord == 7)
+        if promoted: self.promote_pawn(piece, promotion)
+
+        # move to next turn
+        self.color_to_move *= -1
+        self.zobrist_key ^= self.state_key()
+
+    def record_move(self, piece: Piece, x: int, y: int, taken_piece: Piece = None, promotion: type = None, flags: int = 0) -> int:
+        '''
+        Helper function for move_piece / take_piece / try_castle. Packs the move about to be made into an int (see the MOVE_
+        constants) and pushes it onto self.history with the zobrist key before the move, then advances the move counters; must
+        be called before the board changes
+
+        Parameters:
+            piece:          the piece about to move (the king when castling)
+            x, y:           the coordinates the piece moves to (int, 0 to 7)
+            taken_piece:    the piece about to be taken (Piece, defaults to None if not taking)
+            promotion:      class of the piece a pawn reaching the last rank becomes (type, defaults to None for Queen)
+            flags:          MOVE_CASTLE if castling (int, defaults to 0)
+
+        Returns:
+            the packed move
+        '''
+        move = piece.y * 8 + piece.x | (y * 8 + x) << MOVE_TO_SHIFT | flags | piece.moved << MOVE_MOVED_SHIFT | self.halfmove_clock << MOVE_HALFMOVE_SHIFT
+
+        if piece.kind == PAWN and (y == 0 or y == 7):
+            move |= MOVE_PROMOTION | (promotion or Queen).kind << MOVE_PROMOTION_SHIFT
+
+        # the taken piece itself is kept so undo puts back the same object
+        if taken_piece is not None:
+            move |= (taken_piece.kind + 1) << MOVE_TAKEN_SHIFT | taken_piece.moved << MOVE_TAKEN_MOVED_SHIFT
+            if taken_piece.x != x or taken_piece.y != y: move |= MOVE_EN_PASSANT
+            self.taken_pieces.append(taken_piece)
+
+        # the pawns that may take en passant are always beside the pawn that may be taken
+        if self.en_passant_pawn is not None:
+            move |= (self.en_passant_pawn.y * 8 + self.en_passant_pawn.x + 1) << MOVE_EN_PASSANT_PAWN_SHIFT
+            for pawn in self.en_passants:
+                move |= MOVE_EN_PASSANT_LEFT if pawn.x < self.en_passant_pawn.x else MOVE_EN_PASSANT_RIGHT
+
+        # make room for more moves if the game gets long
+        if self.ply == len(self.history):
+            self.history.extend(array("Q", [0]) * len(self.history))
+            self.history_keys.extend(array("Q", [0]) * len(self.history_keys))
+
+        self.history[self.ply] = move
+        self.history_keys[self.ply] = self.zobrist_key
+        self.ply += 1
+
+        # the halfmove clock restarts on pawn moves and takes
+        self.halfmove_clock = 0 if piece.kind == PAWN or taken_piece is not None else self.halfmove_clock + 1
+        if self.color_to_move == BLACK: self.fullmove_number += 1
+        return move
+
+    def try_castle(self, king: King, rook: Rook) -> bool:
+        '''
+        Checks if castling is legal - rook hasn't moved, king hasn't moved, none of the castling squares are in check
+
+        Parameters:
+            king:  the king to be castled
+            rook:  the rook to be castled with
+
+        Returns:
+            False if castling with the given king & rook is illegal, pieces do not move
+            True if castling is legal, pieces moved to castled positions
+        '''
+        if not self.can_castle(king, rook): return False
+
+        # determine whether to attempt kingside or queenside castle
+        kingside_castle = rook.x > king.x
+        king_x, rook_x = (rook.x - 1, king.x + 1) if kingside_castle else (rook.x + 2, king.x - 1)
+
+        # record the move
+        self.record_move(king, king_x, king.y, None, None, MOVE_CASTLE)
+        self.zobrist_key ^= self.state_key()
+
+        # swap pieces
+        self.lift_piece(king)
+        self.lift_piece(rook)
+        self.place_piece(king, king_x, king.y)
+        self.place_piece(rook, rook_x, rook.y)
+        king.moved, rook.moved = True, True
+
+        # reset en passants and move to next turn
+        self.en_passants.clear()
+        self.en_passant_pawn = None
+        self.color_to_move *= -1
+        self.zobrist_key ^= self.state_key()
+        return True
+
+    def can_castle(self, king: King, rook: Rook) -> bool:
+        '''
+        Returns whether or not castling between the given rook and king is legal.
+
+        Parameters:
+            king:   reference to the king object
+            rook:   reference to the rook object
+
+        Returns:
+            True if castling is legal, False if not (i.e. king has moved, rook has moved, etc.)
+        '''
+        # can't castle if rook moved or rook is not same color as king or if king is in check
+        if king.moved or rook.moved or king.color != rook.color or self.in_check(): return False
+
+        # determine whether to attempt kingside or queenside castle
+        kingside_castle = rook.x > king.x
+
+        # return false if castling through check (only the squares the king crosses matter)
+        if kingside_castle:
+            if self.in_check(king.x + 1, king.y) or self.in_check(king.x + 2, king.y): return False
+
+            piece_1 = self.get_piece_at(king.x + 1, king.y)
+            piece_2 = self.get_piece_at(king.x + 2, king.y)
+            piece_3 = None
+        else:
+            if self.in_check(king.x - 1, king.y) or self.in_check(king.x - 2, king.y): return False
+
+            piece_1 = self.get_piece_at(king.x - 1, king.y)
+            piece_2 = self.get_piece_at(king.x - 2, king.y)
+            piece_3 = self.get_piece_at(king.x - 3, king.y)
+
+        # return false if any pieces between the king & rook
+        if piece_1 is not None or piece_2 is not None or piece_3 is not None: return False
+
+        # no reason castling is illegal; return true
+        return True
+
+    def in_check(self, x: int = None, y: int = None) -> bool:
+        '''
+        Checks whether a given square or king is in check. If x, y supplied checks that square, otherwise,
+        checks the current king
+
+        Parameters:
+            x, y:   coordinates of the square to check (defaults to None)
+
+        Returns:
+            True if square is in check, False otherwise
+        '''
+        # check the square containing the current king for checks if no coordinates specified
+        if x is None or y is None:
+             (x,y) = (self.white_king.x, self.white_king.y) if self.color_to_move == WHITE else (self.black_king.x, self.black_king.y)
+
+        # check for pieces of the color not currently moving attacking the square
+        if self.bitboards is not None:
+            occupancy = self.bitboards.occupancy[0] | self.bitboards.occupancy[1]
+            return self.bitboards.attackers_to(y * 8 + x, occupancy, 0 if self.color_to_move == BLACK else 1) != 0
+        return self.is_square_attacked(x, y, -self.color_to_move)
+
+    def is_square_attacked(self, x: int, y: int, color: int) -> bool:
+        '''
+        Checks whether any piece of the given color attacks a square. Rather than generating the moves of every
+        enemy piece, looks outward from the square: one pawn / knight / king step away for those pieces, and
+        along each rank, file and diagonal until the first piece for sliding pieces
+
+        Parameters:
+            x, y:   coordinates of the square to check (int, 0 to 7)
+            color:  color of the attacking pieces (int, 1 or -1 corresponding to WHITE / BLACK constants)
+
+        Returns:
+            True if the square is attacked, False otherwise
+        '''
+        squares = self.squares
+
+        # pawns attack diagonally forward, so look one rank behind the square from the attacker's point of view
+        pawn_y = y - color
+        if 0 <= pawn_y <= 7:
+            if x > 0:
+                piece = squares[pawn_y * 8 + x - 1]
+                if piece is not None and piece.color == color and piece.kind == PAWN: return True
+            if x < 7:
+                piece = squares[pawn_y * 8 + x + 1]
+                if piece is not None and piece.color == color and piece.kind == PAWN: return True
+
+        for (x_offset, y_offset) in KNIGHT_OFFSETS:
+            cur_x, cur_y = x + x_offset, y + y_offset
+            if 0 <= cur_x <= 7 and 0 <= cur_y <= 7:
+                piece = squares[cur_y * 8 + cur_x]
+                if piece is not None and piece.color == color and piece.kind == KNIGHT: return True
+
+        for (x_offset, y_offset) in KING_OFFSETS:
+            cur_x, cur_y = x + x_offset, y + y_offset
+            if 0 <= cur_x <= 7 and 0 <= cur_y <= 7:
+                piece = squares[cur_y * 8 + cur_x]
+                if piece is not None and piece.color == color and piece.kind == KING: return True
+
+        # sliding pieces; the first piece found along each line either attacks the square or blocks the line
+        for (x_offset, y_offset), sliders in SLIDER_DIRECTIONS:
+            cur_x, cur_y = x + x_offset, y + y_offset
+            while 0 <= cur_x <= 7 and 0 <= cur_y <= 7:
+                piece = squares[cur_y * 8 + cur_x]
+                if piece is not None:
+                    if piece.color == color and piece.kind in sliders: return True
+                    break
+                cur_x += x_offset
+                cur_y += y_offset
+
+        return False
+
+    def undo_move(self) -> int:
+        '''
+        Undo the last move in self.history
+
+        Returns:
+            the move that was undone (int, see MOVE_ constants; None if there are no moves to undo)
+        '''
+        # check if there are moves to undo
+        if self.ply == 0: return None
+
+        # unpack the last move
+        self.ply -= 1
+        move = self.history[self.ply]
+        from_index, to_index = move & 63, move >> MOVE_TO_SHIFT & 63
+        moved_piece = self.squares[to_index]
+
+        # undo castle - swap positions of king & rook
+        if move & MOVE_CASTLE:
+            kingside_castle = to_index > from_index
+            rook = self.squares[to_index - 1 if kingside_castle else to_index + 1]
+            self.lift_piece(rook)
+            self.lift_piece(moved_piece)
+            self.place_piece(rook, 7 if kingside_castle else 0, rook.y)
+            self.place_piece(moved_piece, from_index % 8, from_index // 8)
+
+            moved_piece.moved = False
+            rook.moved = False
+
+        # undo move / take
+        else:
+            # unpromote pawn
+            self.lift_piece(moved_piece)
+            if move & MOVE_PROMOTION: moved_piece.__class__ = Pawn
+
+            # return moved piece to previous position
+            self.place_piece(moved_piece, from_index % 8, from_index // 8)
+            moved_piece.moved = bool(move >> MOVE_MOVED_SHIFT & 1)
+
+            # return taken piece to previous position IF piece was taken
+            if move >> MOVE_TAKEN_SHIFT & 7:
+                taken_piece = self.taken_pieces.pop()
+                self.add_piece(taken_piece)
+                taken_piece.moved = bool(move >> MOVE_TAKEN_MOVED_SHIFT & 1)
+
+        # update who is to move and the move counters
+        self.color_to_move *= -1
+        self.halfmove_clock = move >> MOVE_HALFMOVE_SHIFT
+        if self.color_to_move == BLACK: self.fullmove_number -= 1
+
+        # re-enable en passant if necessary
+        self.en_passants, self.en_passant_pawn = [], None
+        en_passant_index = (move >> MOVE_EN_PASSANT_PAWN_SHIFT & 127) - 1
+        if en_passant_index >= 0:
+            self.en_passant_pawn = self.squares[en_passant_index]
+            if move & MOVE_EN_PASSANT_LEFT: self.en_passants.append(self.squares[en_passant_index - 1])
+            if move & MOVE_EN_PASSANT_RIGHT: self.en_passants.append(self.squares[en_passant_index + 1])
+
+        self.zobrist_key = self.history_keys[self.ply]
+        return move
+
+    def piece_legal_moves(self, piece: Piece, checkers: int, check_mask: int, pins: dict[int, int]) -> tuple(list[tuple(int, int)], list[tuple(int, int)]):
+        '''
+        Helper function for generate_legal_moves. Finds the legal moves & takes for the specified
+        piece given the checks and pins found by find_checks_and_pins(), without trying any of the moves
+
+        Parameters:
+            piece:                      the piece to find moves for (Piece)
+            checkers, check_mask, pins: output of find_checks_and_pins() for the current position
+
+        Returns:
+            list of squares the piece can legally move to and list of squares the piece can legally take on
+        '''
+        self.legal_moves, self.legal_takes = [], []
+
+        # only the king can move out of double check
+        if checkers > 1 and piece.kind != KING: return [], []
+
+        # add all possible moves / takes to self.legal_moves / self.legal_takes
+        piece.move(self)
+
+        if piece.kind == KING:
+            # the king may not move onto an attacked square; it is lifted off the board while checking
+            # so that it does not block a slider attacking through its own square
+            king_index = piece.y * 8 + piece.x
+            self.squares[king_index] = None
+            legal_moves = [(x, y) for (x, y) in self.legal_moves if not self.is_square_attacked(x, y, -piece.color)]
+            legal_takes = [(x, y) for (x, y) in self.legal_takes if not self.is_square_attacked(x, y, -piece.color)]
+            self.squares[king_index] = piece
+        else:
+            # other pieces must stop any check and stay on the line they are pinned along
+            allowed = check_mask & pins.get(piece.y * 8 + piece.x, ALL_SQUARES)
+            legal_moves = [(x, y) for (x, y) in self.legal_moves if allowed >> (y * 8 + x) & 1]
+            legal_takes = [(x, y) for (x, y) in self.legal_takes if allowed >> (y * 8 + x) & 1]
+
+        self.legal_moves, self.legal_takes = [], []
+        return legal_moves, legal_takes
+
+    def find_checks_and_pins(self) -> tuple(int, int, dict[int, int]):
+        '''
+        Finds the pieces checking the king of the side to move and the pieces pinned to it, by looking outward from the
+        king once. Squares are stored as bitmasks with bit y * 8 + x set for each square (x, y)
+
+        Returns:
+            number of pieces giving check (int),
+            squares a piece other than the king must move to in order to stop the check - the checker and the squares
+            between it and the king, or every square if not in check (int bitmask),
+            the squares each pinned piece may move to, keyed by the index (y * 8 + x) of the pinned piece (Dict[int, int bitmask])
+        '''
+        color = self.color_to_move
+        king = self.white_king if color == WHITE else self.black_king
+        squares = self.squares
+        x, y = king.x, king.y
+        checkers, check_mask, pins = 0, 0, {}
+
+        # enemy pawns attacking the king are one rank in front of it
+        pawn_y = y + color
+        if 0 <= pawn_y <= 7:
+            for pawn_x in (x - 1, x + 1):
+                if 0 <= pawn_x <= 7:
+                    piece = squares[pawn_y * 8 + pawn_x]
+                    if piece is not None and piece.color != color and piece.kind == PAWN:
+                        checkers += 1
+                        check_mask |= 1 << (pawn_y * 8 + pawn_x)
+
+        for (x_offset, y_offset) in KNIGHT_OFFSETS:
+            cur_x, cur_y = x + x_offset, y + y_offset
+            if 0 <= cur_x <= 7 and 0 <= cur_y <= 7:
+                piece = squares[cur_y * 8 + cur_x]
+                if piece is not None and piece.color != color and piece.kind == KNIGHT:
+                    checkers += 1
+                    check_mask |= 1 << (cur_y * 8 + cur_x)
+
+        # sliding pieces; the first piece along a line checks the king if it is an enemy slider, or is pinned
+        # if it is a friendly piece and the next piece along the line is an enemy slider
+        for (x_offset, y_offset), sliders in SLIDER_DIRECTIONS:
+            cur_x, cur_y = x + x_offset, y + y_offset
+            ray, pinned = 0, None
+            while 0 <= cur_x <= 7 and 0 <= cur_y <= 7:
+                index = cur_y * 8 + cur_x
+                ray |= 1 << index
+                piece = squares[index]
+                if piece is not None:
+                    if piece.color == color:
+                        if pinned is not None: break
+                        pinned = index
+                    else:
+                        if piece.kind in sliders:
+                            if pinned is None:
+                                checkers += 1
+                                check_mask |= ray
+                            else:
+                                pins[pinned] = ray
+                        break
+                cur_x += x_offset
+                cur_y += y_offset
+
+        if checkers == 0: check_mask = ALL_SQUARES
+        return checkers, check_mask, pins
+
+    def in_check_after_move(self, x: int, y: int, piece: Piece, piece_to_take: Piece = None) -> bool:
+        '''
+        Performs the specified move and returns whether the king is in check after making the move. If
+        taking another piece piece_to_take should be specified, otherwise, it should not be given & default to None.
+
+        Parameters:
+            x, y:           coordinates to which the piece is going to move / take (int, 0 to 7)
+            piece:          the piece that is going to move / take (Piece)
+            piece_to_take:  the piece that is going to be taken (Piece, defaults to None)
+
+        Returns:
+            True if king is in check after making the move, otherwise False
+        '''
+        to_return = False
+        prev_x, prev_y = piece.x, piece.y
+
+        # remove piece_to_take from the board temporarily if specified (moved off the board so it attacks nothing)
+        if piece_to_take:
+            take_x, take_y = piece_to_take.x, piece_to_take.y
+            self.lift_piece(piece_to_take)
+            piece_to_take.x = -1
+            piece_to_take.y = -10
+
+        # temporarily update position of piece
+        self.place_piece(piece, x, y)
+
+        # note if in check after making move
+        if self.in_check(): to_return = True
+
+        # put pieces back
+        self.place_piece(piece, prev_x, prev_y)
+
+        if piece_to_take:
+            self.place_piece(piece_to_take, take_x, take_y)
+
+        return to_return
+
+    def get_piece_at(self, x: int, y: int) -> Piece:
+        '''
+        Returns the piece at specified x, y coordinates on the board
+
+        Parameters:
+            x, y:   square to check on the board (int, 0 to 7)
+
+        Returns:
+            None if square is unoccupied, otherwise a reference to the piece occupying the square
+        '''
+        if x < 0 or x > 7 or y < 0 or y > 7: return None
+        return self.squares[y * 8 + x]
+
+    def place_piece(self, piece: Piece, x: int, y: int) -> NoReturn:
+        '''
+        Moves piece to the given square, keeping self.squares in sync. Whatever was on that square is
+        overwritten, so a piece being taken must be removed first with remove_piece()
+
+        Parameters:
+            piece:  the piece to move (Piece)
+            x, y:   square to move the piece to (int, 0 to 7)
+        '''
+        self.lift_piece(piece)
+        piece.x = x
+        piece.y = y
+        index, white, kind = y * 8 + x, piece.color == WHITE, piece.kind
+        self.squares[index] = piece
+        self.zobrist_key ^= ZOBRIST_PIECES[white][kind][index]
+        self.material += piece.value * piece.color
+        self.midgame_score += MIDGAME_SCORES[white][kind][index]
+        self.endgame_score += ENDGAME_SCORES[white][kind][index]
+        self.phase += PHASE_WEIGHTS[kind]
+        if self.bitboards is not None: self.bitboards.add(piece)
+
+    def lift_piece(self, piece: Piece) -> NoReturn:
+        '''
+        Empties the square the piece is on in self.squares (if it is still recorded there); the piece's coordinates are unchanged
+
+        Parameters:
+            piece:  the piece to lift off its square (Piece)
+        '''
+        if 0 <= piece.x <= 7 and 0 <= piece.y <= 7 and self.squares[piece.y * 8 + piece.x] is piece:
+            index, white, kind = piece.y * 8 + piece.x, piece.color == WHITE, piece.kind
+            self.squares[index] = None
+            self.zobrist_key ^= ZOBRIST_PIECES[white][kind][index]
+            self.material -= piece.value * piece.color
+            self.midgame_score -= MIDGAME_SCORES[white][kind][index]
+            self.endgame_score -= ENDGAME_SCORES[white][kind][index]
+            self.phase -= PHASE_WEIGHTS[kind]
+            if self.bitboards is not None: self.bitboards.remove(piece)
+
+    def add_piece(self, piece: Piece) -> NoReturn:
+        '''
+        Adds piece to the board on the square given by its coordinates
+
+        Parameters:
+            piece:  the piece to add (Piece)
+        '''
+        index, white, kind = piece.y * 8 + piece.x, piece.color == WHITE, piece.kind
+        self.pieces.append(piece)
+        self.squares[index] = piece
+        self.zobrist_key ^= ZOBRIST_PIECES[white][kind][index]
+        self.material += piece.value * piece.color
+        self.midgame_score += MIDGAME_SCORES[white][kind][index]
+        self.endgame_score += ENDGAME_SCORES[white][kind][index]
+        self.phase += PHASE_WEIGHTS[kind]
+        if self.bitboards is not None: self.bitboards.add(piece)
+
+    def remove_piece(self, piece: Piece) -> NoReturn:
+        '''
+        Removes piece from the board (e.g. when it is taken); its coordinates are kept so it can be added back by undo_move()
+
+        Parameters:
+            piece:  the piece to remove (Piece)
+        '''
+        self.lift_piece(piece)
+        self.pieces.remove(piece)
+
+    def check_moves_on_square(self, cur_piece: Piece, x_offset: int, y_offset: int, can_take: bool = True, can_move: bool = True) -> bool:
+        '''
+        Given a square and piece, checks if that piece could move / take on that square and if so,
+        appends the move to self.legal_moves or self.legal_takes. Returns True if the square is occupied
+        by a piece of either color, False otherwise. Takes will only be appended if
+        can_take is True, Moves will only be appended if can_move is True. The square's coordinate
+        are calculated by adding the offsets to the current coordinates of cur_piece.
+
+        Parameters:
+            cur_piece:          the piece to move (Piece)
+            x_offset, y_offset: which square to check relative to cur_piece's positions (int, 0 to 7)
+                                ex. x_offset = 2, y_offset = 2, cur_piece is at 2,3 -> the coordinates to check would be 4,5
+            can_take:           indicates whether the piece should be allowed to take (Boolean, defaults to True)
+            can_move:           indicates whether the piece should be allowed to move (Boolean, defaults to True)
+
+        Returns:
+            True if a piece is located on the square to check (or the square is off the board), False otherwise.
+
+        Example use:   for checking pawn moves, pawns can take diagonally but cannot move diagonally -> call with can_take = True, can_move = False
+        '''
+        x_coord = cur_piece.x + x_offset
+        y_coord = cur_piece.y + y_offset
+
+        # squares off the board block the piece like an occupied square would
+        if x_coord < 0 or x_coord > 7 or y_coord < 0 or y_coord > 7: return True
+
+        other_piece = self.squares[y_coord * 8 + x_coord]
+
+        # add all legal moves where applicable
+        if other_piece is None and can_move:
+            self.legal_moves.append((x_coord, y_coord))
+            return False
+        elif other_piece is not None and other_piece.color != cur_piece.color and can_take:
+            self.legal_takes.append((x_coord, y_coord))
+
+        return True
+
+    def initialize_pieces(self) -> list[Piece]:
+        '''
+        Initializes a full board of chess pieces at the correct starting locations
+
+        Returns:
+            piece_list, a list of references to all Piece objects created.
+        '''
+        piece_list = []
+
+        for x in range(8):
+
+            self.create_piece(piece_list, Pawn, WHITE, x, 1)
+            self.create_piece(piece_list, Pawn, BLACK, x, 6)
+
+            if x == 0:
+                self.white_queen_rook = self.create_piece(piece_list, Rook, WHITE, x, 0)
+                self.black_queen_rook = self.create_piece(piece_list, Rook, BLACK, x, 7)
+
+            elif x == 7:
+                self.white_king_rook = self.create_piece(piece_list, Rook, WHITE, x, 0)
+                self.black_king_rook = self.create_piece(piece_list, Rook, BLACK, x, 7)
+
+            elif x == 1 or x == 6:
+                self.create_piece(piece_list, Knight, WHITE, x, 0)
+                self.create_piece(piece_list, Knight, BLACK, x, 7)
+
+            elif x == 2 or x == 5:
+                self.create_piece(piece_list, Bishop, WHITE, x, 0)
+                self.create_piece(piece_list, Bishop, BLACK, x, 7)
+
+            elif x == 3:
+                self.create_piece(piece_list, Queen, WHITE, x, 0)
+                self.create_piece(piece_list, Queen, BLACK, x, 7)
+
+            elif x == 4:
+                self.white_king = self.create_piece(piece_list, King, WHITE, x, 0)
+                self.black_king = self.create_piece(piece_list, King, BLACK, x, 7)
+
+        return piece_list
+
+    def create_piece(self, piece_list: list[Piece], piece_class: type, color: int, x: int, y: int) -> Piece:
+        '''
+        Helper function for initialize_pieces. Creates a Piece object of the specified type (Rook, Knight, etc.)
+        and adds it to piece_list.
+
+        Parameters:
+            piece_list:     the list to append the piece to (List[Piece])
+            piece_class:    the class of the Piece (Rook, Knight, etc.)
+            color:          color of the piece to create (int, based on WHITE / BLACK constants)
+            x, y:           coordinates of the piece (int, 0 to 7)
+
+        Returns:
+            reference to the created piece (Rook, Knight, etc.)
+        '''
+        piece = piece_class(color, x, y)
+        piece_list.append(piece)
+        self.squares[y * 8 + x] = piece
+        return piece
+
+class Piece:
+    '''
+    Piece class - represents a Piece on the chess board and is parent class to Pawn, Bishop, Knight, Rook, Queen, King
+
+    Attributes:
+        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
+        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
+        moved:          repreents whether or not the piece has moved (Boolean, initialized to False)
+    '''
+    # no per-piece dict; subclasses add no attributes of their own (only class attributes) so promotion can swap __class__
+    __slots__ = ("color", "x", "y", "moved")
+
+    def __init__(self, color: int, x: int, y: int):
+        '''
+        Initializes Piece; moved initialized to False automatically
+
+        Parameters:
+            color:  integer representing the piece's color
+            x, y:   coordinates representing the piece's location
+        '''
+        self.color = color
+        self.x = x
+        self.y = y
+        self.moved = False
+
+class Rook(Piece):
+    '''
+    Rook class - child class of Piece, represents a rook on the chessboard
+
+    Attributes:
+        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
+        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
+        value:          represents the "value in pawns" of the piece, shared by all rooks (int, corresponds to ROOK_VALUE constant)
+        kind:           the type of the piece, shared by all rooks (int, ROOK constant)
+    '''
+    __slots__ = ()
+    kind = ROOK
+    value = ROOK_VALUE
+
+    def __str__(self) -> str:
+        '''
+        Standard string representation of a chess piece for generating FEN
+        strings - uppercase for white, lowercase for black
+        '''
+        return "R" if self.color == WHITE else "r"
+
+    # Adds all potential "moves" to self.legal_moves and all potential "takes"
+    # to self.legal_takes. Moves and takes later evaluated to ensure they do
+    # not move king into check by Board.piece_legal_moves
+    def move(self, board: Board) -> NoReturn:
+        '''
+        Adds all empty squares the rook could possibly move to to board.legal_moves
+        and all pieces the piece could possibly take to board.legal_takes
+
+        Parameters:
+            board:    instance of Board
+        '''
+        for i in range(1, 8):
+            if board.check_moves_on_square(self, i, 0): break
+
+        for i in range(1, 8):
+            if board.check_moves_on_square(self, -i, 0): break
+
+        for i in range(1, 8):
+            if board.check_moves_on_square(self, 0, -i): break
+
+        for i in range(1, 8):
+            if board.check_moves_on_square(self, 0, i): break
+
+class Knight(Piece):
+    '''
+    Knight class - child class of Piece, represents a knight on the chessboard
+
+    Attributes:
+        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
+        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
+        value:          represents the "value in pawns" of the piece, shared by all knights (int, corresponds to KNIGHT_VALUE constant)
+        kind:           the type of the piece, shared by all knights (int, KNIGHT constant)
+    '''
+    __slots__ = ()
+    kind = KNIGHT
+    value = KNIGHT_VALUE
+
+    def __str__(self) -> str:
+        '''
+        Standard string representation of a chess piece for generating FEN
+        strings - uppercase for white, lowercase for black
+        '''
+        return "N" if self.color == WHITE else "n"
+
+    def move(self, board: Board) -> NoReturn:
+        '''
+        Adds all empty squares the knight could possibly move to to board.legal_moves
+        and all pieces the piece could possibly take to board.legal_takes
+
+        Parameters:
+            board:    instance of Board
+        '''
+        board.check_moves_on_square(self, 1, 2)
+        board.check_moves_on_square(self, 1, -2)
+        board.check_moves_on_square(self, -1, 2)
+        board.check_moves_on_square(self, -1, -2)
+        board.check_moves_on_square(self, 2, 1)
+        board.check_moves_on_square(self, 2, -1)
+        board.check_moves_on_square(self, -2, 1)
+        board.check_moves_on_square(self, -2, -1)
+
+class Bishop(Piece):
+    '''
+    Bishop class - child class of Piece, represents a bishop on the chessboard
+
+    Attributes:
+        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
+        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
+        value:          represents the "value in pawns" of the piece, shared by all bishops (int, corresponds to BISHOP_VALUE constant)
+        kind:           the type of the piece, shared by all bishops (int, BISHOP constant)
+    '''
+    __slots__ = ()
+    kind = BISHOP
+    value = BISHOP_VALUE
+
+    def __str__(self) -> str:
+        '''
+        Standard string representation of a chess piece for generating FEN
+        strings - uppercase for white, lowercase for black
+        '''
+        return "B" if self.color == WHITE else "b"
+
+    def move(self, board: Board) -> NoReturn:
+        '''
+        Adds all empty squares the bishop could possibly move to to board.legal_moves
+        and all pieces the piece could possibly take to board.legal_takes
+
+        Parameters:
+            board:    instance of Board
+        '''
+        for i in range(1, 8):
+            if board.check_moves_on_square(self, i, i): break
+
+        for i in range(1, 8):
+            if board.check_moves_on_square(self, -i, i): break
+
+        for i in range(1, 8):
+            if board.check_moves_on_square(self, i, -i): break
+
+        for i in range(1, 8):
+            if board.check_moves_on_square(self, -i, -i): break
+
+class Pawn(Piece):
+    '''
+    Pawn class - child class of Piece, represents a pawn on the chessboard
+
+    Attributes:
+        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
+        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
+        value:          represents the "value in pawns" of the piece, shared by all pawns (int, corresponds to PAWN_VALUE constant)
+        kind:           the type of the piece, shared by all pawns (int, PAWN constant)
+    '''
+    __slots__ = ()
+    kind = PAWN
+    value = PAWN_VALUE
+
+    def __str__(self) -> str:
+        '''
+        Standard string representation of a chess piece for generating FEN
+        strings - uppercase for white, lowercase for black
+        '''
+        return "P" if self.color == WHITE else "p"
+
+    def move(self, board: Board) -> NoReturn:
+        '''
+        Adds all empty squares the pawn could possibly move to to board.legal_moves
+        and all pieces the piece could possibly take to board.legal_takes
+
+        Parameters:
+            board:    instance of Board
+        '''
+        # check if there is a piece blocking the pawn moving
+        piece_in_front_pawn = board.check_moves_on_square(self, 0, 1 * self.color, False)
+
+        # allow pawn to move forward 2 squares (can only move, not capture) if it hasn't moved
+        if not self.moved and not piece_in_front_pawn:
+            board.check_moves_on_square(self, 0, 2 * self.color, False)
+
+        # allow pawn to capture (not move) to squares diagonally in front of it
+        board.check_moves_on_square(self, 1, 1 * self.color, True, False)
+        board.check_moves_on_square(self, -1, 1 * self.color, True, False)
+
+class Queen(Piece):
+    '''
+    Queen class - child class of Piece, represents a queen on the chessboard
+
+    Attributes:
+        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
+        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
+        value:          represents the "value in pawns" of the piece, shared by all queens (int, corresponds to QUEEN_VALUE constant)
+        kind:           the type of the piece, shared by all queens (int, QUEEN constant)
+    '''
+    __slots__ = ()
+    kind = QUEEN
+    value = QUEEN_VALUE
+
+    def __str__(self) -> str:
+        '''
+        Standard string representation of a chess piece for generating FEN
+        strings - uppercase for white, lowercase for black
+        '''
+        return "Q" if self.color == WHITE else "q"
+
+    def move(self, board: Board) -> NoReturn:
+        '''
+        Adds all empty squares the queen could possibly move to to board.legal_moves
+        and all pieces the piece could possibly take to board.legal_takes
+
+        Parameters:
+            board:    instance of Board
+        '''
+        temp_rook = Rook(self.color, self.x, self.y)
+        temp_bishop = Bishop(self.color, self.x, self.y)
+
+        temp_rook.move(board)
+        temp_bishop.move(board)
+
+class King(Piece):
+    '''
+    King class - child class of Piece, represents a king on the chessboard
+
+    Attributes:
+        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
+        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
+        value:          represents the "value in pawns" of the piece (int, set to 0 as the value of a king is ambiguous)
+        kind:           the type of the piece, shared by all kings (int, KING constant)
+    '''
+    __slots__ = ()
+    kind = KING
+    value = 0
+
+    def __str__(self) -> str:
+        '''
+        Standard string representation of a chess piece for generating FEN
+        strings - uppercase for white, lowercase for black
+        '''
+        return "K" if self.color == WHITE else "k"
+
+    def move(self, board: Board) -> NoReturn:
+        '''
+        Adds all empty squares the king could possibly move to to board.legal_moves
+        and all pieces the piece could possibly take to board.legal_takes
+
+        Parameters:
+            board:    instance of Board
+        '''
+        board.check_moves_on_square(self, 1, 1)
+        board.check_moves_on_square(self, 1, 0)
+        board.check_moves_on_square(self, 1, -1)
+        board.check_moves_on_square(self, 0, -1)
+        board.check_moves_on_square(self, -1, -1)
+        board.check_moves_on_square(self, -1, 0)
+        board.check_moves_on_square(self, -1, 1)
+        board.check_moves_on_square(self, 0, 1)
+
+# pieces a pawn may promote to, in the order promotions are generated
+PROMOTIONS = (Queen, Rook, Bishop, Knight)
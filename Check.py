@@ -0,0 +1,167 @@
+from __future__ import annotations
+from typing import NoReturn
+import argparse
+import random
+import sys
+from Board import Board
+from Perft import REFERENCE_POSITIONS
+
+# FEN strings load_fen must reject, one for each of its checks, with what is wrong with them
+INVALID_FENS = [
+    ("8/8/8/8/8/8/8/8", "too few fields"),
+    ("4k3/8/8/8/8/8/8/4K3 w - - 0 1 extra", "too many fields"),
+    ("4k3/8/8/8/8/8/4K3 w - - 0 1", "7 ranks"),
+    ("4k3/8/8/8/8/8/8/4K3 x - - 0 1", "side to move"),
+    ("r3k2r/8/8/8/8/8/8/R3K2R w KK - 0 1", "repeated castling right"),
+    ("r3k2r/8/8/8/8/8/8/R3K2R w KQx - 0 1", "unknown castling right"),
+    ("4k3/8/8/8/8/8/8/4K3 w - - x 1", "halfmove clock"),
+    ("4k3/8/8/8/8/8/8/4K3 w - - 0 0", "fullmove number"),
+    ("4k3/8/8/8/8/8/8/4K2X w - - 0 1", "unknown piece"),
+    ("4k3/8/8/8/8/8/8/4K3p w - - 0 1", "piece past the 8th file"),
+    ("4k3/8/8/8/8/8/8/4K2 w - - 0 1", "rank of 7 squares"),
+    ("4k3/8/8/8/8/8/8/4K4 w - - 0 1", "rank of 9 squares"),
+    ("4k3/8/8/8/8/8/8/P3K3 w - - 0 1", "pawn on the first rank"),
+    ("p3k3/8/8/8/8/8/8/4K3 w - - 0 1", "pawn on the last rank"),
+    ("4k3/8/8/8/8/8/8/8 w - - 0 1", "no white king"),
+    ("4k3/8/8/8/8/8/8/3KK3 w - - 0 1", "two white kings"),
+    ("4k3/8/8/8/8/8/8/r3K3 b - - 0 1", "side not to move in check"),
+    ("4k3/8/8/8/8/8/8/4K3 w - e3 0 1", "en passant square on the wrong rank"),
+    ("4k3/8/8/8/8/8/8/4K3 w - i6 0 1", "en passant square off the board"),
+    ("4k3/8/8/4p3/8/8/8/4K3 w - d6 0 1", "en passant square without a pawn"),
+]
+
+# a position where the only pawn that could take en passant may not, as it would leave its king in check
+PINNED_EN_PASSANT_FEN = "8/8/8/8/k2Pp2Q/8/8/4K3 b - d3 0 1"
+
+def legal_moves(board: Board) -> set[str]:
+    '''
+    Returns the legal moves of the board's position in stockfish notation, which unlike the move tuples can be compared
+    '''
+    return {board.move_to_uci(move) for move in board.generate_legal_moves()}
+
+def check_position(board: Board) -> list[str]:
+    '''
+    Compares everything Board keeps up to date move by move with the same values computed from scratch, and checks
+    that the position's FEN loads back into the same position
+
+    Parameters:
+        board:  the position to check (Board, left unchanged)
+
+    Returns:
+        a description of each mismatch found, empty if there are none
+    '''
+    problems = []
+    if board.zobrist_key != board.compute_zobrist_key(): problems.append("zobrist key differs from compute_zobrist_key()")
+
+    incremental = (board.material, board.midgame_score, board.endgame_score, board.phase)
+    board.compute_evaluation()
+    computed = (board.material, board.midgame_score, board.endgame_score, board.phase)
+    if incremental != computed: problems.append(f"evaluation {incremental} differs from compute_evaluation() {computed}")
+    board.material, board.midgame_score, board.endgame_score, board.phase = incremental
+
+    fen = board.generate_fen()
+    loaded = Board(board.bitboards is not None, fen)
+    if loaded.generate_fen() != fen: problems.append(f"FEN does not round trip: {loaded.generate_fen()!r}")
+    if loaded.zobrist_key != board.zobrist_key: problems.append("FEN loads with a different zobrist key")
+    if legal_moves(loaded) != legal_moves(board): problems.append("FEN loads with different legal moves")
+    return problems
+
+def replay_games(games: int, plies: int, seed: int, bitboards: bool = True) -> bool:
+    '''
+    Plays random games from the starting and reference positions, checking every position on the way (see
+    check_position), then undoes every move, checking that each position comes back the same
+
+    Parameters:
+        games:      number of games to play from each starting position (int)
+        plies:      most moves to play in each game (int)
+        seed:       seed of the random moves, so a failure can be repeated (int)
+        bitboards:  whether to use the bitboard backend (Boolean, defaults to True)
+
+    Returns:
+        True if no mismatches were found, False otherwise
+    '''
+    rng = random.Random(seed)
+    passed = True
+    positions = 0
+    for fen in [None] + [fen for (_, fen, _, _) in REFERENCE_POSITIONS]:
+        for game in range(games):
+            board = Board(bitboards, fen)
+            played = []
+            for _ in range(plies):
+                moves = board.generate_legal_moves()
+                if not moves: break
+                move = rng.choice(moves)
+                played.append((move, board.generate_fen(), board.zobrist_key))
+                board.make_move(*move)
+                problems = check_position(board)
+                positions += 1
+                if problems:
+                    passed = False
+                    print(f"after {' '.join(board.move_to_uci(move) for (move, _, _) in played)} from {fen or 'the start position'}:")
+                    for problem in problems: print(f"    {problem}")
+                    break
+
+            # undo back to the start, every position has to match the one before the move
+            while played:
+                move, before_fen, before_key = played.pop()
+                board.undo_move()
+                problems = check_position(board)
+                if board.generate_fen() != before_fen: problems.append(f"undoing {board.move_to_uci(move)} gives {board.generate_fen()!r}, not {before_fen!r}")
+                if board.zobrist_key != before_key: problems.append(f"undoing {board.move_to_uci(move)} does not restore the zobrist key")
+                if problems:
+                    passed = False
+                    print(f"undoing to {before_fen}:")
+                    for problem in problems: print(f"    {problem}")
+                    break
+
+    print(f"{positions:,} positions from random games  {'ok' if passed else 'FAILED'}")
+    return passed
+
+def check_invalid_fens(bitboards: bool = True) -> bool:
+    '''
+    Loads every FEN in INVALID_FENS, checking that load_fen raises ValueError and leaves the board as it was, then
+    checks that loading a valid FEN onto the board gives the same position as a new board
+
+    Parameters:
+        bitboards:  whether to use the bitboard backend (Boolean, defaults to True)
+
+    Returns:
+        True if every FEN was rejected cleanly, False otherwise
+    '''
+    passed = True
+    board = Board(bitboards)
+    before = (board.generate_fen(), board.zobrist_key, legal_moves(board))
+    for (fen, reason) in INVALID_FENS:
+        try:
+            board.load_fen(fen)
+        except ValueError:
+            if (board.generate_fen(), board.zobrist_key, legal_moves(board)) == before: continue
+            print(f"rejecting {fen!r} ({reason}) changed the board")
+        else:
+            print(f"{fen!r} ({reason}) was loaded instead of rejected")
+        passed = False
+        board = Board(bitboards)
+
+    # a board that already has a position has to end up the same as a new one, e.g. with the pinned pawn not taking en passant
+    board.load_fen(PINNED_EN_PASSANT_FEN)
+    if legal_moves(board) != legal_moves(Board(False, PINNED_EN_PASSANT_FEN)) or board.zobrist_key != board.compute_zobrist_key():
+        print(f"loading {PINNED_EN_PASSANT_FEN!r} onto a board does not match a new board")
+        passed = False
+
+    print(f"{len(INVALID_FENS)} invalid FEN strings  {'ok' if passed else 'FAILED'}")
+    return passed
+
+def main() -> NoReturn:
+    parser = argparse.ArgumentParser(description="Checks the incrementally updated zobrist keys and evaluation, FEN loading and undo over random games")
+    parser.add_argument("--games", type=int, default=10, help="number of random games to play from each position (defaults to 10)")
+    parser.add_argument("--plies", type=int, default=100, help="most moves to play in each game (defaults to 100)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random moves (defaults to 0)")
+    parser.add_argument("--mailbox", action="store_true", help="use the square list move generator instead of bitboards")
+    args = parser.parse_args()
+
+    passed = replay_games(args.games, args.plies, args.seed, not args.mailbox)
+    passed = check_invalid_fens(not args.mailbox) and passed
+    sys.exit(0 if passed else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,1318 +1,712 @@
-from __future__ import annotations
-from typing import NoReturn
-import arcade
-from stockfish import Stockfish
- 
-# Colors
-WHITE = 1
-BLACK = -1
- 
-# Standard piece values for displaying evaluation
-PAWN_VALUE = 1
-KNIGHT_VALUE = 3
-BISHOP_VALUE = 3
-ROOK_VALUE = 5
-QUEEN_VALUE = 8
- 
-# Game states
-PLAY = 0
-CHECKMATE = 1
-STALEMATE = 2
- 
-# Screen size settings
-SCREEN_WIDTH = 1000
-SCREEN_HEIGHT = 1000
-PIXELS_PER_SQUARE = 100
-
-# path to stockfish executable
-PATH = "stockfish_20011801_x64.exe"
-
-class Chess(arcade.Window):
-    '''
-    Chess class - visual representation of chess game
- 
-    Attributes:
-        color_to_move:                      whose turn it is currently (int, 1 or -1 corresponding to WHITE / BLACK constants)
-        king_in_check:                      whether king is in check (Boolean)
-        selected_piece:                     the piece last clicked on; displays legal moves for this piece (Piece or None)
-        game_state:                         whether game should proceed or is stopped e.g. checkmate / draw (int, corresponds to PLAY, STALEMATE, etc.)
-        move_list:                          list of all moves played thus far in the game, used to undo moves (List[Move])
-        legal_moves:                        list of legal squares that selected piece can legally move to stored as coordinate tuples (List[(x: int, y: int)])
-        legal_takes:                        list of legal squares that selected piece can legally take on stored as coordinate tuples (List[(x: int, y: int)])
-        en_passants:                        list of pawns that may take via en passant (List[Pawn])
-        en_passant_pawn:                    reference to the pawn that may be taken via en passant (Pawn or None)
-        white_king, black_king:             references to each player's king (Piece)
-        white_king_rook, black_king_rook:   references to each player's kingside rook for checking castling legality (Piece)
-        white_queen_rook, black_queen_rook: references to each player's queenside rook for checking castling legality (Piece)
-        scene:                              the scene where sprites are rendered (Arcade.Scene)
-        pieces:                             list of all pieces currently on the board (List[Piece])
-    '''
- 
-    def __init__(self):
-        '''
-        Initializes Chess; initializes everything needed from Arcade
-        '''
-        super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, title="Nick Baker's Chess")
- 
-        self.color_to_move = WHITE
-        self.king_in_check = False
-        self.selected_piece = None
-        self.game_state = PLAY
-        self.move_list, self.legal_moves, self.legal_takes, self.en_passants = [], [], [], []
-        self.en_passant_pawn = None
-        self.white_king, self.black_king = None, None
-        self.white_king_rook, self.white_queen_rook, self.black_king_rook, self.black_queen_rook = None, None, None, None
- 
-        self.scene = arcade.Scene()
-        self.pieces = self.initialize_pieces()
- 
-        # start drawing the scene, load in all the images
-        arcade.start_render()
-        self.load_indicators()
- 
-        # draw first frame
-        self.on_draw()
- 
-    def on_draw(self) -> NoReturn:
-        '''
-        Draw everything on the chessboard and display legal moves / takes (called every frame by Arcade)
-        '''
-        arcade.start_render()
-        # draw chessboard, value analysis, and whose turn it is
-        self.init_board()
-        self.display_value()
-        self.display_turn()
- 
-        # add undo & hint  buttons to scene
-        temp_sprite_list = []
-        temp_sprite = self.add_sprite((8, 0), "chesssprites/undo.png")
-        temp_sprite_list.append(temp_sprite)
-        temp_sprite = self.add_sprite((8, 1), "chesssprites/hint.png", PIXELS_PER_SQUARE / 200)
-        temp_sprite_list.append(temp_sprite)
- 
-        # add legal moves to scene
-        for entry in self.legal_moves:
-            temp_sprite = self.add_sprite(entry, "chesssprites/brown_circle.png")
-            temp_sprite_list.append(temp_sprite)
- 
-        # add legal takes to scene
-        for entry in self.legal_takes:
-            temp_sprite = self.add_sprite(entry, "chesssprites/red_circle.png", PIXELS_PER_SQUARE / 2222)
-            temp_sprite_list.append(temp_sprite)
- 
-        # display possible en passant takes
-        if self.selected_piece is not None and self.en_passants is not None and self.selected_piece in self.en_passants:
-            temp_sprite = self.add_sprite((self.en_passant_pawn.x, self.en_passant_pawn.y + self.selected_piece.color), "chesssprites/red_circle.png", PIXELS_PER_SQUARE / 2222)
-            temp_sprite_list.append(temp_sprite)
- 
-        # draw everything in the scene then remove everything temporary (moves / takes for selected piece)
-        self.scene.draw()
-        for sprite in temp_sprite_list:
-            if sprite is not None: sprite.kill()
- 
-    def display_value(self) -> NoReturn:
-        '''
-        Displays the material advantage (in pawns) for each player e.g. if white is up 2 pawns,
-        "+2" will be displayed beside white and "-2" will be displayed beside black
-        '''
-        value = 0
-        for piece in self.pieces:
-            if isinstance(piece, Pawn):
-                value += PAWN_VALUE * piece.color
-            elif isinstance(piece, Knight):
-                value += KNIGHT_VALUE * piece.color
-            elif isinstance(piece, Bishop):
-                value += BISHOP_VALUE * piece.color
-            elif isinstance(piece, Rook):
-                value += ROOK_VALUE * piece.color
-            elif isinstance(piece, Queen):
-                value += QUEEN_VALUE * piece.color
-       
-        # draw the text beside each player
-        if value < 0:
-            arcade.draw_text(f"White: {value}", 8 * PIXELS_PER_SQUARE, 0.6 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width = PIXELS_PER_SQUARE, align="left")
-            arcade.draw_text(f"Black: +{-value}", 8 * PIXELS_PER_SQUARE, 9.1 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width = PIXELS_PER_SQUARE, align="left")
- 
-        elif value > 0:
-            arcade.draw_text(f"White: +{value}", 8 * PIXELS_PER_SQUARE, 0.6 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width = PIXELS_PER_SQUARE, align="left")
-            arcade.draw_text(f"Black: -{value}", 8 * PIXELS_PER_SQUARE, 9.1 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width = PIXELS_PER_SQUARE, align="left")
-   
-    def display_turn(self) -> NoReturn:
-        '''
-        Displays whose turn it is at the top of the board, or checkmate / stalemate message
-        '''
-        if self.game_state == PLAY:
-            turn = "White" if self.color_to_move == WHITE else "Black"
-            arcade.draw_text(f"{turn} to move", 0, 9.1 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width=SCREEN_WIDTH, align="center")
- 
-        elif self.game_state == CHECKMATE:
-            turn = "White" if self.color_to_move == BLACK else "Black"
-            arcade.draw_text(f"{turn} wins by Checkmate", 0, 9.1 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width=SCREEN_WIDTH, align="center")
- 
-        elif self.game_state == STALEMATE:
-            turn = "White" if self.color_to_move == BLACK else "Black"
-            arcade.draw_text(f"Draw by Stalemate", 0, 9.1 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width=SCREEN_WIDTH, align="center")
- 
-    def add_sprite(self, coords: tuple(int, int), image_path: str, sizing: float = 0.1) -> arcade.Sprite:
-        '''
-        Adds sprite to the scene and returns a reference to it
- 
-        Paramters:
-            coords:        tuple representing x,y coordinates for where the piece is located (0 to 7)
-            image_path:    the file path to the sprite image e.g. chesssprites/bP for black pawn
-            sizing:        the scale at which to render the image (defaults to 0.1 for 100 x 100 pixel squares)
- 
-        Returns:
-            the created sprite
-        '''
-        sprite = arcade.Sprite(image_path, sizing)
-        sprite.center_x = (coords[0] + 1.5)* PIXELS_PER_SQUARE
-        sprite.center_y = (coords[1] + 1.5) * PIXELS_PER_SQUARE
-        self.scene.add_sprite(image_path, sprite)
-        return sprite
- 
-    def on_mouse_press(self, x: int, y: int, button: int, modifiers: int) -> NoReturn:
-        '''
-        Lets user select pieces, move, etc. with mouse clicks (called by Arcade every time mouse is clicked)
- 
-        Parameters:
-            x, y:                   the pixel coordinates of mouse click where 0 is bottom left of the window (0 to SCREEN_WIDTH/SCREEN_HEIGHT respectively)
-            button (not used):      right or left mouse button or other (1 corresponds to right; 4 corresponds to left)
-            modifiers (not used):   0 normally, 2 if shift pressed, 4 if ctrl pressed, etc.
-        '''
- 
-        # check if undo button pressed
-        if x > 9 * PIXELS_PER_SQUARE and x < 10 * PIXELS_PER_SQUARE and y < 2 * PIXELS_PER_SQUARE and y > 1 * PIXELS_PER_SQUARE:
-            # undo last move, check conditional variables, re-generate fen
-            self.undo_move()
-            self.king_in_check = self.in_check()
-            self.game_state = PLAY
-            return
-       
-        # stop play if game is over
-        if self.game_state != PLAY: return
-
-        # check if help button pressed
-        if x > 9 * PIXELS_PER_SQUARE and x < 10 * PIXELS_PER_SQUARE and y < 3 * PIXELS_PER_SQUARE and y > 2 * PIXELS_PER_SQUARE:
-            # undo last move, check conditional variables, re-generate fen
-            self.play_best_move()
-            return
- 
-        # convert x and y in pixels to integer representing square clicked (both 0 to 7)
-        x_coord = x // PIXELS_PER_SQUARE - 1
-        y_coord = y // PIXELS_PER_SQUARE - 1
- 
-        # set cur_piece to be the piece clicked
-        cur_piece = self.get_piece_at(x_coord, y_coord)
- 
-        # check if user is trying to castle
-        if self.selected_piece is not None and isinstance(self.selected_piece, King) and cur_piece is not None and isinstance(cur_piece, Rook):
-            # try castle (may fail because king moved, trying to castle through check, etc.)
-            if self.try_castle(cur_piece): return
-       
-        # check if legal move has been selected
-        if self.selected_piece is not None and self.selected_piece.color == self.color_to_move and cur_piece is None and (x_coord, y_coord) in self.legal_moves:
-            self.move_piece(x_coord, y_coord)
- 
-        # check if legal take has been selected
-        elif self.selected_piece is not None and self.selected_piece.color == self.color_to_move and cur_piece is not None and self.selected_piece.color != cur_piece.color and (x_coord, y_coord) in self.legal_takes:
-            self.take_piece(x_coord, y_coord, cur_piece)
- 
-        # check if take via en passant
-        elif self.en_passant_pawn is not None and self.selected_piece is not None and self.en_passant_pawn.color != self.selected_piece.color and x_coord == self.en_passant_pawn.x and y_coord == (self.en_passant_pawn.y + self.selected_piece.color) and self.selected_piece in self.en_passants:
-            self.take_piece(x_coord, y_coord, self.en_passant_pawn)
- 
-        # check if a new piece that can move has been selected
-        elif cur_piece is not None and cur_piece.color == self.color_to_move:
-            # select piece and show legal moves for it
-            self.selected_piece = cur_piece
-            self.legal_moves, self.legal_takes = [], []
-            self.display_legal_moves(self.selected_piece)
- 
-        # deselect piece, toggle off legal moves
-        else:
-            self.selected_piece = None
-            self.legal_moves = []
-            self.legal_takes = []
- 
-        # record whether king in check
-        self.king_in_check = self.in_check()
- 
-        # check for checkmate / stalemate / draw by insufficient material
-        self.game_state = self.check_legal_moves()
- 
-    def check_legal_moves(self) -> int:
-        '''
-        Iterate through all pieces and ensure that a legal move exists; otherwise end the game
-        and note checkmate / stalemate
- 
-        Returns:
-            int corresponding to the gamestate constants (PLAY, CHECKMATE, etc.)
-        '''
-        # back up legal moves & takes currently being displayed
-        backup_moves = self.legal_moves
-        backup_takes = self.legal_takes
-        self.legal_moves, self.legal_takes = [], []
- 
-        found_legal_moves = False
-
-        # record true if there is a legal move or take found
-        for piece in self.pieces:
-            if piece.color == self.color_to_move:
-                self.display_legal_moves(piece)
-                if len(self.legal_moves) + len(self.legal_takes) != 0:
-                    found_legal_moves = True
-                    break
-
-        # restore backups
-        self.legal_moves = backup_moves
-        self.legal_takes = backup_takes
-        
-        # return appropriate game state
-        if found_legal_moves: return PLAY
-        return CHECKMATE if self.in_check() else STALEMATE
- 
-    def generate_fen(self) -> str:
-        '''
-        Generates a FEN string (standard way to represent the state of a chess board in a single string).
-        The locations of all pieces, legality of castling, and who is to move is all stored; the position
-        can be then exported to a website or engine. Currently used to send the board state to stockfish
-        in play_best_move()
- 
-        Returns:
-            The generated FEN string
-        '''
-        fen = ""
-        board = [[0 for x in range(8)] for y in range(8)]
-        self.initialize_board(board)
- 
-        # iterate through every square in the chessboard, noting whether it is blank or occupied
-        for y in range(7, -1, -1):
-            count = 0
-            # for every row of the chessboard, generate a string the represents the pieces (e.g. 3b2R means 3 blank spaces,
-            # then lowercase is black and b for bishop so black bishop, then 2 blank spaces, then a white rook)
-            cur_fen_line = ""
-            for x in range(8):
-                if board[x][y] == 0:
-                    count += 1
-                else:
-                    if count != 0:
-                        cur_fen_line += str(count)
-                        count = 0
-                    cur_fen_line += str(board[x][y])
-           
-            if count != 0: cur_fen_line += str(count)
-           
-            # strings representing ranks (rows) of the chessboard are separated by slashes
-            if len(fen) != 0: fen += "/"
-            fen += f"{cur_fen_line}"
- 
-        # note who is to move
-        fen += " w " if self.color_to_move == WHITE else " b "
- 
-        white_cant_castle = self.white_king.moved or (self.white_king_rook.moved and self.white_queen_rook.moved)
-        black_cant_castle = self.black_king.moved or (self.black_king_rook.moved and self.black_queen_rook.moved)
-       
-        # note who can castle, and what side: uppercase is for white, 'k' is for kingside, 'q' for queenside, '-' means can't castle either side
-        # e.g. -q means white cannot castle and black can only castle queenside
-        if (white_cant_castle and black_cant_castle):
-            fen += "-"
-           
-        elif not white_cant_castle:
-            if not self.white_king_rook.moved: fen += "K"
-            if not self.white_queen_rook.moved: fen += "Q"
- 
-        if not black_cant_castle:
-            if not self.black_king_rook.moved: fen += "k"
-            if not self.black_queen_rook.moved: fen += "q"
- 
-        # move count etc. which is not necessary for engine analysis or exporting position but required to be included in the string sometimes
-        fen += " - 0 1"
-        return fen
- 
-    def play_best_move(self) -> NoReturn:
-        '''
-        Plays the best engine move stockfish could find
-        '''
-        # ask stockfish for best move
-        stockfish = Stockfish(PATH)
-        fen = self.generate_fen()
-        stockfish.set_fen_position(fen)
-        best_move = stockfish.get_best_move()
-
-        # parse the move and do it
-        move_from, move_to = self.convert_stockfish_output_to_coords(best_move)
-        self.stockfish_move(move_from, move_to)
-
-        # record whether king in check
-        self.king_in_check = self.in_check()
- 
-        # check for checkmate / stalemate / draw by insufficient material
-        self.game_state = self.check_legal_moves()
-
-    def convert_stockfish_output_to_coords(self, move: str) -> tuple(tuple(int, int), tuple(int, int)):
-        '''
-        Helper function for play_best_move, converts 2 strings
-        of 'chess coordinates' to x, y coordinates relevant to the chess board
-
-        e.g. convert_stockfish_output_to_coords("e5d3") -> (4, 5), (3, 3)
-
-        Parameters:
-            move:   string containing both the 'chess coordinates' of the piece to move
-                    and where to move it to
-        Returns:
-            Two coordinate tuples in the form (x,y) corresponding to the input coordinates
-        '''
-        # separate the input
-        prev_pos_rank, prev_pos_y = move[0], int(move[1])
-        after_pos_rank, after_pos_y = move[2], int(move[3])
-        
-        # convert rank name ('a', 'b', 'c', ...) to cooresponding int (0, 1, 2, ...)
-        rank_to_coord = lambda rank : ord(rank) - 97
-        
-        prev_coords = (rank_to_coord(prev_pos_rank), prev_pos_y - 1)
-        after_coords = (rank_to_coord(after_pos_rank), after_pos_y - 1)
-        return prev_coords, after_coords
-
-    def stockfish_move(self, move_from: tuple(int, int), move_to: tuple(int, int)) -> NoReturn:
-        '''
-        Helper function for play_best_move, moves the piece from the first set of coordinates
-        to the second set, taking / castling if applicable
-
-        Parameters:
-            move_from:  tuple containing coordinates of the piece to move
-            move_to:    tuple containing coordinates of where to move the piece
-        '''
-        # parse coords
-        x1, y1 = move_from
-        x2, y2 = move_to
-
-        # select pieces
-        self.selected_piece = self.get_piece_at(x1, y1)
-        piece_to_take = self.get_piece_at(x2, y2)
-        
-        # check if castling
-        if isinstance(self.selected_piece, King) and abs(x1 - x2) == 2:
-            # get queenside rook or kingside rook
-            if x1 - x2 > 0:
-                rook = self.get_piece_at(x2 - 2, y2)
-                print(x2 - 2, y2)
-            else:
-                rook = self.get_piece_at(x2 + 1, y2)
-            self.try_castle(rook)
-
-        # otherwise move / take
-        elif piece_to_take is None:
-            self.move_piece(x2, y2)
-
-        else:
-            self.take_piece(x2, y2, piece_to_take)
-
-    def initialize_board(self, board: list[list]) -> NoReturn:
-        '''
-        Fills board with references to the pieces that occupy the corresponding squares
-       
-        Parameters:
-            board: 2-dimensional list representing the chess board (should be 8 x 8 and empty when passed in)
-        '''
-        for piece in self.pieces:
-            board[piece.x][piece.y] = piece
- 
-    def promote_selected_pawn(self) -> NoReturn:
-        '''
-        Promotes the selected piece (self.selected_piece) to a queen, meant to be called by Chess.move() or Chess.take() when a pawn reaches the last rank of the board
-        '''
-        self.selected_piece.__class__ = Queen
-        self.selected_piece.sprite.kill()
-        sprite_image = "chesssprites/wQ.png" if self.selected_piece.color == WHITE else "chesssprites/bQ.png"
-        self.selected_piece.add_sprite(self.scene, sprite_image)
- 
-    def take_piece(self, x_coord: int, y_coord: int, cur_piece: Piece) -> NoReturn:
-        '''
-        Takes a piece on the chessboard - removes the taken piece from the sprite list and piece list, udpates the position & sprite position of the piece taking (self.selected_piece)
- 
-        Parameters:
-            x_coord, y_coord:   the coordinates the piece to be taken is on (0 to 7)
-            cur_piece:          the piece to be taken
-            en_passants:        the list of pawns that may take via en passant (defaults to None)
-            en_passant_pawn:    reference to pawn that may be taken via en passant (defaults to None)
-        '''
-        # get pixel position of where the sprite should be
-        normalized_x  = (x_coord + 1) * PIXELS_PER_SQUARE + PIXELS_PER_SQUARE / 2
-        normalized_y  = (y_coord + 1) * PIXELS_PER_SQUARE + PIXELS_PER_SQUARE / 2
-       
-        # record info to create Move record
-        prev_x, prev_y, moved = self.selected_piece.x, self.selected_piece.y, self.selected_piece.moved
- 
-        # update position of piece taking
-        self.selected_piece.x = x_coord
-        self.selected_piece.y = y_coord
-        self.selected_piece.sprite.center_x = normalized_x
-        self.selected_piece.sprite.center_y = normalized_y
-        self.selected_piece.moved = True
- 
-        # promote pawn if needed
-        if (y_coord == 0 or y_coord == 7) and isinstance(self.selected_piece, Pawn):
-            self.promote_selected_pawn()
- 
-            # record the move
-            current_move = Move(prev_x, prev_y, x_coord, y_coord, self.selected_piece, cur_piece, moved, cur_piece.moved, cur_piece.sprite_image, True, self.en_passants, self.en_passant_pawn)
-            self.move_list.append(current_move)
-        else:
-            # record the move
-            current_move = Move(prev_x, prev_y, x_coord, y_coord, self.selected_piece, cur_piece, moved, cur_piece.moved, cur_piece.sprite_image, False, self.en_passants, self.en_passant_pawn)
-            self.move_list.append(current_move)
-           
-        # remove the taken piece
-        self.selected_piece = None
-        cur_piece.sprite.kill()
-        self.pieces.remove(cur_piece)
- 
-        # reset legal moves & takes
-        self.legal_moves.clear()
-        self.legal_takes.clear()
-        self.en_passants.clear()
-        self.en_passant_pawn = None
- 
-        # move to next turn
-        self.color_to_move *= -1
- 
-    def move_piece(self, x_coord: int, y_coord: int) -> NoReturn:
-        '''
-        Moves self.selected_piece to a new square and updates the sprite location
- 
-        Parameters:
-            x_coord, y_coord:   new location of self.selected_piece
-        '''
-        # get pixel position of where the sprite should be
-        normalized_x  = (x_coord + 1) * PIXELS_PER_SQUARE + PIXELS_PER_SQUARE / 2
-        normalized_y  = (y_coord + 1) * PIXELS_PER_SQUARE + PIXELS_PER_SQUARE / 2
- 
-        # record info to create Move record
-        prev_x, prev_y, moved = self.selected_piece.x, self.selected_piece.y, self.selected_piece.moved
-        en_passants_backup, en_passant_pawn_backup = list(self.en_passants), self.en_passant_pawn
- 
-        # update en passants if pawn moved 2 spaces
-        if abs(self.selected_piece.y - y_coord) == 2 and isinstance(self.selected_piece, Pawn):
-            pawn_left = self.get_piece_at(x_coord + 1, y_coord)
-            pawn_right = self.get_piece_at(x_coord - 1, y_coord)
-            self.color_to_move *= -1
-            if pawn_left is not None and not self.in_check_after_move(self.selected_piece.x, pawn_left.y + pawn_left.color, pawn_left, self.selected_piece):
-                self.en_passants.append(pawn_left)
-           
-            if pawn_right is not None and not self.in_check_after_move(self.selected_piece.x, pawn_right.y + pawn_right.color, pawn_right, self.selected_piece):
-                self.en_passants.append(pawn_right)
-            self.en_passant_pawn = self.selected_piece
-            self.color_to_move *= -1
-        else:
-            self.en_passants.clear()
-            self.en_passant_pawn = None
- 
-        # update position of piece
-        self.selected_piece.x = x_coord
-        self.selected_piece.y = y_coord
-        self.selected_piece.sprite.center_x = normalized_x
-        self.selected_piece.sprite.center_y = normalized_y
-        self.selected_piece.moved = True
-       
-        # promote pawns if necessary
-        if isinstance(self.selected_piece, Pawn) and (y_coord == 0 or y_coord == 7):
-            self.promote_selected_pawn()
- 
-            # record the move
-            current_move = Move(prev_x, prev_y, x_coord, y_coord, self.selected_piece, None, moved, None, None, True, en_passants_backup, en_passant_pawn_backup)
-            self.move_list.append(current_move)
-        else:
-            # record the move
-            current_move = Move(prev_x, prev_y, x_coord, y_coord, self.selected_piece, None, moved, None, None, False, en_passants_backup, en_passant_pawn_backup)
-            self.move_list.append(current_move)
-           
-        # deselect the piece; reset legal moves & takes
-        self.selected_piece = None
-        self.legal_moves = []
-        self.legal_takes = []
- 
-        # move to next turn
-        self.color_to_move *= -1
- 
-    def try_castle(self, rook: Rook) -> bool:
-        '''
-        Checks if castling is legal - rook hasn't moved, king hasn't moved, none of the castling squares are in check
- 
-        Parameters:
-            rook:  the rook to be castled with
- 
-        Returns:
-            False if castling with the selected king & rook is illegal, pieces do not move
-            True if castling is legal, pieces moved to castled positions
-        '''
-        king = self.selected_piece
-
-        if not self.can_castle(king, rook): return False
-
-        # record the move
-        castle_move = Move(king.x, king.y, rook.x, rook.y, king, rook, None, None, None)
-
-        # determine whether to attempt kingside or queenside castle
-        kingside_castle = rook.x > king.x
-
-        # swap pieces
-        temp_x, temp_y = king.x, king.y
-        king.x, king.y = rook.x, rook.y
-        rook.x, rook.y = temp_x, temp_y
-        king.moved, rook.moved = True, True
-
-        if kingside_castle:
-            king.x -= 1
-            rook.x += 1
-        else:
-            king.x += 1
-            rook.x -= 2
- 
-        # update sprites
-        king.sprite.center_x = (king.x + 1.5) * PIXELS_PER_SQUARE
-        king.sprite.center_y = (king.y + 1.5) * PIXELS_PER_SQUARE
-        rook.sprite.center_x = (rook.x + 1.5) * PIXELS_PER_SQUARE
-        rook.sprite.center_y = (rook.y + 1.5) * PIXELS_PER_SQUARE
- 
-        # record the move & reset values pertaining to selected piece
-        self.move_list.append(castle_move)
- 
-        self.king_in_check = self.in_check()
-        self.legal_moves = []
-        self.legal_takes = []  
-        self.color_to_move *= -1
-        self.selected_piece = None
-        return True
-
-    def can_castle(self, king: King, rook: Rook) -> bool:
-        '''
-        Returns whether or not castling between the given rook and king is legal.
-
-        Parameters:
-            king:   reference to the king object
-            rook:   reference to the rook object
-
-        Returns:
-            True if castling is legal, False if not (i.e. king has moved, rook has moved, etc.)
-        '''
-        # can't castle if rook moved or rook is not same color as king or if king is in check
-        if king.moved or rook.moved or king.color != rook.color or self.in_check(): return False
-
-        # determine whether to attempt kingside or queenside castle
-        kingside_castle = rook.x > king.x
- 
-        # return false if castling through check
-        if kingside_castle:
-            if self.in_check(king.x + 1, king.y) or self.in_check(king.x + 2, king.y) or self.in_check(king.x + 3, king.y): return False
- 
-            piece_1 = self.get_piece_at(king.x + 1, king.y)
-            piece_2 = self.get_piece_at(king.x + 2, king.y)
-            piece_3 = None
-        else:
-            if self.in_check(king.x - 1, king.y) or self.in_check(king.x - 2, king.y) or self.in_check(king.x - 3, king.y) or self.in_check(king.x - 4, king.y): return False
- 
-            piece_1 = self.get_piece_at(king.x - 1, king.y)
-            piece_2 = self.get_piece_at(king.x - 2, king.y)
-            piece_3 = self.get_piece_at(king.x - 3, king.y)
- 
-        # return false if any pieces between the king & rook
-        if piece_1 is not None or piece_2 is not None or piece_3 is not None: return False
-
-        # no reason castling is illegal; return true
-        return True
-
-    def in_check(self, x: int = None, y: int = None) -> bool:
-        '''
-        Checks whether a given square or king is in check. If x, y supplied checks that square, otherwise,
-        checks the current king
- 
-        Parameters:
-            x, y:   coordinates of the square to check (defaults to None)
- 
-        Returns:
-            True if square is in check, False otherwise
-        '''
-        # back up currently displayed moves & takes
-        backup_legal = []
-        backup_takes = []
-        for move in self.legal_moves:
-            backup_legal.append(move)
- 
-        for move in self.legal_takes:
-            backup_takes.append(move)
- 
-        self.legal_takes = []
-        self.legal_moves = []
- 
-        # check the square containing the current king for checks if no coordinates specified
-        if x is None or y is None:
-             (x,y) = (self.white_king.x, self.white_king.y) if self.color_to_move == WHITE else (self.black_king.x, self.black_king.y)
- 
-        to_return = False
-        # check every piece that could attack the square (of the color not currently moving)
-        for piece in self.pieces:
-            if piece.color == self.color_to_move: continue
-            piece.move(self)
-            # break if the square is in check
-            if (x, y) in self.legal_takes or (x,y) in self.legal_moves:
-                to_return = True
-                break
-   
-            self.legal_takes = []
- 
-        # restore currently displayed moves & takes, return whether the square is in check
-        self.legal_moves = backup_legal
-        self.legal_takes = backup_takes
-        return to_return
- 
-    def undo_move(self) -> NoReturn:
-        '''
-        Undo the last move in self.move_list; clears self.legal_takes and self.legal_moves
-        '''
-        # check if there are moves to undo
-        if len(self.move_list) == 0: return
- 
-        # record values of last move
-        last_move = self.move_list[-1]
-        (prev_x, prev_y, new_x, new_y, moved_piece, taken_piece, moved_piece_moved, taken_piece_moved, taken_sprite, promotion, en_passants, en_passant_pawn) = last_move.return_data()
- 
-        # undo move / take
-        if moved_piece_moved is not None:
-           
-            if promotion:
-                # unpromote pawn
-                moved_piece.__class__ = Pawn
-                moved_piece.sprite.kill()
-                sprite_image = "chesssprites/wP.png" if moved_piece.color == WHITE else "chesssprites/bP.png"
-                moved_piece.add_sprite(self.scene, sprite_image)
- 
-            # return moved piece to previous position
-            moved_piece.x = prev_x
-            moved_piece.y = prev_y
-            moved_piece.sprite.center_x = (prev_x + 1.5) * PIXELS_PER_SQUARE
-            moved_piece.sprite.center_y = (prev_y + 1.5) * PIXELS_PER_SQUARE
-            moved_piece.moved = moved_piece_moved
- 
-            # return taken piece to previous position IF piece was taken
-            if taken_piece is not None:
-                self.pieces.append(taken_piece)
-                taken_piece.add_sprite(self.scene, taken_sprite)
-                taken_piece.moved = taken_piece_moved
- 
-        # undo castle
-        else:
-            # swap positions of king & rook and update sprites
-            taken_piece.x = new_x
-            taken_piece.y = new_y
-            taken_piece.sprite.center_x = (new_x + 1.5) * PIXELS_PER_SQUARE
-            taken_piece.sprite.center_y = (new_y + 1.5) * PIXELS_PER_SQUARE
- 
-            moved_piece.x = prev_x
-            moved_piece.y = prev_y
-            moved_piece.sprite.center_x = (prev_x + 1.5) * PIXELS_PER_SQUARE
-            moved_piece.sprite.center_y = (prev_y + 1.5) * PIXELS_PER_SQUARE
- 
-            moved_piece.moved = False
-            taken_piece.moved = False
- 
-        # update move_list and who is to move
-        self.move_list.pop()
-        self.color_to_move *= -1
- 
-        # clear legal move and takes as board state has changed; re-enable en passant if necessary; unselect currently selected piece
-        self.legal_moves = []
-        self.legal_takes = []
-        self.en_passants = en_passants
-        self.en_passant_pawn = en_passant_pawn
- 
-        self.selected_piece = None
- 
-    def display_legal_moves(self, piece: Piece) -> NoReturn:
-        '''
-        Adds all legal moves & takes for the specified piece to self.legal_moves & self.legal_takes (respectively)
- 
-        Parameters:
-            piece:  the piece to display moves for (Piece)
-        '''
-        # add all possible moves / takes to self.legal_moves / self.legal_takes
-        piece.move(self)
- 
-        # remove moves that are outside the board
-        to_remove = []
-        for move in self.legal_moves:
-            (x,y) = move
-            if x < 0 or x > 7 or y < 0 or y > 7: to_remove.append(move)
-        for entry in to_remove:
-            self.legal_moves.remove(entry)
- 
-        # if king is in check after piece moves, move is not legal thus remove it
-        for move in self.legal_moves:
-            (x,y) = move
-            if self.in_check_after_move(x, y, piece): self.legal_moves.remove(move)
- 
-        # if king is in check after piece takes, move is not legal thus remove it
-        for move in self.legal_takes:
-            (x,y) = move
-            piece_to_take = self.get_piece_at(x, y)
-            if self.in_check_after_move(x, y, piece, piece_to_take): self.legal_takes.remove(move)
- 
-    def in_check_after_move(self, x: int, y: int, piece: Piece, piece_to_take: Piece = None) -> bool:
-        '''
-        Performs the specified move and returns whether the king is in check after making the move. If
-        taking another piece piece_to_take should be specified, otherwise, it should not be given & default to None.
- 
-        Parameters:
-            x, y:           coordinates to which the piece is going to move / take (int, 0 to 7)
-            piece:          the piece that is going to move / take (Piece)
-            piece_to_take:  the piece that is going to be taken (Piece, defaults to None)
- 
-        Returns:
-            True if king is in check after making the move, otherwise False
-        '''
-        to_return = False
-        prev_x, prev_y = piece.x, piece.y
- 
-        # temporarily update positions of piece and piece_to_take
-        piece.x = x
-        piece.y = y
- 
-        # remove piece_to_take from the board temporarily if specified
-        if piece_to_take:
-            piece_to_take.x = -1
-            piece_to_take.y = -10
- 
-        # note if in check after making move
-        if self.in_check(): to_return = True
- 
-        # put pieces back
-        piece.x = prev_x
-        piece.y = prev_y
- 
-        if piece_to_take:
-            piece_to_take.x = x
-            piece_to_take.y = y
- 
-        return to_return
- 
-    def get_piece_at(self, x: int, y: int) -> Piece:
-        '''
-        Returns the piece at specified x, y coordinates on the board
- 
-        Parameters:
-            x, y:   square to check on the board (int, 0 to 7)
-       
-        Returns:
-            None if square is unoccupied, otherwise a reference to the piece occupying the square
-        '''
-        for piece in self.pieces:
-            if piece.x == x and piece.y == y:
-                return piece
- 
-        return None
- 
-    def check_moves_on_square(self, cur_piece: Piece, x_offset: int, y_offset: int, can_take: bool = True, can_move: bool = True) -> bool:
-        '''
-        Given a square and piece, checks if that piece could move / take on that square and if so,
-        appends the move to self.legal_moves or self.legal_takes. Returns True if the square is occupied
-        by a piece of either color, False otherwise. Takes will only be appended if
-        can_take is True, Moves will only be appended if can_move is True. The square's coordinate
-        are calculated by adding the offsets to the current coordinates of cur_piece.
- 
-        Parameters:
-            cur_piece:          the piece to move (Piece)
-            x_offset, y_offset: which square to check relative to cur_piece's positions (int, 0 to 7)
-                                ex. x_offset = 2, y_offset = 2, cur_piece is at 2,3 -> the coordinates to check would be 4,5
-            can_take:           indicates whether the piece should be allowed to take (Boolean, defaults to True)
-            can_move:           indicates whether the piece should be allowed to move (Boolean, defaults to True)
-       
-        Returns:
-            True if a piece is located on the square to check, False otherwise.
- 
-        Example use:   for checking pawn moves, pawns can take diagonally but cannot move diagonally -> call with can_take = True, can_move = False
-        '''
-        x_coord = cur_piece.x + x_offset
-        y_coord = cur_piece.y + y_offset
- 
-        other_piece = self.get_piece_at(x_coord, y_coord)
-
-        # add all legal moves where applicable
-        if other_piece is None and can_move:
-            self.legal_moves.append((x_coord, y_coord))
-            return False
-        elif other_piece is not None and other_piece.color != cur_piece.color and can_take:
-            self.legal_takes.append((x_coord, y_coord))
-       
-        return True
- 
-    def initialize_pieces(self) -> list[Piece]:
-        '''
-        Initializes a full board of chess pieces at the correct starting locations & adds the proper sprites.
- 
-        Returns:
-            piece_list, a list of references to all Piece objects created.
-        '''
-        piece_list = []
-       
-        for x in range(8):
-           
-            self.create_piece(piece_list, Pawn, WHITE, x, 1, "chesssprites/wP.png")
-            self.create_piece(piece_list, Pawn, BLACK, x, 6, "chesssprites/bP.png")
- 
-            if x == 0:
-                self.white_queen_rook = self.create_piece(piece_list, Rook, WHITE, x, 0, "chesssprites/wR.png")
-                self.black_queen_rook = self.create_piece(piece_list, Rook, BLACK, x, 7, "chesssprites/bR.png")
-               
-            elif x == 7:
-                self.white_king_rook = self.create_piece(piece_list, Rook, WHITE, x, 0, "chesssprites/wR.png")
-                self.black_king_rook = self.create_piece(piece_list, Rook, BLACK, x, 7, "chesssprites/bR.png")
- 
-            elif x == 1 or x == 6:
-                self.create_piece(piece_list, Knight, WHITE, x, 0, "chesssprites/wN.png")
-                self.create_piece(piece_list, Knight, BLACK, x, 7, "chesssprites/bN.png")
-               
-            elif x == 2 or x == 5:
-                self.create_piece(piece_list, Bishop, WHITE, x, 0, "chesssprites/wB.png")
-                self.create_piece(piece_list, Bishop, BLACK, x, 7, "chesssprites/bB.png")
- 
-            elif x == 3:
-                self.create_piece(piece_list, Queen, WHITE, x, 0, "chesssprites/wQ.png")
-                self.create_piece(piece_list, Queen, BLACK, x, 7, "chesssprites/bQ.png")
-           
-            elif x == 4:
-                self.white_king = self.create_piece(piece_list, King, WHITE, x, 0, "chesssprites/wK.png")
-                self.black_king = self.create_piece(piece_list, King, BLACK, x, 7, "chesssprites/bK.png")
-           
-        return piece_list
- 
-    def create_piece(self, piece_list: list[Piece], piece_class: type, color: int, x: int, y: int, sprite_image: str) -> Piece:
-        '''
-        Helper function for initialize_pieces. Creates a Piece object of the specified type (Rook, Knight, etc.),
-        adds the specified sprite image, and adds it to piece_list.
- 
-        Parameters:
-            piece_list:     the list to append the piece to (List[Piece])
-            piece_class:    the class of the Piece (Rook, Knight, etc.)
-            color:          color of the piece to create (int, based on WHITE / BLACK constants)
-            x, y:           coordinates of the piece (int, 0 to 7)
-            sprite_image:   path to the image for the sprite (String)
- 
-        Returns:
-            reference to the created piece (Rook, Knight, etc.)
-        '''
-        piece = piece_class(color, x, y)
-        piece.add_sprite(self.scene, sprite_image)
-        piece_list.append(piece)
-        return piece
- 
-    def init_board(self) -> NoReturn:
-        '''
-        Draws the squares of the board, highlights the square self.selected_piece is on, highlights the square king is on if in check,
-        draws the rank / file letters and numbers
-        '''
-        x = PIXELS_PER_SQUARE
-        y = 2 * PIXELS_PER_SQUARE
-        count = 0
- 
-        arcade.draw_lrtb_rectangle_filled(0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, arcade.color.BISTRE)
- 
-        while x < SCREEN_WIDTH - PIXELS_PER_SQUARE:
-            while y < SCREEN_HEIGHT:
-                if count % 2 == 0:
-                    arcade.draw_lrtb_rectangle_filled(x, x + PIXELS_PER_SQUARE, y, y - PIXELS_PER_SQUARE, arcade.color.CAMEL)
-                else:
-                    arcade.draw_lrtb_rectangle_filled(x, x + PIXELS_PER_SQUARE, y, y - PIXELS_PER_SQUARE, arcade.color.CHAMPAGNE)
-                count += 1
-                y += 100
-            count += 1
-            x += PIXELS_PER_SQUARE
-            y = 2 * PIXELS_PER_SQUARE
- 
- 
-        if self.selected_piece is not None:
-                temp_x = (self.selected_piece.x + 1) * PIXELS_PER_SQUARE
-                temp_y = (self.selected_piece.y + 1) * PIXELS_PER_SQUARE
-                arcade.draw_lrtb_rectangle_filled(temp_x, temp_x + PIXELS_PER_SQUARE, temp_y + PIXELS_PER_SQUARE, temp_y, arcade.color.LIGHT_SALMON)
- 
-        if self.king_in_check:
-           
-            king = self.white_king if self.color_to_move == WHITE else self.black_king
- 
-            temp_x = (king.x + 1) * PIXELS_PER_SQUARE
-            temp_y = (king.y + 1) * PIXELS_PER_SQUARE
-            arcade.draw_lrtb_rectangle_filled(temp_x, temp_x + PIXELS_PER_SQUARE, temp_y + PIXELS_PER_SQUARE, temp_y, arcade.color.CAMEO_PINK)
- 
-        # draw the rank / file letters and numbers
-        self.draw_rank_file_names()
-       
-    def draw_rank_file_names(self) -> NoReturn:
-        '''
-        Helper function for init_board. Draws A B C D ... in the bottom right of the bottom row of squares (the files) and
-        1 2 3 4 ... in the top left of the leftmost column of squares (the ranks)
-        '''
-        arcade.draw_text("A", 1.75 * PIXELS_PER_SQUARE, 1.05 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("B", 2.75 * PIXELS_PER_SQUARE, 1.05 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("C", 3.75 * PIXELS_PER_SQUARE, 1.05 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("D", 4.75 * PIXELS_PER_SQUARE, 1.05 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("E", 5.75 * PIXELS_PER_SQUARE, 1.05 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("F", 6.75 * PIXELS_PER_SQUARE, 1.05 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("G", 7.75 * PIXELS_PER_SQUARE, 1.05 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("H", 8.75 * PIXELS_PER_SQUARE, 1.05 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
- 
-        arcade.draw_text("1", 1.05 * PIXELS_PER_SQUARE, 1.75 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("2", 1.05 * PIXELS_PER_SQUARE, 2.75 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("3", 1.05 * PIXELS_PER_SQUARE, 3.75 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("4", 1.05 * PIXELS_PER_SQUARE, 4.75 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("5", 1.05 * PIXELS_PER_SQUARE, 5.75 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("6", 1.05 * PIXELS_PER_SQUARE, 6.75 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("7", 1.05 * PIXELS_PER_SQUARE, 7.75 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
-        arcade.draw_text("8", 1.05 * PIXELS_PER_SQUARE, 8.75 * PIXELS_PER_SQUARE, arcade.color.BLACK, 16, width=PIXELS_PER_SQUARE, align="left")
- 
-    def load_indicators(self) -> NoReturn:
-        '''
-        Creates sprite images for the legal move / legal take indicators then instantly removes them. If this is not done,
-        then the first time a piece is clicked, there will be a half-second delay before the legal moves are displayed as the
-        images are not "loaded in".
-        '''
-        load_move_indicator = self.add_sprite((-1, -1), "chesssprites/brown_circle.png")
-        load_take_indicator = self.add_sprite((-1, -1), "chesssprites/red_circle.png")
-        load_move_indicator.kill()
-        load_take_indicator.kill()
- 
-class Piece:
-    '''
-    Piece class - represents a Piece on the chess board and is parent class to Pawn, Bishop, Knight, Rook, Queen, King
- 
-    Attributes:
-        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
-        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
-       sprite:         sprite object to visually represent the piece for rendering through Arcade (Arcade.Sprite, initialized to None until add_sprite called)
-        sprite_image:   url of the image to use (String, initialized to None until add_sprite called)
-        moved:          repreents whether or not the piece has moved (Boolean, initialized to False)
-    '''
- 
-    def __init__(self, color: int, x: int, y: int):
-        '''
-        Initializes Piece; sprite, sprite_image, moved initialized to None, None, False automatically
- 
-        Parameters:
-            color:  integer representing the piece's color
-            x, y:   coordinates representing the piece's location
-        '''
-        self.color = color
-        self.x = x
-        self.y = y
-        self.sprite = None
-        self.sprite_image = None
-        self.moved = False
- 
-    def add_sprite(self, scene: arcade.scene, sprite_image: str):
-        '''
-        Adds sprite to the arcade scene; does not return
-       
-        Parameters:
-            scene:          the scene to render the sprite
-            sprite_image:   url of the image to use e.g. Chesssprites/bP.png for black pawn
-        '''
-        self.sprite = arcade.Sprite(sprite_image, PIXELS_PER_SQUARE / 1000)
-        self.sprite.center_x = (self.x + 1.5) * PIXELS_PER_SQUARE
-        self.sprite.center_y = (self.y + 1.5) * PIXELS_PER_SQUARE
-        scene.add_sprite(f"Piece at {self.x}, {self.y}", self.sprite)
-        self.sprite_image = sprite_image
- 
-class Rook(Piece):
-    '''
-    Rook class - child class of Piece, represents a rook on the chessboard
- 
-    Attributes:
-        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
-        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
-        value:          represents the "value in pawns" of the piece (int, corresponds to ROOK_VALUE constant)
-    '''
-    def __init__(self, color: int, x: int, y: int):
-        '''
-        Initializes Rook; uses Piece constructor
-        '''
-        Piece.__init__(self, color, x, y)
-        self.value = ROOK_VALUE
-   
-    def __str__(self) -> str:
-        '''
-        Standard string representation of a chess piece for generating FEN
-        strings - lowercase for white, uppercase for black
-        '''
-        return "R" if self.color == WHITE else "r"
- 
-    # Adds all potential "moves" to self.legal_moves and all potential "takes"
-    # to self.legal_takes. Moves and takes later evaluated to ensure they do
-    # not move king into check by Chess.display_legal_moves
-    def move(self, game_object: Chess) -> NoReturn:
-        '''
-        Adds all empty squares the rook could possibly move to to game_object.legal_moves
-        and all pieces the piece could possibly take to game_object.legal_takes
- 
-        Parameters:
-            game_object:    instance of Chess
-        '''
-        for i in range(1, 8):
-            if game_object.check_moves_on_square(self, i, 0): break
-           
-        for i in range(1, 8):
-            if game_object.check_moves_on_square(self, -i, 0): break
- 
-        for i in range(1, 8):
-            if game_object.check_moves_on_square(self, 0, -i): break
- 
-        for i in range(1, 8):
-            if game_object.check_moves_on_square(self, 0, i): break
- 
-class Knight(Piece):
-    '''
-    Knight class - child class of Piece, represents a rook on the chessboard
- 
-    Attributes:
-        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
-        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
-        value:          represents the "value in pawns" of the piece (int, corresponds to KNIGHT_VALUE constant)
-    '''
-    def __init__(self, color: int, x: int, y: int):
-        '''
-        Initializes Knight; uses Piece constructor
-        '''
-        Piece.__init__(self, color, x, y)
-        self.value = KNIGHT_VALUE
- 
-    def __str__(self) -> str:
-        '''
-        Standard string representation of a chess piece for generating FEN
-        strings - lowercase for white, uppercase for black
-        '''
-        return "N" if self.color == WHITE else "n"
- 
-    def move(self, game_object: Chess) -> NoReturn:
-        '''
-        Adds all empty squares the knight could possibly move to to game_object.legal_moves
-        and all pieces the piece could possibly take to game_object.legal_takes
- 
-        Parameters:
-            game_object:    instance of Chess
-        '''
-        game_object.check_moves_on_square(self, 1, 2)
-        game_object.check_moves_on_square(self, 1, -2)
-        game_object.check_moves_on_square(self, -1, 2)
-        game_object.check_moves_on_square(self, -1, -2)
-        game_object.check_moves_on_square(self, 2, 1)
-        game_object.check_moves_on_square(self, 2, -1)
-        game_object.check_moves_on_square(self, -2, 1)
-        game_object.check_moves_on_square(self, -2, -1)
- 
-class Bishop(Piece):
-    '''
-    Bishop class - child class of Piece, represents a bishop on the chessboard
- 
-    Attributes:
-        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
-        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
-        value:          represents the "value in pawns" of the piece (int, corresponds to BISHOP_VALUE constant)
-    '''
-    def __init__(self, color: int, x: int, y: int):
-        '''
-        Initializes Bishop; uses Piece constructor
-        '''
-        Piece.__init__(self, color, x, y)
-        self.value = BISHOP_VALUE
- 
-    def __str__(self) -> str:
-        '''
-        Standard string representation of a chess piece for generating FEN
-        strings - lowercase for white, uppercase for black
-        '''
-        return "B" if self.color == WHITE else "b"
- 
-    def move(self, game_object: Chess) -> NoReturn:
-        '''
-        Adds all empty squares the bishop could possibly move to to game_object.legal_moves
-        and all pieces the piece could possibly take to game_object.legal_takes
- 
-        Parameters:
-            game_object:    instance of Chess
-        '''
-        for i in range(1, 8):
-            if game_object.check_moves_on_square(self, i, i): break
- 
-        for i in range(1, 8):
-            if game_object.check_moves_on_square(self, -i, i): break
- 
-        for i in range(1, 8):
-            if game_object.check_moves_on_square(self, i, -i): break
- 
-        for i in range(1, 8):
-            if game_object.check_moves_on_square(self, -i, -i): break
- 
-class Pawn(Piece):
-    '''
-    Pawn class - child class of Piece, represents a pawn on the chessboard
- 
-    Attributes:
-        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
-        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
-        value:          represents the "value in pawns" of the piece (int, corresponds to PAWN_VALUE constant)
-    '''
-    def __init__(self, color: int, x: int, y: int):
-        '''
-        Initializes Pawn; uses Piece constructor
-        '''
-        Piece.__init__(self, color, x, y)
-        self.value = PAWN_VALUE
- 
-    def __str__(self) -> str:
-        '''
-        Standard string representation of a chess piece for generating FEN
-        strings - lowercase for white, uppercase for black
-        '''
-        return "P" if self.color == WHITE else "p"
- 
-    def move(self, game_object: Chess) -> NoReturn:
-        '''
-        Adds all empty squares the pawn could possibly move to to game_object.legal_moves
-        and all pieces the piece could possibly take to game_object.legal_takes
- 
-        Parameters:
-            game_object:    instance of Chess
-        '''
-        # check if there is a piece blocking the pawn moving
-        piece_in_front_pawn = game_object.check_moves_on_square(self, 0, 1 * self.color, False)
-       
-        # allow pawn to move forward 2 squares (can only move, not capture) if it hasn't moved
-        if not self.moved and not piece_in_front_pawn:
-            game_object.check_moves_on_square(self, 0, 2 * self.color, False)
-       
-        # allow pawn to capture (not move) to squares diagonally in front of it
-        game_object.check_moves_on_square(self, 1, 1 * self.color, True, False)
-        game_object.check_moves_on_square(self, -1, 1 * self.color, True, False)
- 
-class Queen(Piece):
-    '''
-    Queen class - child class of Piece, represents a queen on the chessboard
- 
-    Attributes:
-        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
-        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
-        value:          represents the "value in pawns" of the piece (int, corresponds to QUEEN_VALUE constant)
-    '''
-    def __init__(self, color: int, x: int, y: int):
-        '''
-        Initializes Queen; uses Piece constructor
-        '''
-        Piece.__init__(self, color, x, y)
-        self.value = QUEEN_VALUE
- 
-    def __str__(self) -> str:
-        '''
-        Standard string representation of a chess piece for generating FEN
-        strings - lowercase for white, uppercase for black
-        '''
-        return "Q" if self.color == WHITE else "q"
- 
-    def move(self, game_object: Chess) -> NoReturn:
-        '''
-        Adds all empty squares the queen could possibly move to to game_object.legal_moves
-        and all pieces the piece could possibly take to game_object.legal_takes
- 
-        Parameters:
-            game_object:    instance of Chess
-        '''
-        temp_rook = Rook(self.color, self.x, self.y)
-        temp_bishop = Bishop(self.color, self.x, self.y)
- 
-        temp_rook.move(game_object)
-        temp_bishop.move(game_object)
- 
-class King(Piece):
-    '''
-    King class - child class of Piece, represents a king on the chessboard
- 
-    Attributes:
-        color:          represents the color of the piece (int, 1 or -1 corresponding to WHITE / BLACK constants)
-        x, y:           coordinates on the chess board of the peice (int, 0 to 7)
-        value:          represents the "value in pawns" of the piece (int, set to 0 as the value of a king is ambiguous)
-    '''
-    def __init__(self, color: int, x: int, y: int):
-        '''
-        Initializes King; uses Piece constructor
-        '''
-        Piece.__init__(self, color, x, y)
-        self.value = 0
- 
-    def __str__(self) -> str:
-        '''
-        Standard string representation of a chess piece for generating FEN
-        strings - lowercase for white, uppercase for black
-        '''
-        return "K" if self.color == WHITE else "k"
- 
-    def move(self, game_object: Chess) -> NoReturn:
-        '''
-        Adds all empty squares the king could possibly move to to game_object.legal_moves
-        and all pieces the piece could possibly take to game_object.legal_takes
- 
-        Parameters:
-            game_object:    instance of Chess
-        '''
-        game_object.check_moves_on_square(self, 1, 1)
-        game_object.check_moves_on_square(self, 1, 0)
-        game_object.check_moves_on_square(self, 1, -1)
-        game_object.check_moves_on_square(self, 0, -1)
-        game_object.check_moves_on_square(self, -1, -1)
-        game_object.check_moves_on_square(self, -1, 0)
-        game_object.check_moves_on_square(self, -1, 1)
-        game_object.check_moves_on_square(self, 0, 1)
- 
-class Move:
-    '''
-    Move class - represents a chess move & stores enough information to undo the move (used by Chess.undo_move())
-   
-    Attributes:
-        prev_x, prev_y:     coordinates of piece that moved before moving (int, 0 to 7)
-        new_x, new_y:       coordinates of piece that moved after moving (int, 0 to 7)
-        moved_piece:        reference to piece that moved (Piece)
-        taken_piece:        reference to piece that was taken (Piece / None if no piece taken)
-        moved_piece_moved:  stores moved_piece.moved before the move / take (Boolean)
-        taken_piece_moved:  stores taken_piece.moved before the move / take (Boolean / None if no piece taken)
-        promotion:          whether this move promoted a pawn (Boolean, defaults to False)
-        en_passants:        list of pawns that could take via en passant (List[Pawn], defaults to [])
-        en_passant_pawn:    reference to pawn that may be taken via en passant (Pawn, defaults to None)
-    '''
- 
-    def __init__(self, prev_x: int, prev_y: int, new_x: int, new_y: int, moved_piece: Piece, taken_piece: Piece, moved_piece_moved: bool,
-                    taken_piece_moved: bool, taken_piece_sprite_img: str, promotion: bool = False, en_passants: list[Pawn] = [], en_passant_pawn: Pawn = None):
-        '''
-        Initializes Move
-        '''
-        self.prev_x = prev_x
-        self.prev_y = prev_y
-        self.new_x = new_x
-        self.new_y = new_y
-        self.moved_piece = moved_piece
-        self.taken_piece = taken_piece
-        self.moved_piece_moved = moved_piece_moved
-        self.taken_piece_moved = taken_piece_moved
-        self.taken_piece_sprite_img = taken_piece_sprite_img
-        self.promotion = promotion
-        self.en_passants = list(en_passants)
-        self.en_passant_pawn = en_passant_pawn
-
-    def return_data(self) -> tuple(int, int, int, int, Piece, Piece, bool, bool, str, bool, list[Piece], Piece):
-        '''
-        Returns tuple consisting of all class variables for easy unpacking
-        '''
-        return (self.prev_x, self.prev_y, self.new_x, self.new_y, self.moved_piece, self.taken_piece, self.moved_piece_moved,
-                    self.taken_piece_moved, self.taken_piece_sprite_img, self.promotion, self.en_passants, self.en_passant_pawn)
-
-def main():
-    # run the game; run arcade to render everything
-    Chess()
-    arcade.run()
-
-if __name__ == "__main__":
-    main()
+from __future__ import annotations
+from typing import NoReturn
+import argparse
+import math
+import os
+import queue
+import threading
+import time
+import arcade
+import pyglet
+from Engine import Engine
+from Search import Searcher, DEFAULT_MOVETIME, DEFAULT_HASH_MB, MAX_DEPTH
+from Board import Board, Piece, Pawn, Queen, King, WHITE, BLACK, PLAY, CHECKMATE, STALEMATE
+
+# Screen size settings
+SCREEN_WIDTH = 1000
+SCREEN_HEIGHT = 1000
+PIXELS_PER_SQUARE = 100
+
+# number of legal move / take indicators to keep ready; a queen can move to at most 27 squares and take on at most 8
+# (a pawn's en passant take is shown with a take indicator too)
+MOVE_INDICATORS = 27
+TAKE_INDICATORS = 9
+
+# seconds between updates while a hint is being searched, and while waiting for the player
+ACTIVE_UPDATE_RATE = 1 / 60
+IDLE_UPDATE_RATE = 1 / 5
+
+# directory holding the images, and every image loaded at startup (file names without .png)
+SPRITE_DIRECTORY = "chessSprites"
+IMAGE_NAMES = ("wP", "wN", "wB", "wR", "wQ", "wK", "bP", "bN", "bB", "bR", "bQ", "bK", "undo", "hint", "brown_circle", "red_circle")
+
+# shaders drawing the cached frame over the whole window, one texel per pixel
+FRAME_VERTEX_SHADER = """
+#version 330
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+FRAME_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D frame;
+in vec2 uv;
+out vec4 color;
+void main() {
+    color = texture(frame, uv);
+}
+"""
+
+# path to stockfish executable
+PATH = "stockfish_20011801_x64.exe"
+
+# engines hints can come from: stockfish, the built in Searcher, or stockfish falling back to the built in engine when
+# it cannot be run (no stockfish module, or no binary for this system)
+ENGINES = ("auto", "stockfish", "builtin")
+
+class Chess(arcade.Window):
+    '''
+    Chess class - visual representation of chess game; all rules of the game are handled by the Board it renders
+ 
+    Attributes:
+        board:                              the position being played and rendered (Board)
+        king_in_check:                      whether king is in check (Boolean)
+        selected_piece:                     the piece last clicked on; displays legal moves for this piece (Piece or None)
+        game_state:                         whether game should proceed or is stopped e.g. checkmate / draw (int, corresponds to PLAY, STALEMATE, etc.)
+        legal_moves:                        list of legal squares that selected piece can legally move to stored as coordinate tuples (List[(x: int, y: int)])
+        legal_takes:                        list of legal squares that selected piece can legally take on stored as coordinate tuples (List[(x: int, y: int)])
+        turn_moves:                         every legal move of the side to move, found once per turn; for each square a piece can move from, the move
+                                            (as used by Board.make_move) made by clicking each square (Dict[(x, y), Dict[(x, y), tuple]])
+        turn_indicators:                    legal_moves / legal_takes to display for the piece on each square, found once per turn (Dict[(x, y), (List, List)])
+        board_shapes:                       the background and the 64 squares of the board, built once and drawn in one call (arcade.ShapeElementList)
+        rank_file_labels:                   the letters / numbers of the files and ranks, laid out once (List[pyglet.text.Label])
+        label_batch:                        holds rank_file_labels so all 16 are drawn in one call (pyglet.graphics.Batch)
+        white_value_text, black_value_text: material advantage shown beside each player, only laid out again when it changes (arcade.Text)
+        turn_text:                          whose turn it is / the result, only laid out again when it changes (arcade.Text)
+        dirty:                              whether anything shown has changed since the last frame was drawn (Boolean)
+        frame_buffer:                       offscreen copy of the last frame drawn, shown again while nothing has changed (arcade.gl.Framebuffer)
+        frame_quad, frame_program:          a quad covering the window and the shaders drawing frame_buffer onto it (arcade.gl.Geometry, arcade.gl.Program)
+        measure_frames:                     whether to time on_draw (until the GPU has drawn the frame) and print the frame times when the window closes (Boolean)
+        frame_count, frame_seconds:         number of frames drawn and total seconds spent drawing them while measuring (int, float)
+        slowest_frame:                      seconds spent drawing the slowest frame while measuring (float)
+        textures:                           every image, loaded once at startup and shared by all sprites showing it, keyed by name e.g. "bP" (Dict[str, arcade.Texture])
+        scene:                              the scene where sprites are rendered (Arcade.Scene)
+        piece_list:                         the sprites of every piece on the board in one list, drawn in a single batch as the first layer of the scene
+                                            (arcade.SpriteList)
+        piece_sprites:                      sprite and image name currently rendering each piece on the board (Dict[Piece, (arcade.Sprite, str)])
+        move_indicators, take_indicators:   sprites created once for showing legal moves / takes, moved onto the squares of the selected piece's
+                                            moves / takes and hidden otherwise (List[arcade.Sprite])
+        hint_movetime:                      seconds the engine searches each position for (float or None to search to hint_depth)
+        hint_depth:                         deepest the engine searches each position (int or None for the engine's default)
+        hint_threads, hint_hash_mb:         threads / processes and transposition table megabytes the engine searches with (int)
+        ponder:                             whether to search every position while the player is thinking, so the hint is ready when asked for (Boolean)
+        search_stats:                       whether to print the depth, nodes and transposition table use of every built in engine search (Boolean)
+        engine:                             the engine hints come from, kept running until the window closes (Engine or Searcher)
+        engine_fallback:                    whether to switch to the built in engine if stockfish cannot be run (Boolean)
+        hint_key:                           zobrist key of the position a hint has been asked for and not played yet (int, None if none)
+        search_key:                         zobrist key of the position being searched in the background, for a hint or pondering (int, None if not searching)
+        search_cancel:                      set to stop the background search, even if its thread has not started it yet (threading.Event, None if not searching)
+        pondered:                           zobrist key and best move of the last search that was not played as a hint ((int, str) or None)
+        hint_results:                       (zobrist key, best move) pairs finished by background searches, waiting for the main thread (queue.Queue)
+    '''
+ 
+    def __init__(self, board: Board = None, measure_frames: bool = False, startup_times: bool = False, engine: str = "auto",
+                 movetime: float = DEFAULT_MOVETIME, depth: int = None, threads: int = 1, hash_mb: int = DEFAULT_HASH_MB, ponder: bool = False,
+                 search_stats: bool = False):
+        '''
+        Initializes Chess; initializes everything needed from Arcade
+
+        Parameters:
+            board:          the position to start from e.g. a puzzle, with bitboards (Board, defaults to None for the starting position)
+            measure_frames: whether to time on_draw and print the frame times when the window closes (Boolean, defaults to False)
+            startup_times:  whether to print how long each part of starting up took (Boolean, defaults to False)
+            engine:         which of ENGINES hints come from (String, defaults to "auto")
+            movetime:       seconds the engine searches each position for (float, defaults to DEFAULT_MOVETIME; None to search to depth)
+            depth:          deepest the engine searches each position (int, defaults to None for the engine's default; stockfish only
+                            uses it without a movetime)
+            threads:        threads stockfish / processes the built in engine searches with (int, defaults to 1)
+            hash_mb:        size of the engine's transposition table in megabytes (int, defaults to DEFAULT_HASH_MB)
+            ponder:         whether to search every position while the player is thinking (Boolean, defaults to False)
+            search_stats:   whether to print the statistics of every built in engine search (Boolean, defaults to False)
+        '''
+        stages = [("start", time.perf_counter())]
+        if board is None: board = Board(bitboards=True)
+        stages.append(("rules", time.perf_counter()))
+        super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, title="Nick Baker's Chess")
+        stages.append(("window", time.perf_counter()))
+ 
+        self.board = board
+        self.king_in_check = False
+        self.selected_piece = None
+        self.game_state = PLAY
+        self.legal_moves, self.legal_takes = [], []
+        self.turn_moves, self.turn_indicators = {}, {}
+        self.hint_movetime, self.hint_depth, self.hint_threads, self.hint_hash_mb = movetime, depth, threads, hash_mb
+        self.ponder, self.search_stats = ponder, search_stats
+        self.engine = self.create_engine(engine)
+        self.engine_fallback = engine == "auto"
+        self.hint_key, self.search_key, self.search_cancel, self.pondered = None, None, None, None
+        self.hint_results = queue.Queue()
+        self.set_update_rate(IDLE_UPDATE_RATE)
+        self.dirty = True
+        self.frame_buffer = self.ctx.framebuffer(color_attachments=[self.ctx.texture(self.get_framebuffer_size(), components=4,
+                                                                                     filter=(self.ctx.NEAREST, self.ctx.NEAREST))])
+        # the window is multisampled and a framebuffer can't be copied onto a multisampled one, so the frame is drawn as a texture
+        self.frame_quad = arcade.gl.geometry.quad_2d_fs()
+        self.frame_program = self.ctx.program(vertex_shader=FRAME_VERTEX_SHADER, fragment_shader=FRAME_FRAGMENT_SHADER)
+        self.measure_frames = measure_frames
+        self.frame_count, self.frame_seconds, self.slowest_frame = 0, 0, 0
+
+        # text is laid out when created / changed, so keep the objects and only change their text
+        self.white_value_text = arcade.Text("", 8 * PIXELS_PER_SQUARE, 0.6 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width=PIXELS_PER_SQUARE, align="left")
+        self.black_value_text = arcade.Text("", 8 * PIXELS_PER_SQUARE, 9.1 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width=PIXELS_PER_SQUARE, align="left")
+        self.turn_text = arcade.Text("", 0, 9.1 * PIXELS_PER_SQUARE, arcade.color.WHITE, 24, width=SCREEN_WIDTH, align="center")
+ 
+        self.textures = self.load_textures()
+        stages.append(("textures", time.perf_counter()))
+
+        self.scene = arcade.Scene()
+        # the scene makes the list: an empty SpriteList is falsy, so add_sprite_list would replace one passed in with a new list
+        self.scene.add_sprite_list("pieces", use_spatial_hash=True)
+        self.piece_list = self.scene.get_sprite_list("pieces")
+        self.piece_sprites = {}
+        self.create_board_layer()
+        self.sync_sprites()
+
+        # the undo & hint buttons never move; the indicators are created once here (after the pieces so they are drawn over them)
+        self.add_sprite((8, 0), "undo")
+        self.add_sprite((8, 1), "hint", PIXELS_PER_SQUARE / 200)
+        self.move_indicators = [self.add_sprite((-1, -1), "brown_circle") for i in range(MOVE_INDICATORS)]
+        self.take_indicators = [self.add_sprite((-1, -1), "red_circle", PIXELS_PER_SQUARE / 2222) for i in range(TAKE_INDICATORS)]
+        self.end_turn()
+        stages.append(("sprites", time.perf_counter()))
+ 
+        # draw first frame
+        self.on_draw()
+        stages.append(("first frame", time.perf_counter()))
+
+        if startup_times:
+            breakdown = ", ".join(f"{name} {1000 * (end - stages[i][1]):.0f} ms" for i, (name, end) in enumerate(stages[1:]))
+            print(f"started in {1000 * (stages[-1][1] - stages[0][1]):.0f} ms: {breakdown}")
+
+    def load_textures(self) -> dict[str, arcade.Texture]:
+        '''
+        Loads every image in IMAGE_NAMES once, so no image is decoded while playing and every sprite of the same image
+        shares one texture. Clicks are mapped to squares rather than sprites, so no hit boxes are computed (tracing
+        the outline of every image is most of the startup time otherwise)
+
+        Returns:
+            the textures keyed by image name e.g. "bP" for black pawn
+        '''
+        return {name: arcade.load_texture(f"{SPRITE_DIRECTORY}/{name}.png", hit_box_algorithm="None") for name in IMAGE_NAMES}
+ 
+    def on_draw(self) -> NoReturn:
+        '''
+        Draw everything on the chessboard and display legal moves / takes (called every frame by Arcade). Everything is
+        only drawn again if something changed (self.dirty), otherwise the last frame drawn is shown again
+        '''
+        start = time.perf_counter()
+        if self.dirty:
+            with self.frame_buffer.activate():
+                self.frame_buffer.clear()
+                # draw chessboard, value analysis, and whose turn it is
+                self.init_board()
+                self.display_value()
+                self.display_turn()
+ 
+                # draw the pieces, buttons and legal moves / takes for the selected piece
+                self.scene.draw()
+            self.dirty = False
+
+        # without blending, so the frame replaces what is on the screen
+        self.frame_buffer.color_attachments[0].use(0)
+        with self.ctx.enabled_only():
+            self.frame_quad.render(self.frame_program)
+
+        if self.measure_frames:
+            # draw calls only queue work for the GPU, so wait for it to finish or only the queueing is timed
+            self.ctx.finish()
+            frame_time = time.perf_counter() - start
+            self.frame_count, self.frame_seconds = self.frame_count + 1, self.frame_seconds + frame_time
+            self.slowest_frame = max(self.slowest_frame, frame_time)
+ 
+    def display_value(self) -> NoReturn:
+        '''
+        Displays the material advantage (in pawns) for each player e.g. if white is up 2 pawns,
+        "+2" will be displayed beside white and "-2" will be displayed beside black
+        '''
+        value = self.board.material
+
+        # draw the text beside each player (nothing if material is even)
+        white_value, black_value = "", ""
+        if value < 0:
+            white_value, black_value = f"White: {value}", f"Black: +{-value}"
+        elif value > 0:
+            white_value, black_value = f"White: +{value}", f"Black: -{value}"
+
+        self.draw_cached_text(self.white_value_text, white_value)
+        self.draw_cached_text(self.black_value_text, black_value)
+   
+    def display_turn(self) -> NoReturn:
+        '''
+        Displays whose turn it is at the top of the board, or checkmate / stalemate message
+        '''
+        turn_text = ""
+        if self.game_state == PLAY:
+            turn = "White" if self.board.color_to_move == WHITE else "Black"
+            thinking = " (thinking...)" if self.hint_key is not None else ""
+            turn_text = f"{turn} to move{thinking}"
+ 
+        elif self.game_state == CHECKMATE:
+            turn = "White" if self.board.color_to_move == BLACK else "Black"
+            turn_text = f"{turn} wins by Checkmate"
+ 
+        elif self.game_state == STALEMATE:
+            turn_text = "Draw by Stalemate"
+
+        self.draw_cached_text(self.turn_text, turn_text)
+
+    def draw_cached_text(self, text: arcade.Text, string: str) -> NoReturn:
+        '''
+        Draws a text object showing the given string; the text is only laid out again if the string changed
+
+        Parameters:
+            text:   the text object to draw (arcade.Text)
+            string: what it should show (String, nothing is drawn if empty)
+        '''
+        if text.text != string: text.text = string
+        if string != "": text.draw()
+ 
+    def add_sprite(self, coords: tuple(int, int), image_name: str, sizing: float = 0.1) -> arcade.Sprite:
+        '''
+        Adds sprite to the scene and returns a reference to it
+ 
+        Paramters:
+            coords:        tuple representing x,y coordinates for where the piece is located (0 to 7)
+            image_name:    the name of the sprite image in self.textures e.g. bP for black pawn
+            sizing:        the scale at which to render the image (defaults to 0.1 for 100 x 100 pixel squares)
+ 
+        Returns:
+            the created sprite
+        '''
+        sprite = arcade.Sprite(texture=self.textures[image_name], scale=sizing)
+        sprite.center_x = (coords[0] + 1.5)* PIXELS_PER_SQUARE
+        sprite.center_y = (coords[1] + 1.5) * PIXELS_PER_SQUARE
+        self.scene.add_sprite(image_name, sprite)
+        return sprite
+ 
+    def on_mouse_press(self, x: int, y: int, button: int, modifiers: int) -> NoReturn:
+        '''
+        Lets user select pieces, move, etc. with mouse clicks (called by Arcade every time mouse is clicked)
+ 
+        Parameters:
+            x, y:                   the pixel coordinates of mouse click where 0 is bottom left of the window (0 to SCREEN_WIDTH/SCREEN_HEIGHT respectively)
+            button (not used):      right or left mouse button or other (1 corresponds to right; 4 corresponds to left)
+            modifiers (not used):   0 normally, 2 if shift pressed, 4 if ctrl pressed, etc.
+        '''
+        # a click selects / deselects, moves or starts a hint, so draw the next frame again
+        self.dirty = True
+ 
+        # check if undo button pressed
+        if x > 9 * PIXELS_PER_SQUARE and x < 10 * PIXELS_PER_SQUARE and y < 2 * PIXELS_PER_SQUARE and y > 1 * PIXELS_PER_SQUARE:
+            # undo last move, check conditional variables
+            self.board.undo_move()
+            self.end_turn()
+            return
+       
+        # stop play if game is over
+        if self.game_state != PLAY: return
+
+        # check if help button pressed
+        if x > 9 * PIXELS_PER_SQUARE and x < 10 * PIXELS_PER_SQUARE and y < 3 * PIXELS_PER_SQUARE and y > 2 * PIXELS_PER_SQUARE:
+            # let the engine play the best move
+            self.play_best_move()
+            return
+ 
+        # convert x and y in pixels to integer representing square clicked (both 0 to 7)
+        x_coord = x // PIXELS_PER_SQUARE - 1
+        y_coord = y // PIXELS_PER_SQUARE - 1
+ 
+        # set cur_piece to be the piece clicked and find the move (if any) clicking this square makes with the selected piece
+        cur_piece = self.board.get_piece_at(x_coord, y_coord)
+        move = None
+        if self.selected_piece is not None:
+            move = self.turn_moves.get((self.selected_piece.x, self.selected_piece.y), {}).get((x_coord, y_coord))
+
+        # check if a legal move / take / castle / en passant has been selected
+        if move is not None:
+            self.board.make_move(*move)
+            self.end_turn()
+ 
+        # check if a new piece that can move has been selected
+        elif cur_piece is not None and cur_piece.color == self.board.color_to_move:
+            # select piece and show legal moves for it
+            self.selected_piece = cur_piece
+            self.legal_moves, self.legal_takes = self.turn_indicators.get((x_coord, y_coord), ([], []))
+            self.show_indicators()
+ 
+        # deselect piece, toggle off legal moves
+        else:
+            self.selected_piece = None
+            self.legal_moves = []
+            self.legal_takes = []
+            self.show_indicators()
+
+    def end_turn(self) -> NoReturn:
+        '''
+        Updates everything displayed after the board has changed (move, take, castle, undo or engine move) - deselects
+        the selected piece, moves the sprites and records whether the king is in check / the game is over
+        '''
+        # the position changed, so a hint still being searched is no longer wanted; stop the search so the engine is
+        # free for the new position straight away
+        if self.hint_key is not None: self.set_update_rate(IDLE_UPDATE_RATE)
+        self.hint_key = None
+        if self.search_key is not None and self.search_key != self.board.zobrist_key:
+            self.search_cancel.set()
+            self.engine.stop()
+        self.dirty = True
+
+        # deselect the piece; reset legal moves & takes
+        self.selected_piece = None
+        self.legal_moves = []
+        self.legal_takes = []
+        self.sync_sprites()
+        self.show_indicators()
+ 
+        # record whether king in check
+        self.king_in_check = self.board.in_check()
+ 
+        # find every legal move once for the turn, and check for checkmate / stalemate
+        moves, self.game_state = self.board.cached_legal_moves()
+        self.find_turn_moves(moves)
+
+        # think about the new position while the player does
+        if self.ponder: self.start_search()
+
+    def find_turn_moves(self, moves: tuple) -> NoReturn:
+        '''
+        Helper function for end_turn. Sorts the legal moves of the side to move by the square they move from into
+        self.turn_moves and self.turn_indicators, so clicks only need to look them up
+
+        Parameters:
+            moves:  every legal move of the side to move (tuple, from Board.cached_legal_moves())
+        '''
+        self.turn_moves, self.turn_indicators = {}, {}
+        for move in moves:
+            (x1, y1, x2, y2) = move[:4]
+
+            # pawns reaching the last rank are always made queens when moved by clicking
+            if len(move) > 4 and move[4] is not Queen: continue
+
+            piece = self.board.get_piece_at(x1, y1)
+            targets = self.turn_moves.setdefault((x1, y1), {})
+            legal_moves, legal_takes = self.turn_indicators.setdefault((x1, y1), ([], []))
+
+            # castling is done by clicking the rook after selecting the king
+            if isinstance(piece, King) and abs(x2 - x1) == 2:
+                targets[(7 if x2 > x1 else 0, y1)] = move
+                continue
+            targets[(x2, y2)] = move
+
+            # en passant takes are shown separately (see on_draw)
+            if self.board.get_piece_at(x2, y2) is not None:
+                legal_takes.append((x2, y2))
+            elif not (isinstance(piece, Pawn) and x1 != x2):
+                legal_moves.append((x2, y2))
+
+    def sync_sprites(self) -> NoReturn:
+        '''
+        Makes the sprites match the board - removes sprites of taken pieces, adds sprites for pieces returned by an undo,
+        swaps the texture of promoted / unpromoted pawns and moves every sprite to its piece's square
+        '''
+        # remove sprites of pieces no longer on the board
+        on_board = set(self.board.pieces)
+        for piece in list(self.piece_sprites):
+            if piece not in on_board:
+                sprite, sprite_image = self.piece_sprites.pop(piece)
+                sprite.remove_from_sprite_lists()
+
+        for piece in self.board.pieces:
+            sprite_image = self.sprite_image_for(piece)
+            sprite, cur_image = self.piece_sprites.get(piece, (None, None))
+
+            # create the sprite if the piece is new, change its texture if its type changed
+            if sprite is None:
+                sprite = arcade.Sprite(texture=self.textures[sprite_image], scale=PIXELS_PER_SQUARE / 1000)
+                self.piece_list.append(sprite)
+            elif cur_image != sprite_image:
+                sprite.texture = self.textures[sprite_image]
+            self.piece_sprites[piece] = (sprite, sprite_image)
+
+            sprite.center_x = (piece.x + 1.5) * PIXELS_PER_SQUARE
+            sprite.center_y = (piece.y + 1.5) * PIXELS_PER_SQUARE
+
+    def show_indicators(self) -> NoReturn:
+        '''
+        Moves the indicator sprites onto the squares in self.legal_moves / self.legal_takes (and the en passant take of the
+        selected piece, if any) and hides the ones not needed; called whenever those change
+        '''
+        takes = self.legal_takes
+        if self.selected_piece is not None and self.selected_piece in self.board.en_passants:
+            takes = takes + [(self.board.en_passant_pawn.x, self.board.en_passant_pawn.y + self.selected_piece.color)]
+
+        for (indicators, squares) in ((self.move_indicators, self.legal_moves), (self.take_indicators, takes)):
+            for i, sprite in enumerate(indicators):
+                sprite.visible = i < len(squares)
+                if sprite.visible:
+                    sprite.center_x = (squares[i][0] + 1.5) * PIXELS_PER_SQUARE
+                    sprite.center_y = (squares[i][1] + 1.5) * PIXELS_PER_SQUARE
+
+    def sprite_image_for(self, piece: Piece) -> str:
+        '''
+        Returns the name of the image for the given piece in self.textures e.g. bP for black pawn
+        '''
+        color = "w" if piece.color == WHITE else "b"
+        return f"{color}{str(piece).upper()}"
+ 
+    def create_engine(self, engine: str) -> Engine or Searcher:
+        '''
+        Creates the engine hints come from with the hint settings (the process is only started by the first search)
+
+        Parameters:
+            engine:     which of ENGINES to create; "auto" creates stockfish (String)
+        '''
+        if engine == "builtin":
+            return Searcher(self.hint_movetime, self.hint_depth or MAX_DEPTH, hash_mb=self.hint_hash_mb, workers=self.hint_threads)
+        return Engine(PATH, {"Threads": self.hint_threads, "Hash": self.hint_hash_mb}, self.hint_depth, self.hint_movetime)
+
+    def play_best_move(self) -> NoReturn:
+        '''
+        Plays the best engine move: straight away if pondering already found it, otherwise once the engine answers
+        (see on_update), unless the position has changed by then
+        '''
+        # only one hint at a time
+        if self.hint_key is not None: return
+        self.hint_key = self.board.zobrist_key
+        if self.pondered is not None and self.pondered[0] == self.hint_key and self.pondered[1] is not None:
+            self.play_hint(*self.pondered)
+            return
+
+        # check for the answer every frame until it comes; a search of this position may already be running
+        self.set_update_rate(ACTIVE_UPDATE_RATE)
+        self.start_search()
+
+    def start_search(self) -> NoReturn:
+        '''
+        Starts searching the current position in the background, unless a search is already running (on_update starts
+        the next one once it has finished) or the game is over
+        '''
+        if self.search_key is not None or self.game_state != PLAY: return
+        # each search gets its own cancel event, made here before the thread starts so a stop cannot come before it
+        self.search_key, self.search_cancel = self.board.zobrist_key, threading.Event()
+        fen, moves = self.board.repetition_history()
+        threading.Thread(target=self.search_hint, args=(self.search_key, fen, moves, self.search_cancel), daemon=True).start()
+
+    def search_hint(self, key: int, fen: str, moves: list[str], cancel: threading.Event) -> NoReturn:
+        '''
+        Helper function for start_search, runs on a worker thread. Asks the engine for the best move and queues the
+        result for the main thread; the board must not be touched here
+
+        Parameters:
+            key:    zobrist key of the position to search (int)
+            fen:    the position after the last pawn move or take (String)
+            moves:  moves played since in stockfish notation, reaching the position to search (List[String])
+            cancel: set by end_turn once the position has changed (threading.Event)
+        '''
+        best_move = None
+        try:
+            try:
+                best_move = self.engine.get_best_move(fen, moves, cancel)
+            except (ImportError, OSError):
+                # stockfish is not installed or the binary does not run here (e.g. the bundled Windows build on Linux)
+                if not self.engine_fallback: raise
+                self.engine, self.engine_fallback = self.create_engine("builtin"), False
+                best_move = self.engine.get_best_move(fen, moves, cancel)
+            if self.search_stats and isinstance(self.engine, Searcher): print(f"{fen}{' moves ' + ' '.join(moves) if moves else ''}: {best_move}  {self.engine.statistics()}")
+        finally:
+            # always answer, so the window stops waiting for the search even if the engine failed
+            self.hint_results.put((key, best_move))
+
+    def on_update(self, delta_time: float) -> NoReturn:
+        '''
+        Plays finished hint searches and keeps pondered ones, then starts the next search if a hint or pondering is
+        still waiting for one (called by Arcade every ACTIVE_UPDATE_RATE seconds while a hint is being searched,
+        IDLE_UPDATE_RATE seconds otherwise)
+
+        Parameters:
+            delta_time (not used):  seconds since the last update
+        '''
+        while not self.hint_results.empty():
+            key, best_move = self.hint_results.get()
+            self.search_key, self.search_cancel = None, None
+            if key == self.hint_key: self.play_hint(key, best_move)
+            else: self.pondered = (key, best_move)
+
+        # searches of positions left by a move / undo are not played, so search the current one once the engine is free
+        pondered = self.pondered is not None and self.pondered[0] == self.board.zobrist_key
+        if self.hint_key is not None or (self.ponder and not pondered): self.start_search()
+
+    def play_hint(self, key: int, best_move: str) -> NoReturn:
+        '''
+        Helper function for on_update / play_best_move, plays the engine's best move for the hint asked for if it is
+        still legal in the current position
+
+        Parameters:
+            key:        zobrist key of the position searched (int)
+            best_move:  the best move found in stockfish notation (String, None if the engine failed)
+        '''
+        self.hint_key = None
+        self.dirty = True
+        self.set_update_rate(IDLE_UPDATE_RATE)
+        if best_move is None or self.game_state != PLAY or key != self.board.zobrist_key: return
+        if self.board.uci_to_move(best_move) not in self.board.cached_legal_moves()[0]: return
+
+        # parse the move and do it
+        move_from, move_to = self.convert_stockfish_output_to_coords(best_move)
+        promotion = self.board.uci_to_move(best_move)[4] if len(best_move) > 4 else None
+        self.stockfish_move(move_from, move_to, promotion)
+
+    def on_close(self) -> NoReturn:
+        '''
+        Shuts down the engine before the window closes (called by Arcade when the window is closed)
+        '''
+        self.engine.close()
+        if self.measure_frames and self.frame_count != 0:
+            print(f"{self.frame_count} frames drawn, {1000 * self.frame_seconds / self.frame_count:.2f} ms on average, slowest {1000 * self.slowest_frame:.2f} ms")
+        super().on_close()
+
+    def convert_stockfish_output_to_coords(self, move: str) -> tuple(tuple(int, int), tuple(int, int)):
+        '''
+        Helper function for play_best_move, converts 2 strings
+        of 'chess coordinates' to x, y coordinates relevant to the chess board
+
+        e.g. convert_stockfish_output_to_coords("e5d3") -> (4, 5), (3, 3)
+
+        Parameters:
+            move:   string containing both the 'chess coordinates' of the piece to move
+                    and where to move it to
+        Returns:
+            Two coordinate tuples in the form (x,y) corresponding to the input coordinates
+        '''
+        # separate the input
+        prev_pos_rank, prev_pos_y = move[0], int(move[1])
+        after_pos_rank, after_pos_y = move[2], int(move[3])
+        
+        # convert rank name ('a', 'b', 'c', ...) to cooresponding int (0, 1, 2, ...)
+        rank_to_coord = lambda rank : ord(rank) - 97
+        
+        prev_coords = (rank_to_coord(prev_pos_rank), prev_pos_y - 1)
+        after_coords = (rank_to_coord(after_pos_rank), after_pos_y - 1)
+        return prev_coords, after_coords
+
+    def stockfish_move(self, move_from: tuple(int, int), move_to: tuple(int, int), promotion: type = None) -> NoReturn:
+        '''
+        Helper function for play_best_move, moves the piece from the first set of coordinates
+        to the second set, taking / castling if applicable
+
+        Parameters:
+            move_from:  tuple containing coordinates of the piece to move
+            move_to:    tuple containing coordinates of where to move the piece
+            promotion:  class of the piece a pawn reaching the last rank becomes (type, defaults to None for Queen)
+        '''
+        # parse coords
+        x1, y1 = move_from
+        x2, y2 = move_to
+
+        self.board.make_move(x1, y1, x2, y2, promotion)
+        self.end_turn()
+
+    def create_board_layer(self) -> NoReturn:
+        '''
+        Builds everything on the board that never changes once - the background and squares into one shape list, and the
+        rank / file letters and numbers into one batch of labels - so init_board draws each with a single call
+        '''
+        self.board_shapes = arcade.ShapeElementList()
+        self.board_shapes.append(arcade.create_rectangle_filled(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, SCREEN_WIDTH, SCREEN_HEIGHT, arcade.color.BISTRE))
+        for x in range(8):
+            for y in range(8):
+                color = arcade.color.CAMEL if (x + y) % 2 == 0 else arcade.color.CHAMPAGNE
+                self.board_shapes.append(arcade.create_rectangle_filled((x + 1.5) * PIXELS_PER_SQUARE, (y + 1.5) * PIXELS_PER_SQUARE,
+                                                                        PIXELS_PER_SQUARE, PIXELS_PER_SQUARE, color))
+
+        # A B C D ... in the bottom right of the bottom row of squares (the files) and 1 2 3 4 ... in the top left of the leftmost
+        # column of squares (the ranks)
+        # (pyglet labels rather than arcade.Text, which can't share a batch; same font and color as arcade.Text would use)
+        self.label_batch = pyglet.graphics.Batch()
+        self.rank_file_labels = []
+        for i in range(8):
+            for (text, x, y) in ((chr(65 + i), i + 1.75, 1.05), (str(i + 1), 1.05, i + 1.75)):
+                self.rank_file_labels.append(pyglet.text.Label(text, font_name=("calibri", "arial"), font_size=16, x=x * PIXELS_PER_SQUARE, y=y * PIXELS_PER_SQUARE,
+                                                               width=PIXELS_PER_SQUARE, color=(*arcade.color.BLACK, 255), batch=self.label_batch))
+
+    def init_board(self) -> NoReturn:
+        '''
+        Draws the squares of the board, highlights the square self.selected_piece is on, highlights the square king is on if in check,
+        draws the rank / file letters and numbers
+        '''
+        self.board_shapes.draw()
+ 
+        if self.selected_piece is not None:
+                temp_x = (self.selected_piece.x + 1) * PIXELS_PER_SQUARE
+                temp_y = (self.selected_piece.y + 1) * PIXELS_PER_SQUARE
+                arcade.draw_lrtb_rectangle_filled(temp_x, temp_x + PIXELS_PER_SQUARE, temp_y + PIXELS_PER_SQUARE, temp_y, arcade.color.LIGHT_SALMON)
+ 
+        if self.king_in_check:
+           
+            king = self.board.white_king if self.board.color_to_move == WHITE else self.board.black_king
+ 
+            temp_x = (king.x + 1) * PIXELS_PER_SQUARE
+            temp_y = (king.y + 1) * PIXELS_PER_SQUARE
+            arcade.draw_lrtb_rectangle_filled(temp_x, temp_x + PIXELS_PER_SQUARE, temp_y + PIXELS_PER_SQUARE, temp_y, arcade.color.CAMEO_PINK)
+ 
+        # draw the rank / file letters and numbers
+        with self.ctx.pyglet_rendering():
+            self.label_batch.draw()
+ 
+def whole_number_argument(minimum: int):
+    '''
+    Returns a function that parses an argument which must be a whole number of at least minimum, so argparse reports
+    anything else as a usage error (e.g. --depth 0, which stockfish would be sent but the built in engine read as no limit)
+    '''
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"must be a whole number, not {value!r}")
+        if number < minimum: raise argparse.ArgumentTypeError(f"must be at least {minimum}, not {number}")
+        return number
+    return parse
+
+def movetime_argument(value: str) -> float:
+    '''
+    Parses a --movetime argument, which must be a number of seconds of at least 0 (0 to search to --depth instead)
+    '''
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be a number of seconds, not {value!r}")
+    if not math.isfinite(seconds) or seconds < 0: raise argparse.ArgumentTypeError(f"must be at least 0 seconds, not {value}")
+    return seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Play chess against yourself, with hints from stockfish or the built in engine")
+    parser.add_argument("--fen", help="position to start from instead of the starting position")
+    parser.add_argument("--measure-frames", action="store_true", help="time every frame drawn and print the average when the window closes")
+    parser.add_argument("--startup-times", action="store_true", help="print how long each part of starting up took")
+    parser.add_argument("--engine", choices=ENGINES, default="auto", help="where hints come from (defaults to auto: stockfish, or the built in engine if stockfish cannot be run)")
+    parser.add_argument("--movetime", type=movetime_argument, default=DEFAULT_MOVETIME, help=f"seconds to search each hint for (0 to search to --depth, defaults to {DEFAULT_MOVETIME})")
+    parser.add_argument("--depth", type=whole_number_argument(1), help="deepest to search each hint (defaults to the engine's default; stockfish only uses it with --movetime 0)")
+    parser.add_argument("--threads", type=whole_number_argument(0), default=1, help="threads / processes to search with (0 for one per CPU, defaults to 1)")
+    parser.add_argument("--hash", type=whole_number_argument(1), default=DEFAULT_HASH_MB, help=f"transposition table size in megabytes (defaults to {DEFAULT_HASH_MB})")
+    parser.add_argument("--ponder", action="store_true", help="search every position while you think, so hints are ready straight away")
+    parser.add_argument("--search-stats", action="store_true", help="print the depth, nodes and transposition table use of every built in engine search")
+    args = parser.parse_args()
+    if args.movetime == 0 and args.depth is None: parser.error("--movetime 0 needs a --depth to search to")
+
+    # read the position before the window opens, so only an invalid FEN is reported as a usage error
+    try:
+        board = Board(bitboards=True, fen=args.fen)
+    except ValueError as error:
+        parser.error(str(error))
+
+    # run the game; run arcade to render everything
+    Chess(board, args.measure_frames, args.startup_times, args.engine, args.movetime or None, args.depth, args.threads or os.cpu_count(),
+          args.hash, args.ponder, args.search_stats)
+    arcade.run()
+
+if __name__ == "__main__":
+    main()
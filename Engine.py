@@ -0,0 +1,126 @@
+from __future__ import annotations
+from typing import NoReturn, TYPE_CHECKING
+import subprocess
+import threading
+if TYPE_CHECKING: from stockfish import Stockfish
+
+# seconds to wait for stockfish to exit after being told to quit before it is killed
+QUIT_TIMEOUT = 1
+
+class Engine:
+    '''
+    Engine class - a stockfish process that is started once and reused for every request, instead of starting
+    (and leaking) a new process for each one. The process is only started on the first request, is restarted if it
+    crashes and must be shut down with close when no longer needed
+
+    Attributes:
+        path:           file path to the stockfish executable (String)
+        parameters:     UCI options to start the engine with e.g. {"Threads": 2, "Hash": 64} (Dict[String, any] or None)
+        depth:          depth to search each position to when there is no movetime (int or None for stockfish's default)
+        movetime:       seconds to search each position for (float or None to search to depth instead)
+        stockfish:      the running engine (Stockfish or None if not started / shut down)
+        new_game:       whether the next position sent is the first one for the running process, so ucinewgame is sent with it (Boolean)
+        lock:           held while the engine is in use, so requests from different threads do not interleave (threading.Lock)
+        go_lock:        held while starting a search or sending stop, so a stop is never sent just before the go it was meant for (threading.Lock)
+    '''
+
+    def __init__(self, path: str, parameters: dict = None, depth: int = None, movetime: float = None):
+        '''
+        Parameters:
+            path:           file path to the stockfish executable (String)
+            parameters:     UCI options to start the engine with (Dict[String, any], defaults to None for stockfish's defaults)
+            depth:          depth to search each position to when there is no movetime (int, defaults to None for stockfish's default)
+            movetime:       seconds to search each position for (float, defaults to None to search to depth instead)
+        '''
+        self.path = path
+        self.parameters = parameters
+        self.depth, self.movetime = depth, movetime
+        self.stockfish = None
+        self.new_game = True
+        self.lock, self.go_lock = threading.Lock(), threading.Lock()
+
+    def start(self) -> Stockfish:
+        '''
+        Starts the engine process if it isn't running and returns it
+        '''
+        if self.stockfish is None:
+            # imported here so the stockfish module is only loaded once a hint is asked for
+            from stockfish import Stockfish
+            self.stockfish = Stockfish(self.path, parameters=self.parameters)
+            if self.depth is not None: self.stockfish.set_depth(self.depth)
+            self.new_game = True
+        return self.stockfish
+
+    def get_best_move(self, fen: str, moves: list[str] = None, cancel: threading.Event = None) -> str:
+        '''
+        Asks the engine for the best move in the given position. If the engine process has crashed it is restarted
+        and asked again once
+
+        Parameters:
+            fen:    the position to search, or the one the moves were played from (String)
+            moves:  moves in stockfish notation played from fen to reach the position to search, so the engine sees
+                    repetitions (List[String], defaults to None; see Board.repetition_history)
+            cancel: set to stop the search, even before it has started, e.g. from another thread once the position has
+                    changed; created by the caller before the search is started (threading.Event, defaults to None)
+
+        Returns:
+            the best move in stockfish notation e.g. "e2e4" or "e7e8q", None if there are no legal moves or the search
+            was cancelled before it started
+        '''
+        from stockfish import StockfishException
+        with self.lock:
+            try:
+                return self.search(fen, moves, cancel)
+            except (StockfishException, BrokenPipeError):
+                # drop the dead process and try again with a new one
+                self.stockfish = None
+                return self.search(fen, moves, cancel)
+
+    def search(self, fen: str, moves: list[str], cancel: threading.Event) -> str:
+        '''
+        Helper function for get_best_move, sends the position and searches it (lock must be held)
+        '''
+        stockfish = self.start()
+        stockfish.set_fen_position(fen, send_ucinewgame_token=self.new_game)
+        self.new_game = False
+        if moves: stockfish._put(f"position fen {fen} moves {' '.join(moves)}")
+
+        # go is sent here rather than by get_best_move / get_best_move_time, so that checking cancel and sending go
+        # happen under go_lock: a stop either finds cancel already seen or comes after the go
+        with self.go_lock:
+            if cancel is not None and cancel.is_set(): return None
+            if self.movetime is None: stockfish._go()
+            else: stockfish._go_time(max(round(self.movetime * 1000), 1))
+        return stockfish._get_best_move_from_sf_popen_process()
+
+    def stop(self) -> NoReturn:
+        '''
+        Tells the engine to stop the search running on another thread (if any), so it answers with the best move found
+        so far; called without the lock, which the search holds. stockfish ignores a stop sent before its search starts,
+        so to stop one that may not have started, set the cancel event it was given first
+        '''
+        with self.go_lock:
+            stockfish = self.stockfish
+            if stockfish is None: return
+            try:
+                stockfish._put("stop")
+            except (OSError, ValueError):
+                pass
+
+    def close(self) -> NoReturn:
+        '''
+        Stops the search and shuts down the engine process if it is running
+        '''
+        self.stop()
+        with self.lock:
+            stockfish, self.stockfish = self.stockfish, None
+            if stockfish is None: return
+
+            # the stockfish library has no public way to quit, so tell the process directly and kill it if it hangs
+            process = stockfish._stockfish
+            try:
+                stockfish._put("quit")
+                process.wait(QUIT_TIMEOUT)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                process.kill()
+                process.wait()
@@ -0,0 +1,189 @@
+from __future__ import annotations
+from typing import NoReturn
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from Board import Board
+
+# Standard perft test positions with their known node counts (index 0 is depth 1) and the depth to run them
+# to by default, from https://www.chessprogramming.org/Perft_Results
+REFERENCE_POSITIONS = [
+    ("Start position", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", [20, 400, 8902, 197281, 4865609, 119060324], 4),
+    ("Kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039, 97862, 4085603, 193690690], 3),
+    ("Position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238, 674624, 11030083], 4),
+    ("Position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467, 422333, 15833292], 3),
+    ("Position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379, 2103487, 89941194], 3),
+    ("Position 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", [46, 2079, 89890, 3894594, 164075551], 3),
+]
+
+def perft(board: Board, depth: int) -> int:
+    '''
+    Counts the leaf nodes of the tree of legal moves from the board's position to the given depth. The moves
+    at the last ply are counted rather than made
+
+    Parameters:
+        board:  the position to count from (Board, restored when done)
+        depth:  number of plies to search (int, at least 1)
+
+    Returns:
+        number of positions reachable in exactly depth plies
+    '''
+    moves = board.generate_legal_moves()
+    if depth == 1: return len(moves)
+
+    nodes = 0
+    for move in moves:
+        board.make_move(*move)
+        nodes += perft(board, depth - 1)
+        board.undo_move()
+    return nodes
+
+def divide(board: Board, depth: int) -> dict[str, int]:
+    '''
+    Runs perft to depth - 1 after each legal move from the board's position, so a wrong count can be traced
+    to the moves responsible by comparing against another move generator
+
+    Returns:
+        node count for each legal move, keyed by the move in stockfish notation e.g. "e2e4"
+    '''
+    counts = {}
+    for move in board.generate_legal_moves():
+        board.make_move(*move)
+        counts[board.move_to_uci(move)] = perft(board, depth - 1) if depth > 1 else 1
+        board.undo_move()
+    return counts
+
+def perft_job(job: tuple(str, list[tuple], int, bool)) -> tuple(str, int):
+    '''
+    Runs in a worker process of parallel_divide. Sets up its own board from the FEN, plays the given moves then
+    counts the remaining depth
+
+    Parameters:
+        job:    the FEN to start from (None for the starting position), the moves to play (root move first),
+                the depth left to count after them and whether to use the bitboard backend
+
+    Returns:
+        the root move in stockfish notation and the number of nodes counted under the moves played
+    '''
+    fen, moves, depth, bitboards = job
+    board = Board(bitboards, fen)
+    root_move = board.move_to_uci(moves[0])
+    for move in moves:
+        board.make_move(*move)
+    return root_move, perft(board, depth) if depth > 0 else 1
+
+def parallel_divide(fen: str, depth: int, workers: int, bitboards: bool = True) -> dict[str, int]:
+    '''
+    Same as divide, but the counting is split across a pool of worker processes, each with its own board. When there
+    are too few root moves to keep every worker busy, the work is split after the replies to each root move as well
+
+    Parameters:
+        fen:        FEN of the position to count from (String, None for the starting position)
+        depth:      number of plies to search (int, at least 1)
+        workers:    number of worker processes (int)
+        bitboards:  whether to use the bitboard backend (Boolean, defaults to True)
+
+    Returns:
+        node count for each legal move, keyed by the move in stockfish notation e.g. "e2e4"
+    '''
+    board = Board(bitboards, fen)
+    root_moves = board.generate_legal_moves()
+    counts = {board.move_to_uci(move): 0 for move in root_moves}
+    jobs = [(fen, [move], depth - 1, bitboards) for move in root_moves]
+
+    # a few large jobs finish unevenly, so hand out one job per reply instead
+    if depth > 2 and len(root_moves) < 4 * workers:
+        jobs = []
+        for move in root_moves:
+            board.make_move(*move)
+            replies = board.generate_legal_moves()
+            board.undo_move()
+            jobs += [(fen, [move, reply], depth - 2, bitboards) for reply in replies]
+
+    with multiprocessing.Pool(workers) as pool:
+        for root_move, nodes in pool.imap_unordered(perft_job, jobs):
+            counts[root_move] += nodes
+    return counts
+
+def report(nodes: int, seconds: float) -> str:
+    '''
+    Formats a node count and the time taken to count them, with nodes per second
+    '''
+    return f"{nodes:>12,} nodes  {seconds:8.2f}s  {nodes / max(seconds, 1e-9):>10,.0f} nodes/s"
+
+def run_suite(depth: int = None, bitboards: bool = True, workers: int = 1) -> bool:
+    '''
+    Runs every reference position and compares the node counts to the known values
+
+    Parameters:
+        depth:      depth to run every position to (int, defaults to None for each position's own depth)
+        bitboards:  whether to use the bitboard backend (Boolean, defaults to True)
+        workers:    number of worker processes to count with (int, defaults to 1 to count in this process)
+
+    Returns:
+        True if every count matched, False otherwise
+    '''
+    passed = True
+    total_nodes, total_seconds = 0, 0
+    for (name, fen, counts, default_depth) in REFERENCE_POSITIONS:
+        cur_depth = min(depth or default_depth, len(counts))
+        start = time.perf_counter()
+        if workers > 1:
+            nodes = sum(parallel_divide(fen, cur_depth, workers, bitboards).values())
+        else:
+            nodes = perft(Board(bitboards, fen), cur_depth)
+        seconds = time.perf_counter() - start
+
+        expected = counts[cur_depth - 1]
+        passed = passed and nodes == expected
+        total_nodes, total_seconds = total_nodes + nodes, total_seconds + seconds
+        result = "ok" if nodes == expected else f"FAILED (expected {expected:,})"
+        print(f"{name:<15} depth {cur_depth}  {report(nodes, seconds)}  {result}")
+
+    print(f"{'Total':<23} {report(total_nodes, total_seconds)}")
+    return passed
+
+def depth_argument(value: str) -> int:
+    '''
+    Parses a --depth argument, which must be at least 1 (perft counts no moves at depth 0)
+    '''
+    try:
+        depth = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"depth must be a whole number, not {value!r}")
+    if depth < 1: raise argparse.ArgumentTypeError(f"depth must be at least 1, not {depth}")
+    return depth
+
+def main() -> NoReturn:
+    parser = argparse.ArgumentParser(description="Counts move generator nodes to check it against known results and measure its speed")
+    parser.add_argument("--fen", help="position to count from instead of running the reference positions")
+    parser.add_argument("--depth", type=depth_argument, help="depth to count to (defaults to 4 for --fen, each reference position's own depth otherwise)")
+    parser.add_argument("--divide", action="store_true", help="print the node count after each legal move")
+    parser.add_argument("--mailbox", action="store_true", help="use the square list move generator instead of bitboards")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes to count with (0 for one per CPU, defaults to 1)")
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count()
+
+    # run the reference positions unless a single position is asked for
+    if args.fen is None and not args.divide:
+        sys.exit(0 if run_suite(args.depth, not args.mailbox, workers) else 1)
+
+    depth = args.depth or 4
+    start = time.perf_counter()
+    if workers > 1 or args.divide:
+        if workers > 1:
+            counts = parallel_divide(args.fen, depth, workers, not args.mailbox)
+        else:
+            counts = divide(Board(not args.mailbox, args.fen), depth)
+        if args.divide:
+            for name, nodes in counts.items():
+                print(f"{name}: {nodes}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(Board(not args.mailbox, args.fen), depth)
+    print(f"depth {depth}  {report(nodes, time.perf_counter() - start)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,643 @@
+from __future__ import annotations
+from typing import NoReturn
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+from array import array
+from Board import Board, WHITE, PLAY, CHECKMATE, PAWN, QUEEN, PROMOTIONS
+from Perft import REFERENCE_POSITIONS
+
+# score for being checkmated at the root; a mate n plies away scores n closer to 0 so the quickest mate is preferred.
+# Any score beyond MATE_BOUND is a mate
+MATE_SCORE = 100000
+MATE_BOUND = MATE_SCORE - 1000
+
+# deepest iteration searched and the default seconds each search may take
+MAX_DEPTH = 64
+DEFAULT_MOVETIME = 1.0
+
+# number of nodes searched between looks at the clock
+CHECK_EVERY = 1024
+
+# moves are tried in this order: the best move of the previous iteration, takes and promotions (most valuable victim
+# first, then least valuable attacker), the killer moves of the ply, then every other move by its history score
+BEST_MOVE_ORDER = 1 << 30
+TAKE_ORDER = 1 << 24
+KILLER_ORDER = 1 << 23
+
+# history scores are halved once one reaches this, so they stay below KILLER_ORDER and old cutoffs count for less
+HISTORY_LIMIT = 1 << 20
+
+# default size of the transposition table in megabytes; every entry takes 16 bytes (its key and the packed entry)
+DEFAULT_HASH_MB = 16
+ENTRY_BYTES = 16
+
+# what the score of a transposition table entry is: the exact score, or only a lower / upper bound on it because
+# the search was cut off / no move reached alpha
+EXACT = 1
+LOWER = 2
+UPPER = 3
+
+# transposition table entries are packed into ints: the best move (the squares moved from and to, y * 8 + x, and the
+# kind promoted to, 0 if none), the depth searched, the bound, the age of the search that stored it and the score
+# offset to be positive
+TABLE_MOVE_MASK = (1 << 15) - 1
+TABLE_DEPTH_SHIFT = 15
+TABLE_BOUND_SHIFT = 23
+TABLE_AGE_SHIFT = 25
+TABLE_SCORE_SHIFT = 32
+TABLE_SCORE_OFFSET = 1 << 31
+
+# workers searching in parallel start this many iterations deeper in turn (0, 1, 0, 1, ...), so half of them are
+# always ahead filling the shared transposition table for the rest
+DEPTH_OFFSETS = 2
+
+# worker processes are spawned rather than forked: the window's process already runs threads (e.g. the hint search),
+# and a fork copies their locks in whatever state they are in at the time
+WORKER_CONTEXT = multiprocessing.get_context("spawn")
+
+# the class promoted to, by its kind, for moves unpacked from the transposition table
+PROMOTION_CLASSES = {promotion.kind: promotion for promotion in PROMOTIONS}
+
+class TranspositionTable:
+    '''
+    TranspositionTable class - fixed size table of search results keyed by zobrist key, so a position reached again
+    (by another move order or in the next iteration) reuses what was found there. Every key hashes to a bucket of
+    two entries: the first is only replaced by an equal or deeper search of the current search, or once it is from
+    an older search; the second is always replaced.
+    The table can live in shared memory and be used by several processes at once without locking: each key is
+    stored XORed with its entry, so an entry torn by two processes writing at once no longer matches its key and
+    is simply not found
+
+    Attributes:
+        size:           number of buckets (int)
+        memory:         the keys followed by the entries (array of unsigned 64 bit ints, or multiprocessing.RawArray if shared)
+        keys:           zobrist key of the position in each entry XORed with the entry, 0 if empty; bucket i is entries
+                        2 * i and 2 * i + 1 (memoryview of unsigned 64 bit ints in memory)
+        entries:        the search result of each entry packed into an int, see TABLE_ constants (memoryview of unsigned 64 bit ints in memory)
+        age:            number of the current search, stored in each entry so old entries are replaced first (int, 0 to 63)
+        probes, hits:   number of lookups in the current / last search, and of those that found the position (int)
+        stores:         number of entries written in the current / last search (int)
+    '''
+
+    def __init__(self, megabytes: int = DEFAULT_HASH_MB, shared: bool = False, memory: multiprocessing.RawArray = None):
+        '''
+        Parameters:
+            megabytes:  memory to use for the entries (int, defaults to DEFAULT_HASH_MB)
+            shared:     whether to put the table in memory that can be passed to other processes (Boolean, defaults to False)
+            memory:     the memory of a shared table made with the same size in another process, to use it from this one
+                        (multiprocessing.RawArray, defaults to None to make a new table)
+        '''
+        self.size = max(megabytes * (1 << 20) // (2 * ENTRY_BYTES), 1)
+        if memory is None: memory = WORKER_CONTEXT.RawArray("Q", 4 * self.size) if shared else array("Q", [0]) * (4 * self.size)
+        self.memory = memory
+        view = memoryview(memory).cast("B").cast("Q")
+        self.keys, self.entries = view[:2 * self.size], view[2 * self.size:]
+        self.age = 0
+        self.probes, self.hits, self.stores = 0, 0, 0
+
+    def new_search(self) -> NoReturn:
+        '''
+        Starts a new search, so the entries of earlier ones are replaced first, and resets the statistics
+        '''
+        self.age = (self.age + 1) & 63
+        self.probes, self.hits, self.stores = 0, 0, 0
+
+    def probe(self, key: int) -> tuple(int, int, int, int):
+        '''
+        Looks up the position with the given zobrist key
+
+        Returns:
+            the depth searched, bound (EXACT, LOWER or UPPER), score and packed best move (0 if none) stored for the
+            position, None if it is not in the table
+        '''
+        self.probes += 1
+        index = key % self.size * 2
+        entry = self.entries[index]
+        if self.keys[index] ^ entry != key:
+            entry = self.entries[index + 1]
+            if self.keys[index + 1] ^ entry != key: return None
+
+        self.hits += 1
+        return (entry >> TABLE_DEPTH_SHIFT & 255, entry >> TABLE_BOUND_SHIFT & 3, (entry >> TABLE_SCORE_SHIFT) - TABLE_SCORE_OFFSET,
+                entry & TABLE_MOVE_MASK)
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: int) -> NoReturn:
+        '''
+        Stores a search result for the position with the given zobrist key
+
+        Parameters:
+            key:    zobrist key of the position (int)
+            depth:  number of plies searched (int, 0 to 255)
+            bound:  whether score is EXACT or a LOWER / UPPER bound (int)
+            score:  the score found (int)
+            move:   the best move found packed by pack_move (int, 0 if none)
+        '''
+        index = key % self.size * 2
+        kept = self.entries[index]
+        if self.keys[index] ^ kept != key and kept >> TABLE_AGE_SHIFT & 63 == self.age and kept >> TABLE_DEPTH_SHIFT & 255 > depth:
+            index += 1
+
+        entry = (move | depth << TABLE_DEPTH_SHIFT | bound << TABLE_BOUND_SHIFT | self.age << TABLE_AGE_SHIFT
+                 | score + TABLE_SCORE_OFFSET << TABLE_SCORE_SHIFT)
+        self.keys[index], self.entries[index] = key ^ entry, entry
+        self.stores += 1
+
+    def hit_rate(self) -> float:
+        '''
+        Returns the fraction of lookups that found the position (0 to 1)
+        '''
+        return self.hits / max(self.probes, 1)
+
+    def usage(self) -> int:
+        '''
+        Returns how full the table is in entries per thousand, estimated from the first thousand entries
+        '''
+        sample = min(1000, len(self.keys))
+        return sum(1 for key in self.keys[:sample] if key != 0) * 1000 // sample
+
+def pack_move(move: tuple) -> int:
+    '''
+    Packs a move (as used by Board.make_move) into the int stored in the transposition table (0 for None)
+    '''
+    if move is None: return 0
+    packed = move[1] * 8 + move[0] | (move[3] * 8 + move[2]) << 6
+    if len(move) > 4: packed |= move[4].kind << 12
+    return packed
+
+def unpack_move(packed: int) -> tuple:
+    '''
+    Unpacks a move packed by pack_move (None for 0)
+    '''
+    if packed == 0: return None
+    move = (packed & 7, packed >> 3 & 7, packed >> 6 & 7, packed >> 9 & 7)
+    if packed >> 12: move += (PROMOTION_CLASSES[packed >> 12],)
+    return move
+
+def score_to_table(score: int, ply: int) -> int:
+    '''
+    Converts a mate score from plies to mate from the root into plies to mate from this position, so the entry is
+    right wherever the position is reached; other scores are unchanged
+    '''
+    if score >= MATE_BOUND: return score + ply
+    if score <= -MATE_BOUND: return score - ply
+    return score
+
+def score_from_table(score: int, ply: int) -> int:
+    '''
+    Converts a score stored by score_to_table back into plies from the root
+    '''
+    if score >= MATE_BOUND: return score - ply
+    if score <= -MATE_BOUND: return score + ply
+    return score
+
+def game_board(fen: str, moves: list[str]) -> Board:
+    '''
+    Returns the board to search: the FEN's position with the moves played on it, so its history_keys hold the positions
+    Searcher.is_draw looks back over (moves may be None)
+    '''
+    board = Board(bitboards=True, fen=fen)
+    for move in moves or (): board.make_move(*board.uci_to_move(move))
+    return board
+
+class Searcher:
+    '''
+    Searcher class - the built in engine, a pure Python search on top of Board so hints work without a stockfish
+    binary: iterative deepening negamax with alpha-beta pruning, a quiescence search of takes at the leaves and
+    MVV-LVA / killer / history move ordering, stopped by a time or node budget. Has the same get_best_move, stop
+    and close methods as Engine so the window can use either.
+    With more than one worker, every search is run by that many worker processes at once (lazy SMP): they all search
+    the same position and share one transposition table, each one using what the others found. The deepest finished
+    result is played
+
+    Attributes:
+        movetime:       seconds each search may take (float, None for no limit)
+        max_depth:      deepest iteration each search may reach (int)
+        max_nodes:      nodes each search may visit (int, None for no limit)
+        nodes:          nodes visited by the current / last search (int)
+        depth:          deepest iteration finished by the current / last search (int)
+        score:          score of the best move of the last finished iteration in centipawns for the side to move (int)
+        deadline:       perf_counter time the current search has to stop at (float or None)
+        next_check:     node count at which the budget is next checked (int)
+        stopped:        whether the current search ran out of time / nodes or was stopped and is unwinding (Boolean)
+        stop_event:     set to stop the searches of the worker processes, checked with the budget (multiprocessing.Event, None
+                        until the workers are started)
+        cancel:         set by the caller of get_best_move to stop that search, checked with the budget (threading.Event or None)
+        table:          results of earlier searches by zobrist key, kept between searches; with workers, its statistics are
+                        the sum of every worker's for the last search (TranspositionTable)
+        killers:        the last two quiet moves that caused a cutoff at each ply from the root (List[List[tuple]])
+        history:        how much each quiet move caused cutoffs, weighted by depth; indexed by the side moving and the squares
+                        moved from and to, see history_index (List[int])
+        lock:           held while searching, so searches from different threads do not interleave (threading.Lock)
+        hash_mb:        size of the transposition table in megabytes (int)
+        workers:        number of processes searching in parallel, 1 to search in this process (int)
+        processes:      the running worker processes and the connection to each one (List[(multiprocessing.Process, Connection)],
+                        started with the Searcher; empty after close, or after a worker crashed until the next search)
+    '''
+
+    def __init__(self, movetime: float = DEFAULT_MOVETIME, max_depth: int = MAX_DEPTH, max_nodes: int = None, hash_mb: int = DEFAULT_HASH_MB,
+                 workers: int = 1, table_memory: multiprocessing.RawArray = None):
+        '''
+        Parameters:
+            movetime:       seconds each search may take (float, defaults to DEFAULT_MOVETIME; None for no limit)
+            max_depth:      deepest iteration each search may reach (int, defaults to MAX_DEPTH)
+            max_nodes:      nodes each search may visit, in every worker (int, defaults to None for no limit)
+            hash_mb:        size of the transposition table in megabytes (int, defaults to DEFAULT_HASH_MB)
+            workers:        number of processes to search with (int, defaults to 1 to search in this process)
+            table_memory:   memory of a shared transposition table to use instead of a new one (multiprocessing.RawArray,
+                            defaults to None; used by the worker processes)
+        '''
+        self.movetime = movetime
+        self.max_depth = min(max_depth, MAX_DEPTH)
+        self.max_nodes = max_nodes
+        self.nodes, self.depth, self.score = 0, 0, 0
+        self.deadline, self.next_check, self.stopped = None, CHECK_EVERY, False
+        self.table = TranspositionTable(hash_mb, workers > 1, table_memory)
+        self.killers = [[None, None] for ply in range(MAX_DEPTH + 1)]
+        self.history = [0] * (2 * 64 * 64)
+        self.lock = threading.Lock()
+        self.hash_mb, self.workers = hash_mb, workers
+        self.processes = []
+        self.stop_event, self.cancel = None, None
+
+        # started now rather than by the first search, so a new process has finished starting up by the time it is needed
+        if workers > 1: self.start_workers()
+
+    def get_best_move(self, fen: str, moves: list[str] = None, cancel: threading.Event = None) -> str:
+        '''
+        Searches the given position for the best move
+
+        Parameters:
+            fen:    the position to search, or the one the moves were played from (String)
+            moves:  moves in stockfish notation played from fen to reach the position to search, so repetitions of the
+                    positions on the way are seen (List[String], defaults to None; see Board.repetition_history)
+            cancel: set to stop the search, even before it has started, e.g. from another thread once the position has
+                    changed; created by the caller before the search is started (threading.Event, defaults to None)
+
+        Returns:
+            the best move in stockfish notation e.g. "e2e4" or "e7e8q", None if there are no legal moves or the search
+            was cancelled before it started
+        '''
+        with self.lock:
+            if cancel is not None and cancel.is_set(): return None
+            self.cancel = cancel
+            if self.workers > 1:
+                move = self.parallel_search(fen, moves)
+                if move is not False: return move
+
+            board = game_board(fen, moves)
+            move = self.search(board)
+            return None if move is None else board.move_to_uci(move)
+
+    def parallel_search(self, fen: str, moves: list[str]) -> str:
+        '''
+        Helper function for get_best_move, searches the position in every worker process at once and returns the
+        best move of the deepest finished search (lock must be held). Workers that crashed are shut down with the
+        rest, to be started again by the next search
+
+        Returns:
+            the best move in stockfish notation, None if there are no legal moves, False if no worker answered
+        '''
+        if len(self.processes) == 0: self.start_workers()
+        # the caller sets cancel before calling stop, so a stop that came before the clear is seen here
+        self.stop_event.clear()
+        if self.cancel is not None and self.cancel.is_set(): self.stop_event.set()
+        for index, (process, connection) in enumerate(self.processes):
+            connection.send((fen, moves, index % DEPTH_OFFSETS))
+
+        results, crashed = [], False
+        for process, connection in self.processes:
+            try:
+                results.append(connection.recv())
+            except (EOFError, OSError):
+                crashed = True
+        if crashed: self.close_workers()
+        if len(results) == 0: return False
+
+        # max keeps the first of equally deep results, so workers that started deeper only win by finishing deeper
+        self.depth, self.score, move = max(results, key=lambda result: result[0])[:3]
+        self.nodes = sum(result[3] for result in results)
+        self.table.probes, self.table.hits, self.table.stores = (sum(result[i] for result in results) for i in (4, 5, 6))
+        return move
+
+    def start_workers(self) -> NoReturn:
+        '''
+        Starts the worker processes, each with its own Searcher using this one's transposition table
+        '''
+        self.stop_event = WORKER_CONTEXT.Event()
+        for index in range(self.workers):
+            connection, worker_connection = WORKER_CONTEXT.Pipe()
+            process = WORKER_CONTEXT.Process(target=search_worker, daemon=True, args=(worker_connection, self.stop_event, self.movetime,
+                                              self.max_depth, self.max_nodes, self.hash_mb, self.table.memory))
+            process.start()
+            self.processes.append((process, connection))
+
+    def close_workers(self) -> NoReturn:
+        '''
+        Shuts down the worker processes if they are running
+        '''
+        for process, connection in self.processes:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            process.join(1)
+            if process.is_alive(): process.terminate()
+        self.processes = []
+
+    def statistics(self) -> str:
+        '''
+        Describes the last search: the depth finished, its score, the nodes visited by every worker and how much the
+        transposition table was used
+        '''
+        return (f"depth {self.depth}  score {self.score}  {self.nodes:,} nodes  table hits {100 * self.table.hit_rate():.0f}%  "
+                f"table {self.table.usage() / 10:.1f}% full")
+
+    def stop(self) -> NoReturn:
+        '''
+        Stops the search running on another thread (if any) as if it had run out of time, so it answers with the best
+        move found so far; called without the lock, which the search holds. A search that has not started yet resets
+        this, so to stop one that may not have started, set the cancel event it was given first
+        '''
+        self.stopped = True
+        if self.stop_event is not None: self.stop_event.set()
+
+    def close(self) -> NoReturn:
+        '''
+        Stops the search and shuts down the worker processes if there are any
+        '''
+        self.stop()
+        with self.lock:
+            self.close_workers()
+
+    def search(self, board: Board, depth_offset: int = 0) -> tuple:
+        '''
+        Searches one ply deeper at a time until the budget runs out, max_depth is reached or a mate is found
+
+        Parameters:
+            board:          the position to search (Board, restored when done)
+            depth_offset:   number of iterations to skip at the start, so parallel searches are not in step (int, defaults to 0)
+
+        Returns:
+            the best move as used by Board.make_move (tuple, None if there are no legal moves)
+        '''
+        self.nodes, self.depth, self.score, self.stopped = 0, 0, 0, False
+        self.deadline = None if self.movetime is None else time.perf_counter() + self.movetime
+        self.next_check = CHECK_EVERY if self.max_nodes is None else min(CHECK_EVERY, self.max_nodes)
+        for killers in self.killers: killers[0], killers[1] = None, None
+        self.table.new_search()
+
+        moves, state = board.cached_legal_moves()
+        if state != PLAY: return None
+
+        best_move = moves[0]
+        for depth in range(1 + min(depth_offset, self.max_depth - 1), self.max_depth + 1):
+            score, move = self.search_root(board, moves, depth, best_move)
+
+            # a move that beat the previous best before the budget ran out is better even if the iteration is unfinished
+            if move is not None: best_move = move
+            if self.stopped: break
+            self.depth, self.score = depth, score
+            if abs(score) >= MATE_BOUND: break
+
+        return best_move
+
+    def search_root(self, board: Board, moves: tuple, depth: int, best_move: tuple) -> tuple(int, tuple):
+        '''
+        Helper function for search, searches every legal move of the root to the given depth
+
+        Returns:
+            the best score and the move scoring it (None if the budget ran out before the first move was searched)
+        '''
+        alpha, beta, found = -MATE_SCORE - 1, MATE_SCORE + 1, None
+        for move in self.order_moves(board, moves, 0, best_move):
+            board.make_move(*move)
+            score = -self.negamax(board, depth - 1, -beta, -alpha, 1)
+            board.undo_move()
+
+            if self.stopped: break
+            if score > alpha: alpha, found = score, move
+        return alpha, found
+
+    def negamax(self, board: Board, depth: int, alpha: int, beta: int, ply: int) -> int:
+        '''
+        Searches the position to the given depth with alpha-beta pruning
+
+        Parameters:
+            board:          the position to search (Board, restored when done)
+            depth:          number of plies left before the quiescence search (int)
+            alpha, beta:    the window of scores that matter; anything at or above beta is a cutoff (int)
+            ply:            number of plies from the root (int)
+
+        Returns:
+            the score in centipawns for the side to move (0 if the budget ran out)
+        '''
+        if depth <= 0: return self.quiescence(board, alpha, beta, ply)
+        self.nodes += 1
+        if self.nodes >= self.next_check: self.check_budget()
+        if self.stopped: return 0
+        if self.is_draw(board): return 0
+
+        # use what an earlier search found here: its score if it searched deep enough, otherwise its best move first
+        key, table_move = board.zobrist_key, None
+        entry = self.table.probe(key)
+        if entry is not None:
+            entry_depth, bound, score, packed = entry
+            score, table_move = score_from_table(score, ply), unpack_move(packed)
+            if entry_depth >= depth and (bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha)):
+                return score
+
+        moves, state = board.cached_legal_moves()
+        if state == CHECKMATE: return ply - MATE_SCORE
+        if state != PLAY: return 0
+
+        start_alpha, best_score, best_move = alpha, -MATE_SCORE, None
+        for move in self.order_moves(board, moves, ply, table_move):
+            quiet = self.take_order(board, move) == 0
+            board.make_move(*move)
+            score = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.undo_move()
+
+            if self.stopped: return 0
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha: alpha = score
+                if score >= beta:
+                    if quiet: self.store_cutoff(board, move, depth, ply)
+                    break
+
+        bound = LOWER if best_score >= beta else EXACT if best_score > start_alpha else UPPER
+        self.table.store(key, depth, bound, score_to_table(best_score, ply), pack_move(best_move))
+        return best_score
+
+    def quiescence(self, board: Board, alpha: int, beta: int, ply: int) -> int:
+        '''
+        Searches only takes and queen promotions until the position is quiet, so the evaluation is never read halfway
+        through an exchange. The side to move may stand pat on the evaluation instead, unless it is in check
+
+        Returns:
+            the score in centipawns for the side to move (0 if the budget ran out)
+        '''
+        self.nodes += 1
+        if self.nodes >= self.next_check: self.check_budget()
+        if self.stopped: return 0
+
+        in_check = board.in_check()
+        best_score = ply - MATE_SCORE
+        if not in_check:
+            best_score = board.evaluate()
+            if best_score >= beta: return best_score
+            if best_score > alpha: alpha = best_score
+
+        moves, state = board.cached_legal_moves()
+        if state == CHECKMATE: return ply - MATE_SCORE
+        if state != PLAY: return 0
+
+        # every move out of check is searched, otherwise only takes and queen promotions
+        if not in_check:
+            moves = [move for move in moves if self.take_order(board, move) != 0 and (len(move) == 4 or move[4].kind == QUEEN)]
+
+        for move in self.order_moves(board, moves, ply):
+            board.make_move(*move)
+            score = -self.quiescence(board, -beta, -alpha, ply + 1)
+            board.undo_move()
+
+            if self.stopped: return 0
+            if score > best_score:
+                best_score = score
+                if score > alpha: alpha = score
+                if score >= beta: break
+        return best_score
+
+    def order_moves(self, board: Board, moves: tuple, ply: int, best_move: tuple = None) -> list[tuple]:
+        '''
+        Sorts moves so the ones most likely to cause a cutoff are searched first (see BEST_MOVE_ORDER etc.)
+
+        Parameters:
+            board:      the position the moves are from (Board)
+            moves:      the moves to sort (tuple or list of moves)
+            ply:        number of plies from the root, for the killer moves (int)
+            best_move:  move to search first e.g. the best move of the previous iteration / the transposition table
+                        (tuple, defaults to None)
+
+        Returns:
+            the moves in the order to search them
+        '''
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+        history, white = self.history, board.color_to_move == WHITE
+
+        def order(move: tuple) -> int:
+            if move == best_move: return BEST_MOVE_ORDER
+            take = self.take_order(board, move)
+            if take != 0: return TAKE_ORDER + take
+            if move == killers[0] or move == killers[1]: return KILLER_ORDER
+            return history[self.history_index(white, move)]
+
+        return sorted(moves, key=order, reverse=True)
+
+    def take_order(self, board: Board, move: tuple) -> int:
+        '''
+        Scores a take or promotion by the most valuable victim / least valuable attacker rule
+
+        Returns:
+            a score above 0 for takes and promotions (higher is searched first), 0 for quiet moves
+        '''
+        squares = board.squares
+        piece, victim = squares[move[1] * 8 + move[0]], squares[move[3] * 8 + move[2]]
+        order = 0
+        if victim is not None: order = (victim.kind + 1) * 8 - piece.kind
+        elif piece.kind == PAWN and move[0] != move[2]: order = (PAWN + 1) * 8 - PAWN
+        if len(move) > 4: order += move[4].kind * 8
+        return order
+
+    def history_index(self, white: bool, move: tuple) -> int:
+        '''
+        Returns the index of a move in self.history (side moving, square moved from, square moved to)
+        '''
+        return white << 12 | (move[1] * 8 + move[0]) << 6 | move[3] * 8 + move[2]
+
+    def store_cutoff(self, board: Board, move: tuple, depth: int, ply: int) -> NoReturn:
+        '''
+        Remembers a quiet move that caused a cutoff as a killer move of the ply and raises its history score
+        '''
+        killers = self.killers[ply]
+        if killers[0] != move: killers[0], killers[1] = move, killers[0]
+
+        index = self.history_index(board.color_to_move == WHITE, move)
+        self.history[index] += depth * depth
+        if self.history[index] >= HISTORY_LIMIT:
+            self.history = [score // 2 for score in self.history]
+
+    def is_draw(self, board: Board) -> bool:
+        '''
+        Checks for a draw by the fifty move rule or by the position having been seen before since the last pawn
+        move or take (repeating once is enough; whoever could do better would not repeat)
+        '''
+        if board.halfmove_clock >= 100: return True
+
+        # history_keys holds the key of the position before every move; only positions with the same side to move can match
+        keys, key = board.history_keys, board.zobrist_key
+        for ply in range(board.ply - 4, max(board.ply - board.halfmove_clock, 0) - 1, -2):
+            if keys[ply] == key: return True
+        return False
+
+    def check_budget(self) -> NoReturn:
+        '''
+        Stops the search once it has used up its time or nodes, and sets when to check again
+        '''
+        if self.max_nodes is not None and self.nodes >= self.max_nodes: self.stopped = True
+        if self.deadline is not None and time.perf_counter() >= self.deadline: self.stopped = True
+        if self.stop_event is not None and self.stop_event.is_set(): self.stopped = True
+        if self.cancel is not None and self.cancel.is_set(): self.stopped = True
+
+        self.next_check = self.nodes + CHECK_EVERY
+        if self.max_nodes is not None: self.next_check = min(self.next_check, self.max_nodes)
+
+def search_worker(connection: multiprocessing.connection.Connection, stop_event: multiprocessing.Event, movetime: float, max_depth: int,
+                  max_nodes: int, hash_mb: int, table_memory: multiprocessing.RawArray) -> NoReturn:
+    '''
+    Runs in a worker process started by Searcher.start_workers. Searches every position sent through the connection
+    until it is sent None
+
+    Parameters:
+        connection:         receives (FEN, moves, depth offset) jobs and sends back the depth finished, its score, the best move in
+                            stockfish notation, the number of nodes searched and the table probes, hits and stores of the search (Connection)
+        stop_event:         set by Searcher.stop to stop the search in every worker (multiprocessing.Event)
+        movetime, max_depth, max_nodes, hash_mb:    the budget and table size of the Searcher that started the worker
+        table_memory:       memory of the transposition table shared by every worker (multiprocessing.RawArray)
+    '''
+    searcher = Searcher(movetime, max_depth, max_nodes, hash_mb, table_memory=table_memory)
+    searcher.stop_event = stop_event
+    while True:
+        job = connection.recv()
+        if job is None: break
+
+        fen, moves, depth_offset = job
+        board = game_board(fen, moves)
+        move = searcher.search(board, depth_offset)
+        table = searcher.table
+        connection.send((searcher.depth, searcher.score, None if move is None else board.move_to_uci(move), searcher.nodes,
+                         table.probes, table.hits, table.stores))
+
+def main() -> NoReturn:
+    parser = argparse.ArgumentParser(description="Searches the perft reference positions with each number of workers, to measure how much deeper more workers search")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="numbers of processes to search with (0 for one per CPU, defaults to 1 2 4)")
+    parser.add_argument("--movetime", type=float, default=DEFAULT_MOVETIME, help=f"seconds to search each position for (defaults to {DEFAULT_MOVETIME})")
+    parser.add_argument("--hash", type=int, default=DEFAULT_HASH_MB, help=f"size of the transposition table in megabytes (defaults to {DEFAULT_HASH_MB})")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.movetime} seconds per position")
+    for workers in args.workers:
+        searcher = Searcher(args.movetime, hash_mb=args.hash, workers=workers or os.cpu_count())
+        depths, nodes = 0, 0
+        for (name, fen, _, _) in REFERENCE_POSITIONS:
+            move = searcher.get_best_move(fen)
+            print(f"{searcher.workers} workers  {name}: {move}  {searcher.statistics()}")
+            depths, nodes = depths + searcher.depth, nodes + searcher.nodes
+        searcher.close()
+        print(f"{searcher.workers} workers  average depth {depths / len(REFERENCE_POSITIONS):.1f}  {nodes / (args.movetime * len(REFERENCE_POSITIONS)):,.0f} nodes/s")
+
+if __name__ == "__main__":
+    main()